@@ -4,10 +4,14 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import os
 from . import models, schemas, database
+from .cache import TTLCache
+from .services.password_service import HashingOverloaded, PasswordHasher
 
 # --- Configuration ---
 # Get secret key from environment variable
@@ -15,9 +19,21 @@ from . import models, schemas, database
 SECRET_KEY = os.getenv("SECRET_KEY", "a_default_secret_key_if_not_set")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 # 24 hours
+# Identity snapshots of recently seen users, so authenticated requests skip the users lookup.
+# Invalidation only reaches the worker that made the change: with several workers, a
+# deactivated, re-verified or re-roled user keeps their old access on the others for up
+# to AUTH_CACHE_TTL_SECONDS. Set it to 0 to turn the cache off.
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "1024"))
 
 # --- Hashing ---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Raising BCRYPT_ROUNDS upgrades existing hashes transparently on the user's next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+password_hasher = PasswordHasher(pwd_context, max_workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -25,6 +41,26 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# Async variants used by request handlers; the work runs on the hashing pool
+def _hashing_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HashingOverloaded:
+        raise _hashing_busy()
+
+async def verify_password_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    try:
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+    except HashingOverloaded:
+        raise _hashing_busy()
+
 # --- JWT ---
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
 
@@ -39,9 +75,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 # --- User & Role Dependencies ---
+user_cache = TTLCache(maxsize=AUTH_CACHE_MAX_ENTRIES, ttl=AUTH_CACHE_TTL_SECONDS)
+
 def get_user(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
+async def get_user_async(db: AsyncSession, email: str):
+    # For async routes, which must not block the event loop on a sync session
+    return await db.scalar(select(models.User).where(models.User.email == email))
+
+def invalidate_cached_user(email: str):
+    # Call after committing any change to a user's role, activation or verification state
+    user_cache.pop(email)
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,12 +103,19 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
     
+    cached = user_cache.get(token_data.email)
+    if cached is not None:
+        return cached
+
     user = get_user(db, email=token_data.email)
     if user is None:
         raise credentials_exception
-    return user
+    # Cache a detached snapshot rather than the ORM row, which is bound to this request's session
+    snapshot = schemas.User.model_validate(user)
+    user_cache.set(token_data.email, snapshot)
+    return snapshot
 
-def get_current_active_user(current_user: models.User = Depends(get_current_user)):
+def get_current_active_user(current_user: schemas.User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     # For now, we'll allow unverified users to operate.
@@ -71,17 +124,17 @@ def get_current_active_user(current_user: models.User = Depends(get_current_user
     return current_user
 
 # --- Role Specific Dependencies ---
-def get_current_donor(current_user: models.User = Depends(get_current_active_user)):
+def get_current_donor(current_user: schemas.User = Depends(get_current_active_user)):
     if current_user.role != models.UserRole.donor:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a donor")
     return current_user
 
-def get_current_ngo(current_user: models.User = Depends(get_current_active_user)):
+def get_current_ngo(current_user: schemas.User = Depends(get_current_active_user)):
     if current_user.role != models.UserRole.ngo:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not an NGO")
     return current_user
 
-def get_current_admin(current_user: models.User = Depends(get_current_active_user)):
+def get_current_admin(current_user: schemas.User = Depends(get_current_active_user)):
     if current_user.role != models.UserRole.admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not an admin")
     return current_user
\ No newline at end of file
@@ -0,0 +1,139 @@
+# backend/app/cache.py
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A small thread-safe cache whose entries expire after `ttl` seconds and whose
+    size is capped by evicting the least recently used entry."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CoalescingCache:
+    """Async front for a TTLCache: concurrent misses for the same key share a single
+    call to `compute` instead of each starting their own."""
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # Shielded so one caller disconnecting does not cancel the call the others wait on
+        return await asyncio.shield(task)
+
+    async def get_or_compute_many(
+        self, keys: List[Hashable], compute_many: Callable[[List[Hashable]], Awaitable[List[Any]]]
+    ) -> List[Any]:
+        """Batch form of get_or_compute. Keys that are neither cached nor already in
+        flight go to one `compute_many(missing_keys)` call, which returns a result or
+        an Exception per key. Returns values (or Exceptions) in the order of `keys`."""
+        pending: Dict[Hashable, Any] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.cache.get(key, _MISSING)
+            if value is not _MISSING:
+                pending[key] = value
+            elif key in self._inflight:
+                self.coalesced += 1
+                pending[key] = self._inflight[key]
+            else:
+                missing.append(key)
+
+        if missing:
+            batch = asyncio.ensure_future(compute_many(missing))
+            for position, key in enumerate(missing):
+                task = asyncio.ensure_future(_batch_item(batch, position))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done, key=key: self._finish(key, done))
+                pending[key] = task
+
+        results = {}
+        for key, value in pending.items():
+            if isinstance(value, asyncio.Task):
+                try:
+                    value = await asyncio.shield(value)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    value = exc
+            results[key] = value
+        return [results[key] for key in keys]
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.cache.set(key, task.result())
+
+    def stats(self) -> dict:
+        lookups = self.cache.hits + self.cache.misses
+        return {
+            "size": len(self.cache),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "coalesced": self.coalesced,
+            "computed": self.cache.misses - self.coalesced, # Calls that actually reached `compute`
+            "in_flight": len(self._inflight),
+            "hit_rate": round(self.cache.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+async def _batch_item(batch: "asyncio.Future", position: int) -> Any:
+    value = (await asyncio.shield(batch))[position]
+    if isinstance(value, Exception):
+        raise value
+    return value
@@ -0,0 +1,90 @@
+# backend/app/cli.py
+"""Maintenance commands, run from the backend directory:
+
+    python -m app.cli migrate
+    python -m app.cli check-query-plans
+    python -m app.cli rebuild-rollups
+    python -m app.cli sweep
+    python -m app.cli backfill-quantities
+"""
+import argparse
+import logging
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from .database import SessionLocal  # noqa: E402  (needs the environment loaded first)
+from .migrate import run_migrations  # noqa: E402
+from .query_plans import check_query_plans as find_table_scans  # noqa: E402
+from .services import analytics_service, quantity_service  # noqa: E402
+from .services.maintenance import sweeper  # noqa: E402
+
+
+logger = logging.getLogger("app.cli")
+
+
+def migrate(args):
+    run_migrations(args.revision)
+    logger.info("Database is at revision %s", args.revision)
+
+
+def check_query_plans(args):
+    db = SessionLocal()
+    try:
+        failures = find_table_scans(db)
+    finally:
+        db.close()
+    for name, line in failures:
+        logger.error("%s falls back to a table scan: %s", name, line)
+    if failures:
+        sys.exit(1)
+    logger.info("All hot queries use an index")
+
+
+def rebuild_rollups(args):
+    db = SessionLocal()
+    try:
+        rows = analytics_service.rebuild_rollups(db)
+    finally:
+        db.close()
+    logger.info("Rebuilt analytics rollups (%s counter rows)", rows)
+
+
+def sweep(args):
+    sweeper.run_once()
+
+
+def backfill_quantities(args):
+    db = SessionLocal()
+    try:
+        rows = quantity_service.backfill_quantities(db, args.batch_size, reparse=args.all)
+    finally:
+        db.close()
+    logger.info("Parsed quantities for %s food items", rows)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Food Rescue maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_cmd = commands.add_parser("migrate", help="Apply schema migrations")
+    migrate_cmd.add_argument("revision", nargs="?", default="head")
+    migrate_cmd.set_defaults(func=migrate)
+    commands.add_parser("check-query-plans", help="Fail if a hot router query needs a full table scan").set_defaults(func=check_query_plans)
+    commands.add_parser("rebuild-rollups", help="Recompute analytics counters from food_items and claims").set_defaults(func=rebuild_rollups)
+    commands.add_parser("sweep", help="Cancel overdue donations and delete expired OTP/reset rows once").set_defaults(func=sweep)
+
+    backfill_cmd = commands.add_parser("backfill-quantities", help="Parse quantity text into amount/unit/servings for older food items")
+    backfill_cmd.add_argument("--batch-size", type=int, default=quantity_service.BACKFILL_BATCH_SIZE)
+    backfill_cmd.add_argument("--all", action="store_true", help="Re-parse rows that already have values, e.g. after a parser fix")
+    backfill_cmd.set_defaults(func=backfill_quantities)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
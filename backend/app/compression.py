@@ -0,0 +1,135 @@
+# backend/app/compression.py
+"""
+Negotiated response compression. Complete bodies of at least COMPRESSION_MIN_BYTES
+are compressed with brotli or gzip, whichever the client prefers in Accept-Encoding
+(brotli wins a tie, when installed). Streamed bodies (event streams, exports) are
+passed through untouched: they are sent in pieces as they are produced, and
+buffering them to compress would defeat that.
+
+A compressed body is a different representation of the resource, so its ETag gets
+an encoding suffix ("abc" -> "abc-gzip"); change_versions.matches strips it again
+when the client revalidates with If-None-Match.
+"""
+import gzip
+import os
+from typing import Optional
+
+try:
+    import brotli # Optional: `pip install brotli` to offer br as well as gzip
+except ImportError:
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024")) # Smaller bodies fit in a packet anyway
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4")) # 4 is about gzip's speed with smaller output; 11 is far too slow per request
+
+UNCOMPRESSED_STATUSES = (204, 304)
+UNCOMPRESSED_TYPES = (b"text/event-stream", b"image/", b"application/zip", b"application/gzip")
+
+
+def _supported() -> tuple:
+    # In order of preference when the client weighs them equally
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the encoding to use for an Accept-Encoding header, or None for identity."""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding.strip()] = quality
+    best = None
+    for coding in _supported():
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (coding, quality)
+    return best[0] if best is not None else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0) # mtime=0 keeps the output stable for a given body
+
+
+def _suffixed_etag(etag: bytes, encoding: str) -> bytes:
+    # Strong ETags only; a weak one already says the bytes may differ
+    if etag.startswith(b'"') and etag.endswith(b'"'):
+        return etag[:-1] + b"-" + encoding.encode() + b'"'
+    return etag
+
+
+# --- Middleware ---
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies for clients that accept
+    it. Holds back http.response.start until the first body message shows whether
+    the body is complete and large enough."""
+
+    def __init__(self, app, min_bytes: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.min_bytes = min_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        accept = next((value for name, value in scope["headers"] if name == b"accept-encoding"), b"")
+        encoding = choose_encoding(accept.decode("latin-1")) if accept else None
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                return await send(message)
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                return await send(message)
+
+            body = message.get("body", b"")
+            headers = list(start.get("headers", []))
+            names = {name.lower(): value for name, value in headers}
+            content_type = names.get(b"content-type", b"")
+            if (
+                message.get("more_body", False) # Streamed: send as produced
+                or start["status"] in UNCOMPRESSED_STATUSES
+                or b"content-encoding" in names
+                or content_type.startswith(UNCOMPRESSED_TYPES)
+                or len(body) < self.min_bytes
+            ):
+                passthrough = True
+                await send(start)
+                return await send(message)
+
+            body = compress(body, encoding)
+            rewritten = []
+            for name, value in headers:
+                lowered = name.lower()
+                if lowered == b"content-length":
+                    continue
+                if lowered == b"etag":
+                    value = _suffixed_etag(value, encoding)
+                rewritten.append((name, value))
+            vary = names.get(b"vary")
+            if vary is None:
+                rewritten.append((b"vary", b"Accept-Encoding"))
+            elif b"accept-encoding" not in vary.lower():
+                rewritten = [(name, value + b", Accept-Encoding" if name.lower() == b"vary" else value) for name, value in rewritten]
+            rewritten += [(b"content-encoding", encoding.encode()), (b"content-length", str(len(body)).encode())]
+            await send({**start, "headers": rewritten})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,12 +1,25 @@
 # backend/app/main.py
+from dotenv import load_dotenv
+
+# Load environment variables from .env file before any module reads its settings
+load_dotenv()
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine
-from . import models
-from .routers import auth_routes, donor_routes, ngo_routes, admin_routes, ai_routes
+from . import auth, database
+from .compression import COMPRESSION_ENABLED, CompressionMiddleware
+from .metrics import METRICS_ENABLED, MetricsMiddleware
+from .migrate import run_migrations
+from .query_trace import QueryTraceMiddleware
+from .rate_limit import RateLimitMiddleware
+from .routers import auth_routes, donor_routes, ngo_routes, admin_routes, ai_routes, metrics_routes
+from .services.email_outbox import outbox_worker
+from .services.events import event_hub
+from .services.maintenance import SWEEP_ENABLED, sweeper
 import os
 import logging
-from dotenv import load_dotenv
 
 # Configure logging
 logging.basicConfig(
@@ -14,13 +27,33 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-# Load environment variables from .env file
-load_dotenv()
+# Apply schema migrations on startup. With several workers, set AUTO_MIGRATE=false and
+# run `python -m app.cli migrate` once per deploy instead.
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "true").lower() == "true"
+
+# --- Startup / Shutdown ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AUTO_MIGRATE:
+        run_migrations()
+    outbox_worker.start()
+    event_hub.start()
+    sweep_task = asyncio.create_task(sweeper.run_forever()) if SWEEP_ENABLED else None
+    yield
+    if sweep_task is not None:
+        sweep_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweep_task
+    event_hub.stop()
+    outbox_worker.stop()
+    auth.password_hasher.shutdown()
+    await database.async_engine.dispose()
 
-# Create all database tables
-models.Base.metadata.create_all(bind=engine)
+app = FastAPI(title="Food Rescue AI Platform", lifespan=lifespan)
 
-app = FastAPI(title="Food Rescue AI Platform")
+# --- Rate Limiting ---
+# Added before CORS so that 429 responses still carry the CORS headers
+app.add_middleware(RateLimitMiddleware)
 
 # --- CORS ---
 # Allow requests from our React frontend (running on localhost:3000)
@@ -38,8 +71,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # Allow all methods
     allow_headers=["*"], # Allow all headers
+    expose_headers=["X-Total-Count", "ETag"], # Paginated admin lists; list versions
 )
 
+# --- Compression ---
+# Outside CORS and rate limiting, so it sees the finished headers and body
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# --- SQL Tracing ---
+app.add_middleware(QueryTraceMiddleware)
+
+# --- Metrics ---
+# Outermost, so latency and in-flight counts include every other middleware
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # --- API Routers ---
 # We prefix all API routes with /api/v1
 api_prefix = "/api/v1"
@@ -49,6 +96,8 @@ app.include_router(donor_routes.router, prefix=api_prefix, tags=["Donor"])
 app.include_router(ngo_routes.router, prefix=api_prefix, tags=["NGO"])
 app.include_router(admin_routes.router, prefix=api_prefix, tags=["Admin"])
 app.include_router(ai_routes.router, prefix=api_prefix, tags=["AI"])
+if METRICS_ENABLED:
+    app.include_router(metrics_routes.router) # /metrics, unprefixed as scrapers expect
 
 
 @app.get("/")
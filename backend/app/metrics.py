@@ -0,0 +1,221 @@
+# backend/app/metrics.py
+"""
+Counters, gauges and histograms rendered in the Prometheus text format at /metrics.
+
+Recording is a dict lookup and an integer add, with no lock: every series is only
+written from one thread (the event loop for HTTP and AI metrics, the outbox thread
+for email), and CPython's GIL keeps the readers consistent enough for scraping.
+Stats that other components already keep (pool, hasher, caches, rate limits,
+sweeper) are not duplicated here; they are read by collectors at scrape time.
+"""
+import os
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "") # If set, scrapers must send it as a bearer token; required in production
+
+# /metrics shows route templates, rejections, pool state and cache sizes; never serve it openly in production
+if METRICS_ENABLED and not METRICS_TOKEN and os.getenv("ENV", "development").lower() == "production":
+    raise RuntimeError("METRICS_ENABLED=true in production needs METRICS_TOKEN to be set")
+
+# Seconds; spans a cached lookup up to a slow report or model call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float] # (suffix, labels, value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[Sample]:
+        ...
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        return [("", dict(zip(self.labelnames, labels)), value) for labels, value in list(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, labels: Labels = ()):
+        self._values[labels] = value
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.bounds = tuple(buckets)
+        self._series: Dict[Labels, list] = {} # labels -> [count per bucket ..., +Inf count, sum]
+
+    def observe(self, value: float, labels: Labels = ()):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.bounds) + 1) + [0.0]
+        series[bisect_left(self.bounds, value)] += 1
+        series[-1] += value
+
+    def time(self, labels: Labels = ()):
+        return _Timer(self, labels)
+
+    def samples(self):
+        samples = []
+        for labels, series in list(self._series.items()):
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), series[:-1]):
+                cumulative += count
+                samples.append(("_bucket", {**base, "le": _format_value(float(bound))}, cumulative))
+            samples.append(("_sum", base, series[-1]))
+            samples.append(("_count", base, cumulative))
+        return samples
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, self.labels)
+
+
+class CollectedMetric(Metric):
+    """A metric whose samples are read from elsewhere at scrape time. `collect`
+    returns (labels, value) pairs."""
+
+    def __init__(self, name, help, kind: str, collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        super().__init__(name, help)
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self):
+        return [("", labels, value) for labels, value in self.collect()]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def collected(self, name, help, kind, collect) -> CollectedMetric:
+        return self.register(CollectedMetric(name, help, kind, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# --- Application Metrics ---
+http_requests = registry.counter("http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+http_latency = registry.histogram("http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being handled")
+email_send_latency = registry.histogram("email_send_duration_seconds", "SMTP delivery time per email", ("result",))
+ai_provider_latency = registry.histogram("ai_provider_call_duration_seconds", "AI provider calls that missed the cache", ("operation",))
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request", "SQL statements run per HTTP request, by route template", ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+
+# --- Middleware ---
+class MetricsMiddleware:
+    """ASGI middleware recording count, latency and status per route. Routes are
+    labelled by their template (scope["route"].path, e.g. /api/v1/ngo/food/claim/{claim_id}),
+    so label cardinality stays bounded; unmatched paths share one label."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500 # If the app raises before responding
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "unmatched")
+            http_latency.observe(time.perf_counter() - started, labels)
+            http_requests.inc(labels + (str(status),))
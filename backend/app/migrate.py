@@ -0,0 +1,33 @@
+# backend/app/migrate.py
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_REVISION = "0001" # Schema the old create_all() bootstrap produced
+
+
+def alembic_config() -> Config:
+    cfg = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+
+def run_migrations(revision: str = "head"):
+    cfg = alembic_config()
+    with engine.begin() as connection:
+        cfg.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "alembic_version" not in tables and "users" in tables:
+            # Database created by create_all() before migrations existed: adopt it as the baseline
+            logger.info("Stamping existing database at baseline revision %s", BASELINE_REVISION)
+            command.stamp(cfg, BASELINE_REVISION)
+        command.upgrade(cfg, revision)
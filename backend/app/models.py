@@ -1,5 +1,5 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum , Boolean
+from sqlalchemy import Column, Integer, Float, String, Text, ForeignKey, DateTime, Enum , Boolean, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from .database import Base
 import enum
@@ -16,6 +16,12 @@ class FoodStatus(str, enum.Enum):
     delivered = "delivered"
     cancelled = "cancelled"
 
+class EmailStatus(str, enum.Enum):
+    pending = "pending"
+    sending = "sending" # Leased by an outbox worker
+    sent = "sent"
+    failed = "failed"
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -24,6 +30,8 @@ class User(Base):
     name = Column(String, nullable=False)
     role = Column(Enum(UserRole), nullable=False)
     location = Column(String) # e.g., "Whitefield, Bangalore"
+    latitude = Column(Float, nullable=True) # Geocoded from location via the offline gazetteer
+    longitude = Column(Float, nullable=True)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False) # For admin approval
 
@@ -31,13 +39,27 @@ class User(Base):
     food_submissions = relationship("FoodItem", back_populates="donor")
     claims = relationship("Claim", back_populates="ngo")
 
+    __table_args__ = (
+        Index("ix_users_role_is_verified", "role", "is_verified"), # Verification queue, NGO matching
+    )
+
+# Expression indexes for the admin's case-insensitive prefix search on name and email
+Index("ix_users_lower_name", func.lower(User.name))
+Index("ix_users_lower_email", func.lower(User.email))
+
 class FoodItem(Base):
     __tablename__ = "food_items"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(String)
     quantity = Column(String, nullable=False) # e.g., "20 packets" or "10 kg"
+    # Parsed from quantity on write (see quantity_service); empty when it has no number
+    quantity_amount = Column(Float, nullable=True)
+    quantity_unit = Column(String, nullable=True) # kg, l, serving, packet, box or item
+    estimated_servings = Column(Float, nullable=True)
     location = Column(String, nullable=False)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     pickup_time = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     image_url = Column(String, nullable=True)
@@ -48,6 +70,12 @@ class FoodItem(Base):
     
     claim = relationship("Claim", back_populates="food_item", uselist=False)
 
+    __table_args__ = (
+        Index("ix_food_items_status_pickup_time", "status", "pickup_time", "id"), # NGO available feed
+        Index("ix_food_items_donor_id_created_at", "donor_id", "created_at"), # Donor history
+        Index("ix_food_items_status_estimated_servings", "status", "estimated_servings"), # Servings totals, capacity filter
+    )
+
 class Claim(Base):
     __tablename__ = "claims"
     id = Column(Integer, primary_key=True, index=True)
@@ -59,6 +87,29 @@ class Claim(Base):
     food_item = relationship("FoodItem", back_populates="claim")
     ngo = relationship("User", back_populates="claims")
 
+    __table_args__ = (
+        Index("ix_claims_ngo_id_claimed_at", "ngo_id", "claimed_at", "id"), # NGO claim history
+    )
+
+class AnalyticsCounter(Base):
+    # Pre-aggregated food item counts, kept in step with every status change so
+    # analytics reads O(keys) rows instead of scanning food_items.
+    __tablename__ = "analytics_counters"
+    id = Column(Integer, primary_key=True, index=True)
+    dimension = Column(String, nullable=False) # "donor_location", "ngo_location", "day" or "status"
+    key = Column(String, nullable=False)
+    status = Column(Enum(FoodStatus), nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (UniqueConstraint("dimension", "key", "status", name="uq_analytics_counter"),)
+
+class ChangeVersion(Base):
+    # Counters bumped in the same transaction as every write that changes a polled
+    # list, so list routes can answer If-None-Match without re-running their query.
+    __tablename__ = "change_versions"
+    scope = Column(String, primary_key=True) # "food_feed", "donor:<id>" or "ngo:<id>"
+    version = Column(Integer, default=0, nullable=False)
+
 class OtpCode(Base):
     __tablename__ = "otp_codes"
     id = Column(Integer, primary_key=True, index=True)
@@ -74,4 +125,18 @@ class PasswordResetToken(Base):
     email = Column(String, index=True, nullable=False)
     token = Column(String, unique=True, index=True, nullable=False)
     expires_at = Column(DateTime, nullable=False)
-    used = Column(Boolean, default=False)
\ No newline at end of file
+    used = Column(Boolean, default=False)
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(Enum(EmailStatus), default=EmailStatus.pending, index=True)
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
\ No newline at end of file
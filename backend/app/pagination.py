@@ -0,0 +1,47 @@
+# backend/app/pagination.py
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+# --- Page Size Bounds ---
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+# --- Keyset Cursors ---
+# A cursor is the (sort value, id) pair of the last row on a page, encoded as an
+# opaque URL-safe token so clients just echo it back to fetch the next page.
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    raw = f"{sort_value.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_raw, id_raw = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(sort_raw), int(id_raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(sort_column, id_column, cursor: Optional[str], descending: bool = False):
+    """Return the WHERE clause selecting rows strictly after `cursor`, or None for the first page."""
+    if not cursor:
+        return None
+    sort_value, row_id = decode_cursor(cursor)
+    if descending:
+        return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
+
+
+def next_cursor(rows, limit: int, sort_attr: str) -> Optional[str]:
+    # Callers fetch limit + 1 rows; the extra row only signals that another page exists.
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
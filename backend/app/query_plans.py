@@ -0,0 +1,91 @@
+# backend/app/query_plans.py
+"""EXPLAIN-based guard for the hot query shapes used by the routers.
+
+Each entry mirrors a router query. `check_query_plans` asks the database for its plan
+and reports any that fall back to a full table scan, so a missing or unusable index
+fails loudly (see `python -m app.cli check-query-plans`) instead of in production.
+The mirrors let that run against any database; tests/test_query_plans.py checks the
+statements the routes really send, so the two cannot drift apart unnoticed.
+"""
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import Session
+
+from . import models
+
+
+def hot_queries(db: Session):
+    now = datetime.utcnow()
+    return {
+        "ngo.available_feed": db.query(models.FoodItem).filter(
+            models.FoodItem.status == models.FoodStatus.pending
+        ).order_by(models.FoodItem.pickup_time.asc(), models.FoodItem.id.asc()).limit(51),
+        "donor.history": db.query(models.FoodItem).filter(
+            models.FoodItem.donor_id == 1
+        ).order_by(models.FoodItem.created_at.desc()),
+        "ngo.history": db.query(models.Claim).filter(
+            models.Claim.ngo_id == 1
+        ).order_by(models.Claim.claimed_at.desc(), models.Claim.id.desc()),
+        "ngo.claim_lookup": db.query(models.Claim).filter(models.Claim.id == 1),
+        "auth.user_by_email": db.query(models.User).filter(models.User.email == "someone@example.com"),
+        "ai.verified_ngos": db.query(models.User.id).filter(
+            models.User.role == models.UserRole.ngo,
+            models.User.is_verified == True,
+            models.User.is_active == True,
+        ),
+        "admin.user_search": db.query(models.User.id).filter(or_(
+            and_(func.lower(models.User.name) >= "ab", func.lower(models.User.name) < "ab\uffff"),
+            and_(func.lower(models.User.email) >= "ab", func.lower(models.User.email) < "ab\uffff"),
+        )),
+        "analytics.servings_total": db.query(func.sum(models.FoodItem.estimated_servings)).filter(
+            models.FoodItem.status == models.FoodStatus.delivered
+        ),
+        "analytics.top_locations": db.query(models.AnalyticsCounter.key).filter(
+            models.AnalyticsCounter.dimension == "donor_location"
+        ),
+        "email.outbox_due": db.query(models.EmailOutbox.id).filter(
+            models.EmailOutbox.status.in_([models.EmailStatus.pending, models.EmailStatus.sending]),
+            models.EmailOutbox.next_attempt_at <= now,
+        ).order_by(models.EmailOutbox.id),
+    }
+
+
+def _compile(db: Session, query) -> str:
+    return str(query.statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+
+
+def explain(db: Session, query) -> List[str]:
+    return explain_sql(db, _compile(db, query))
+
+
+def explain_sql(db: Session, statement: str, parameters=()) -> List[str]:
+    """Plan lines for a statement as sent to the driver, e.g. one captured by a
+    before_cursor_execute hook, with its parameters."""
+    connection = db.connection()
+    if db.get_bind().dialect.name == "sqlite":
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+    return [row[0] for row in connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)]
+
+
+def is_table_scan(dialect: str, line: str) -> bool:
+    if dialect == "sqlite":
+        # "SCAN food_items" is a full scan; "SEARCH ... USING INDEX" is an index lookup
+        return line.startswith("SCAN") and "USING" not in line
+    return "Seq Scan" in line
+
+
+def check_query_plans(db: Session) -> List[Tuple[str, str]]:
+    """Return (query name, plan line) for every hot query that scans a whole table."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Tiny tables make sequential scans legitimately cheaper; ask what it would do with indexes
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+    failures = []
+    for name, query in hot_queries(db).items():
+        for line in explain(db, query):
+            if is_table_scan(dialect, line):
+                failures.append((name, line))
+    db.rollback()
+    return failures
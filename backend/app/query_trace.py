@@ -0,0 +1,121 @@
+# backend/app/query_trace.py
+"""
+Per-request SQL accounting. Cursor-execute hooks on both engines add every
+statement's count and time to the current request (tracked in a contextvar, which
+follows sync routes into the threadpool and async routes into SQLAlchemy's
+greenlets). Statements slower than SLOW_QUERY_MS are logged with their route; the
+totals go to the db_queries_per_request metric and, optionally, a Server-Timing
+header. tests/test_query_budgets.py uses trace_queries to hold each route to a
+query budget.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from . import database
+from .metrics import db_queries_per_request
+
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SQL_SERVER_TIMING = os.getenv("SQL_SERVER_TIMING", "false").lower() == "true" # Reveals DB timings to clients; off by default
+MAX_LOGGED_STATEMENT = 1000 # Characters; parameters are never logged
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "scope", "parent")
+
+    def __init__(self, scope=None, parent=None):
+        self.count = 0
+        self.seconds = 0.0
+        self.scope = scope # ASGI scope, for the route in slow-query logs
+        self.parent = parent # Enclosing trace, which counts these statements too
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route") if self.scope is not None else None
+        return route.path if route is not None else (self.scope["path"] if self.scope is not None else "-")
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def trace_queries(scope=None):
+    """Count the statements run inside the block (in this context and any thread
+    or greenlet it starts). Yields the QueryStats. Traces nest, so a test tracing a
+    TestClient call sees the statements of the request's own trace."""
+    stats = QueryStats(scope, _current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# --- Engine Hooks ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    traced = stats
+    while traced is not None:
+        traced.count += 1
+        traced.seconds += elapsed
+        traced = traced.parent
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s", elapsed * 1000, stats.route if stats is not None else "-",
+            " ".join(statement.split())[:MAX_LOGGED_STATEMENT],
+        )
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    started = exception_context.connection.info.get("query_started") if exception_context.connection is not None else None
+    if started:
+        started.pop()
+
+
+for _engine in (database.engine, database.async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(_engine, "handle_error", _handle_error)
+
+
+# --- Middleware ---
+class QueryTraceMiddleware:
+    """ASGI middleware giving each request its own QueryStats. Records the query
+    count per route and, with SQL_SERVER_TIMING, adds
+    `Server-Timing: db;dur=<ms>;desc="<n> queries"` to the response."""
+
+    def __init__(self, app, server_timing: bool = SQL_SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with trace_queries(scope) as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start" and self.server_timing:
+                    # Queries run after the headers (streamed bodies) are not included
+                    value = f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+                    message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", value.encode())]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = scope.get("route")
+                db_queries_per_request.observe(stats.count, (scope["method"], route.path if route is not None else "unmatched"))
@@ -0,0 +1,287 @@
+# backend/app/rate_limit.py
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+from jose import JWTError, jwt
+
+from .auth import ALGORITHM, SECRET_KEY
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL", "") # Empty: per-process buckets; redis://... to share them between workers
+# Behind a proxy (e.g. Render) every request arrives from the proxy's address; trust its X-Forwarded-For instead
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+MAX_BUFFERED_BODY = 64 * 1024 # Only small form/JSON bodies are read to find the email; larger ones get a 413
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class Limit:
+    """A bucket of `capacity` requests that refills completely over `per_seconds`."""
+
+    def __init__(self, capacity: int, per_seconds: float):
+        self.capacity = capacity
+        self.per_seconds = per_seconds
+        self.rate = capacity / per_seconds
+
+    def __repr__(self):
+        return f"{self.capacity}/{self.per_seconds:g}s"
+
+
+class RouteLimit:
+    """Budgets for one path (or every path under a prefix ending in "/").
+
+    `user_key` says where the per-user identity comes from: "jwt" (the bearer token's
+    subject), "query:<name>", "form:<name>" or "json:<name>".
+    """
+
+    def __init__(self, path: str, per_ip: Limit, per_user: Optional[Limit] = None, user_key: Optional[str] = None, methods=("POST",)):
+        self.path = path
+        self.per_ip = per_ip
+        self.per_user = per_user
+        self.user_key = user_key
+        self.methods = methods
+
+    def matches(self, method: str, path: str) -> bool:
+        if method not in self.methods:
+            return False
+        return path.startswith(self.path) if self.path.endswith("/") else path == self.path
+
+
+# --- Budgets ---
+# Every rate-limited route is listed here; the first matching entry wins.
+RATE_LIMITS: List[RouteLimit] = [
+    RouteLimit("/api/v1/auth/token", per_ip=Limit(30, 60), per_user=Limit(10, 60), user_key="form:username"), # bcrypt
+    RouteLimit("/api/v1/auth/register", per_ip=Limit(10, 60)), # bcrypt
+    RouteLimit("/api/v1/auth/otp/request", per_ip=Limit(10, 60), per_user=Limit(3, 300), user_key="query:email"), # SMTP
+    RouteLimit("/api/v1/auth/otp/verify", per_ip=Limit(30, 60), per_user=Limit(10, 300), user_key="json:email"),
+    RouteLimit("/api/v1/auth/password/reset/request", per_ip=Limit(10, 60), per_user=Limit(3, 900), user_key="json:email"), # SMTP
+    RouteLimit("/api/v1/auth/password/reset/confirm", per_ip=Limit(10, 60)), # bcrypt
+    RouteLimit("/api/v1/ai/", per_ip=Limit(60, 60), per_user=Limit(30, 60), user_key="jwt", methods=("GET", "POST")), # Model calls
+]
+
+
+# --- Bucket Backends ---
+class MemoryBuckets:
+    blocking = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {} # key -> [tokens, updated_at, idle_after]
+        self._next_purge = time.monotonic() + 60
+
+    def take(self, key: str, limit: Limit) -> float:
+        """Spend one token. Returns 0 if allowed, else the seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_purge:
+                # A bucket idle long enough to refill is the same as no bucket
+                self._buckets = {k: b for k, b in self._buckets.items() if now - b[1] < b[2]}
+                self._next_purge = now + 60
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [limit.capacity, now, limit.per_seconds]
+            tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+            bucket[0] = tokens
+            return (1 - tokens) / limit.rate
+
+
+class RedisBuckets:
+    blocking = True
+
+    # Same refill arithmetic as MemoryBuckets, done atomically on the server
+    SCRIPT = """
+    local capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+    return tostring(wait)
+    """
+
+    def __init__(self, client, prefix: str = "food-rescue:ratelimit:"):
+        self._prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_URL points at Redis but the 'redis' package is not installed")
+        return cls(redis.Redis.from_url(url, decode_responses=True))
+
+    def take(self, key: str, limit: Limit) -> float:
+        return float(self._script(keys=[self._prefix + key], args=[limit.capacity, limit.rate, time.time()]))
+
+
+def create_buckets(url: str = RATE_LIMIT_URL):
+    if not url:
+        return MemoryBuckets()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBuckets.from_url(url)
+    raise RuntimeError(f"Unsupported RATE_LIMIT_URL: {url}")
+
+
+class RateLimiter:
+    def __init__(self, limits: List[RouteLimit], buckets=None):
+        self.limits = limits
+        self.buckets = buckets if buckets is not None else create_buckets()
+        self.rejections = Counter() # (path, "ip" | "user") -> rejected requests
+
+    def match(self, method: str, path: str) -> Optional[RouteLimit]:
+        for rule in self.limits:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def check(self, rule: RouteLimit, ip: str, user: Optional[str]) -> float:
+        retry_after = self.buckets.take(f"{rule.path}|ip|{ip}", rule.per_ip)
+        if retry_after:
+            self.rejections[(rule.path, "ip")] += 1
+            return retry_after
+        if rule.per_user is not None and user:
+            retry_after = self.buckets.take(f"{rule.path}|user|{user.lower()}", rule.per_user)
+            if retry_after:
+                self.rejections[(rule.path, "user")] += 1
+        return retry_after
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "path": rule.path,
+                "per_ip": repr(rule.per_ip),
+                "per_user": repr(rule.per_user) if rule.per_user else None,
+                "rejected_ip": self.rejections[(rule.path, "ip")],
+                "rejected_user": self.rejections[(rule.path, "user")],
+            }
+            for rule in self.limits
+        ]
+
+
+rate_limiter = RateLimiter(RATE_LIMITS)
+
+
+# --- Middleware ---
+class RateLimitMiddleware:
+    """ASGI middleware applying `rate_limiter` before a request reaches its route, so
+    rejected requests never start bcrypt, SMTP or model work."""
+
+    def __init__(self, app, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+        rule = self.limiter.match(scope["method"], scope["path"])
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        user = None
+        if rule.per_user is not None:
+            try:
+                user, receive = await self._identify(rule.user_key, scope, receive)
+            except BodyTooLarge:
+                # A login or OTP form is a few hundred bytes; don't hold megabytes to find out
+                return await self._reject(send, 413, "Request body too large")
+        if self.limiter.buckets.blocking:
+            retry_after = await asyncio.to_thread(self.limiter.check, rule, self._client_ip(scope), user)
+        else:
+            retry_after = self.limiter.check(rule, self._client_ip(scope), user)
+        if retry_after:
+            return await self._reject(send, 429, "Too many requests, please slow down", retry_after)
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _client_ip(scope) -> str:
+        if RATE_LIMIT_TRUST_FORWARDED:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def _identify(self, user_key: str, scope, receive):
+        source, _, name = user_key.partition(":")
+        if source == "jwt":
+            return self._jwt_subject(scope), receive
+        if source == "query":
+            values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get(name)
+            return (values[0] if values else None), receive
+
+        # Body-based identity: buffer the body, then replay it to the route
+        body, messages = await self._read_body(receive)
+        user = None
+        try:
+            if source == "form":
+                values = parse_qs(body.decode("utf-8"))
+                user = values[name][0] if name in values else None
+            elif source == "json":
+                payload = json.loads(body or b"null")
+                user = payload.get(name) if isinstance(payload, dict) else None
+        except (ValueError, UnicodeDecodeError):
+            pass # Let the route produce its usual validation error
+
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        return (user if isinstance(user, str) else None), replay
+
+    @staticmethod
+    async def _read_body(receive):
+        # Raises BodyTooLarge as soon as the body passes MAX_BUFFERED_BODY; the rest is never read
+        messages, chunks, size = [], [], 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BUFFERED_BODY:
+                raise BodyTooLarge()
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        return b"".join(chunks), messages
+
+    @staticmethod
+    def _jwt_subject(scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer":
+                    return None
+                try:
+                    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+                except JWTError:
+                    return None # Rejected by the route's own auth check
+        return None
+
+    @staticmethod
+    async def _reject(send, status: int, detail: str, retry_after: Optional[float] = None):
+        body = json.dumps({"detail": detail}).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if retry_after is not None:
+            headers.append((b"retry-after", str(max(1, math.ceil(retry_after))).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,20 +1,91 @@
 # backend/app/routers/admin_routes.py
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from typing import List, Optional
 
 from .. import schemas, models, auth, database
+from ..cache import TTLCache
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..rate_limit import rate_limiter
+from ..services import ai_service, analytics_service, change_versions, export_service
+from ..services.geo_service import geocode_into, ngo_index
 
 router = APIRouter()
 
+# Totals per filter combination; counting a large users table on every page load is the slow part
+USER_COUNT_CACHE_SECONDS = float(os.getenv("USER_COUNT_CACHE_SECONDS", "30"))
+user_count_cache = TTLCache(maxsize=256, ttl=USER_COUNT_CACHE_SECONDS)
+
+def _prefix(column, prefix: str):
+    # Range on lower(column) rather than LIKE, so the ix_users_lower_* expression indexes apply
+    return and_(func.lower(column) >= prefix, func.lower(column) < prefix + "\uffff")
+
+def _fold(text: str) -> str:
+    # Fold the search text the way the database's lower() folds the column. SQLite's
+    # lower() only folds ASCII, so there non-ASCII letters match case-sensitively.
+    if database.IS_SQLITE:
+        return "".join(char.lower() if char.isascii() else char for char in text)
+    return text.lower()
+
 @router.get("/admin/users", response_model=List[schemas.User])
 def get_all_users(
+    response: Response,
+    role: Optional[models.UserRole] = None,
+    is_verified: Optional[bool] = None,
+    is_active: Optional[bool] = None,
+    q: Optional[str] = Query(None, min_length=1, description="Prefix of the name or email; case-insensitive (ASCII only on SQLite)"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(auth.get_current_admin)
+):
+    # Unverified accounts come first, so the default page is the verification queue.
+    # The total matching count is returned in the X-Total-Count header.
+    query = db.query(models.User)
+    if role is not None:
+        query = query.filter(models.User.role == role)
+    if is_verified is not None:
+        query = query.filter(models.User.is_verified == is_verified)
+    if is_active is not None:
+        query = query.filter(models.User.is_active == is_active)
+    prefix = _fold(q.strip()) if q else None
+    if prefix:
+        query = query.filter(or_(_prefix(models.User.name, prefix), _prefix(models.User.email, prefix)))
+
+    count_key = (role, is_verified, is_active, prefix)
+    total = user_count_cache.get(count_key)
+    if total is None:
+        total = query.order_by(None).count()
+        user_count_cache.set(count_key, total)
+    response.headers["X-Total-Count"] = str(total)
+
+    return query.order_by(models.User.is_verified.asc(), models.User.id.asc()).offset(offset).limit(limit).all()
+
+@router.post("/admin/users/bulk-verify", response_model=schemas.BulkVerifyResponse)
+def bulk_verify_users(
+    payload: schemas.BulkVerifyRequest,
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_admin)
 ):
-    users = db.query(models.User).all()
-    return users
+    # One SELECT and one commit for the whole selection
+    ids = list(dict.fromkeys(payload.user_ids))
+    users = db.query(models.User).filter(models.User.id.in_(ids)).all()
+    for user in users:
+        user.is_verified = True
+        if user.latitude is None:
+            geocode_into(user, user.location)
+    change_versions.bump(db, [scope for user in users for scope in change_versions.user_scopes(user)])
+    db.commit()
+    user_count_cache.clear()
+    for user in users:
+        auth.invalidate_cached_user(user.email)
+        ngo_index.upsert(user)
+    found = {user.id for user in users}
+    return {"verified": sorted(users, key=lambda user: user.id), "not_found": [user_id for user_id in ids if user_id not in found]}
 
 @router.put("/admin/users/{user_id}/verify", response_model=schemas.User)
 def verify_user(
@@ -27,28 +98,81 @@ def verify_user(
         raise HTTPException(status_code=404, detail="User not found")
         
     user_to_verify.is_verified = True
+    if user_to_verify.latitude is None:
+        geocode_into(user_to_verify, user_to_verify.location)
+    change_versions.bump(db, change_versions.user_scopes(user_to_verify))
     db.commit()
-    db.refresh(user_to_verify)
+    user_count_cache.clear()
+    auth.invalidate_cached_user(user_to_verify.email)
+    ngo_index.upsert(user_to_verify)
     return user_to_verify
 
+@router.put("/admin/users/{user_id}/deactivate", response_model=schemas.User)
+def deactivate_user(
+    user_id: int,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(auth.get_current_admin)
+):
+    user_to_deactivate = db.query(models.User).filter(models.User.id == user_id).first()
+    if not user_to_deactivate:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user_to_deactivate.is_active = False
+    change_versions.bump(db, change_versions.user_scopes(user_to_deactivate))
+    db.commit()
+    user_count_cache.clear()
+    auth.invalidate_cached_user(user_to_deactivate.email)
+    ngo_index.upsert(user_to_deactivate)
+    return user_to_deactivate
+
 # ... (Add other admin actions like suspend_user, etc.)
 
+@router.get("/admin/rate-limits")
+def get_rate_limit_stats(current_user: models.User = Depends(auth.get_current_admin)):
+    # Configured budgets and how many requests each has rejected since startup, for tuning
+    return rate_limiter.stats()
+
+@router.get("/admin/ai-cache")
+def get_ai_cache_stats(current_user: models.User = Depends(auth.get_current_admin)):
+    return {"provider": ai_service.provider.name, **ai_service.ai_cache.stats()}
+
+@router.get("/admin/export/{entity}")
+def export_entity(
+    entity: str,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    start: Optional[datetime] = None, # Inclusive; created_at for food items, claimed_at for claims
+    end: Optional[datetime] = None, # Exclusive
+    status: Optional[models.FoodStatus] = None,
+    role: Optional[models.UserRole] = None,
+    current_user: models.User = Depends(auth.get_current_admin)
+):
+    spec = export_service.EXPORTS.get(entity)
+    if spec is None:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{entity}'. Choose from: {', '.join(export_service.EXPORTS)}")
+    if (start or end) and spec.date_column is None:
+        raise HTTPException(status_code=400, detail=f"'{entity}' cannot be filtered by date")
+    if status and spec.status_column is None:
+        raise HTTPException(status_code=400, detail=f"'{entity}' cannot be filtered by status")
+    if role and spec.role_column is None:
+        raise HTTPException(status_code=400, detail=f"'{entity}' cannot be filtered by role")
+
+    # Rows are read in batches and written as they arrive, so memory stays flat for any table size
+    chunks = export_service.export_chunks(entity, format, gzip=gzip, start=start, end=end, status=status, role=role)
+    filename = f"{entity}-{datetime.utcnow():%Y%m%d}.{format}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else ("text/csv" if format == "csv" else "application/x-ndjson")
+    return StreamingResponse(chunks, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
 @router.get("/admin/analytics", response_model=schemas.AIAnalyticsResponse)
 def get_platform_analytics(
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_admin)
 ):
-    # This is a simple DB query. The real AI analytics is in ai_routes.
-    total_food = db.query(models.FoodItem).filter(models.FoodItem.status == models.FoodStatus.delivered).count()
-    
-    # Example of finding top locations
-    top_donor_locs = db.query(
-        models.FoodItem.location, func.count(models.FoodItem.id).label('count')
-    ).group_by(models.FoodItem.location).order_by(func.count(models.FoodItem.id).desc()).limit(3).all()
-    
+    # Reads the pre-aggregated rollups. The real AI analytics is in ai_routes.
     return {
-        "total_food_redistributed": total_food,
-        "top_donor_locations": [{"location": loc, "count": count} for loc, count in top_donor_locs],
-        "top_ngo_locations": [], # Could add similar logic for NGOs
+        "total_food_redistributed": analytics_service.status_total(db, models.FoodStatus.delivered),
+        "total_servings_redistributed": analytics_service.servings_total(db, models.FoodStatus.delivered),
+        "top_donor_locations": analytics_service.top_keys(db, analytics_service.DONOR_LOCATION),
+        "top_ngo_locations": analytics_service.top_keys(db, analytics_service.NGO_LOCATION),
         "insight": "Data analysis complete. Run AI analytics for deeper insights."
     }
\ No newline at end of file
@@ -1,39 +1,68 @@
 # backend/app/routers/ai_routes.py
+import logging
+
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas, models, auth, database
 from ..services import ai_service
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def _batch_items(results):
+    items = []
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            logger.warning("AI batch item %s failed: %r", index, result)
+            items.append({"index": index, "error": "Could not process this item"})
+        else:
+            items.append({"index": index, "result": result})
+    return items
 
 @router.post("/ai/shelf-life", response_model=schemas.AIShelfLifeResponse)
 async def get_shelf_life_estimation(
     req: schemas.AIShelfLifeRequest,
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
-    # In a real app, you'd add your google-generativeai logic here
-    return await ai_service.get_mock_shelf_life(req.description)
+    return await ai_service.get_shelf_life(req.description)
+
+@router.post("/ai/shelf-life/batch", response_model=schemas.AIShelfLifeBatchResponse)
+async def get_shelf_life_estimation_batch(
+    req: schemas.AIShelfLifeBatchRequest,
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    results = await ai_service.get_shelf_life_batch([item.description for item in req.items])
+    return {"results": _batch_items(results)}
 
 @router.post("/ai/match-ngo", response_model=schemas.AIMatchResponse)
 async def get_smart_ngo_matching(
     req: schemas.AIMatchRequest,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(auth.get_current_donor)
 ):
-    return await ai_service.get_mock_ngo_match(req, db)
+    return await ai_service.get_ngo_match(req, db)
 
 @router.post("/ai/draft-message", response_model=schemas.AIDraftMessageResponse)
 async def get_auto_drafted_message(
     req: schemas.AIDraftMessageRequest,
     current_user: models.User = Depends(auth.get_current_donor)
 ):
-    return await ai_service.get_mock_draft_message(req)
+    return await ai_service.get_draft_message(req)
+
+@router.post("/ai/draft-message/batch", response_model=schemas.AIDraftMessageBatchResponse)
+async def get_auto_drafted_message_batch(
+    req: schemas.AIDraftMessageBatchRequest,
+    current_user: models.User = Depends(auth.get_current_donor)
+):
+    results = await ai_service.get_draft_message_batch(req.items)
+    return {"results": _batch_items(results)}
 
 
 @router.get("/ai/analytics-insight", response_model=schemas.AIAnalyticsResponse)
 async def get_ai_analytics_insight(
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(auth.get_current_admin)
 ):
-    return await ai_service.get_mock_analytics_insight(db)
\ No newline at end of file
+    return await ai_service.get_analytics_insight(db)
\ No newline at end of file
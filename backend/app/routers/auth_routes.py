@@ -1,35 +1,38 @@
 # backend/app/routers/auth_routes.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from .. import schemas, models, auth, database
 import os
 from pydantic import BaseModel, EmailStr
-from datetime import datetime, timedelta
-import random
+import secrets
 import string
 from ..services.email_service import send_otp_email, send_password_reset_email
+from ..services import geo_service, token_store
 
 router = APIRouter()
 
 @router.post("/auth/register", response_model=schemas.User)
-def register_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
-    db_user = auth.get_user(db, email=user.email)
+async def register_user(user: schemas.UserCreate, db: AsyncSession = Depends(database.get_async_db)):
+    # Async end to end: the hash runs on the hasher's pool and the queries on the
+    # async engine, so a burst of sign-ups never ties up the event loop
+    db_user = await auth.get_user_async(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = auth.get_password_hash(user.password)
+    hashed_password = await auth.hash_password(user.password)
     
     # Default verification based on role
     is_verified = user.role == models.UserRole.donor  # Donors verified by default
     if user.role == models.UserRole.admin:
         # Auto-verify the first admin to enable bootstrap
-        existing_admin = (
-            db.query(models.User)
-            .filter(models.User.role == models.UserRole.admin)
-            .first()
+        existing_admin = await db.scalar(
+            select(models.User.id).where(models.User.role == models.UserRole.admin).limit(1)
         )
         if existing_admin is None:
             is_verified = True
@@ -42,21 +45,29 @@ def register_user(user: schemas.UserCreate, db: Session = Depends(database.get_d
         location=user.location,
         is_verified=is_verified # NGOs/Admins must be verified by another admin
     )
+    geo_service.geocode_into(new_user, user.location)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     return new_user
 
 @router.post("/auth/token", response_model=schemas.Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
-    user = auth.get_user(db, email=form_data.username) # username is the email
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(database.get_async_db)):
+    user = await auth.get_user_async(db, email=form_data.username) # username is the email
     
-    if not user or not auth.verify_password(form_data.password, user.hashed_password):
+    password_ok, new_hash = False, None
+    if user:
+        password_ok, new_hash = await auth.verify_password_and_update(form_data.password, user.hashed_password)
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    if new_hash:
+        # The configured cost factor changed since this hash was made; upgrade it now
+        user.hashed_password = new_hash
+        await db.commit()
         
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -85,14 +96,9 @@ def request_otp(email: EmailStr, db: Session = Depends(database.get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    code = "".join(random.choices(string.digits, k=6))
-    expires_at = datetime.utcnow() + timedelta(minutes=10)
-
-    # Invalidate previous OTPs
-    db.query(models.OtpCode).filter(models.OtpCode.email == email, models.OtpCode.consumed == False).update({models.OtpCode.consumed: True})
-    otp = models.OtpCode(email=email, code=code, expires_at=expires_at)
-    db.add(otp)
-    db.commit()
+    code = "".join(secrets.choice(string.digits) for _ in range(6))
+    # Replaces any previous OTP for this email
+    token_store.issue_otp(email, code, ttl_seconds=10 * 60)
 
     # Send email (will fall back to console if SMTP_STRICT=false)
     try:
@@ -114,20 +120,13 @@ class OtpVerifyRequest(BaseModel):
 
 @router.post("/auth/otp/verify", response_model=schemas.Token)
 def verify_otp(payload: OtpVerifyRequest, db: Session = Depends(database.get_db)):
-    otp: models.OtpCode | None = (
-        db.query(models.OtpCode)
-        .filter(models.OtpCode.email == payload.email, models.OtpCode.code == payload.code, models.OtpCode.consumed == False)
-        .order_by(models.OtpCode.id.desc())
-        .first()
-    )
-
-    if not otp or otp.expires_at < datetime.utcnow():
+    try:
+        valid = token_store.consume_otp(payload.email, payload.code)
+    except token_store.TooManyAttempts:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many attempts, request a new OTP")
+    if not valid:
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
-    otp.consumed = True
-    db.add(otp)
-    db.commit()
-
     user = auth.get_user(db, email=payload.email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -155,22 +154,9 @@ def password_reset_request(payload: PasswordResetRequestBody, db: Session = Depe
         return {"message": "If the email exists, a reset link has been sent"}
 
     # Generate token
-    token = "".join(random.choices(string.ascii_letters + string.digits, k=48))
-    expires_at = datetime.utcnow() + timedelta(minutes=60)
-
-    # Invalidate previous unused tokens
-    db.query(models.PasswordResetToken).filter(
-        models.PasswordResetToken.email == payload.email,
-        models.PasswordResetToken.used == False
-    ).update({models.PasswordResetToken.used: True})
-
-    reset_entry = models.PasswordResetToken(
-        email=payload.email,
-        token=token,
-        expires_at=expires_at,
-    )
-    db.add(reset_entry)
-    db.commit()
+    token = "".join(secrets.choice(string.ascii_letters + string.digits) for _ in range(48))
+    # Invalidates any earlier link for this email
+    token_store.issue_reset_token(payload.email, token, ttl_seconds=60 * 60)
 
     frontend_base = os.getenv("FRONTEND_BASE_URL", "http://localhost:5173")
     reset_url = f"{frontend_base}/reset-password?token={token}"
@@ -194,24 +180,21 @@ class PasswordResetConfirmBody(BaseModel):
 
 
 @router.post("/auth/password/reset/confirm")
-def password_reset_confirm(payload: PasswordResetConfirmBody, db: Session = Depends(database.get_db)):
-    entry: models.PasswordResetToken | None = (
-        db.query(models.PasswordResetToken)
-        .filter(models.PasswordResetToken.token == payload.token)
-        .first()
-    )
-    if not entry or entry.used or entry.expires_at < datetime.utcnow():
+async def password_reset_confirm(payload: PasswordResetConfirmBody, db: AsyncSession = Depends(database.get_async_db)):
+    # The token store may be Redis, so its calls go to the threadpool, off the event loop
+    email = await run_in_threadpool(token_store.reset_token_email, payload.token)
+    if email is None:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
 
-    user = auth.get_user(db, email=entry.email)
+    user = await auth.get_user_async(db, email=email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Update password
-    user.hashed_password = auth.get_password_hash(payload.new_password)
-    entry.used = True
-    db.add(user)
-    db.add(entry)
-    db.commit()
+    # Update password; the token is only spent once the new hash is ready
+    user.hashed_password = await auth.hash_password(payload.new_password)
+    if await run_in_threadpool(token_store.consume_reset_token, payload.token) is None:
+        raise HTTPException(status_code=400, detail="Invalid or expired token")
+    await db.commit()
+    auth.invalidate_cached_user(user.email)
 
     return {"message": "Password has been reset successfully"}
\ No newline at end of file
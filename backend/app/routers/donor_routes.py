@@ -1,9 +1,16 @@
 # backend/app/routers/donor_routes.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+import codecs
+import csv
+
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Request, Response, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import Any, List
 
 from .. import schemas, models, auth, database
+from ..services import analytics_service, change_versions, donation_service, geo_service, quantity_service
+from ..services.events import CREATED, event_hub
 
 router = APIRouter()
 
@@ -21,15 +28,76 @@ def submit_food_donation(
         status=models.FoodStatus.pending
         # image_url= "path/to/uploaded/image.jpg" # Add this once upload is handled
     )
+    geo_service.geocode_into(db_food_item, food.location)
+    quantity_service.parse_into(db_food_item, food.quantity)
     db.add(db_food_item)
+    analytics_service.record_transition(db, food.location, None, None, models.FoodStatus.pending)
+    change_versions.bump(db, [change_versions.FOOD_FEED, change_versions.donor_scope(current_user.id)])
     db.commit()
-    db.refresh(db_food_item)
+    event_hub.publish(CREATED, db_food_item.id, schemas.FoodItemSummary.model_validate(db_food_item).model_dump(mode="json"))
     return db_food_item
 
-@router.get("/donor/food/history", response_model=List[schemas.FoodItem])
-def get_donor_submission_history(
+def _bulk_response(results):
+    failed = sum(1 for result in results if "error" in result)
+    return {"created": len(results) - failed, "failed": failed, "results": results}
+
+@router.post("/donor/food/bulk", response_model=schemas.BulkDonationResponse)
+def submit_food_donations_bulk(
+    rows: List[Any] = Body(...),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(auth.get_current_donor)
+):
+    # Rows are validated one by one so a bad row is reported instead of failing the upload
+    if len(rows) > donation_service.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {donation_service.BULK_MAX_ROWS} rows can be uploaded at once",
+        )
+    results = donation_service.bulk_create_donations(db, current_user.id, enumerate(rows))
+    return _bulk_response(results)
+
+@router.post("/donor/food/bulk/csv", response_model=schemas.BulkDonationResponse)
+def submit_food_donations_csv(
+    file: UploadFile = File(...),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_donor)
 ):
-    history = db.query(models.FoodItem).filter(models.FoodItem.donor_id == current_user.id).order_by(models.FoodItem.created_at.desc()).all()
-    return history
\ No newline at end of file
+    # Columns: name, description, quantity, location, pickup_time (ISO 8601). The file
+    # is read row by row, so large sheets are never held in memory as a whole.
+    reader = csv.DictReader(codecs.iterdecode(file.file, "utf-8-sig"))
+    try:
+        missing = {"name", "quantity", "location", "pickup_time"} - set(reader.fieldnames or [])
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=400, detail=f"Could not read CSV: {exc}")
+    if missing:
+        raise HTTPException(status_code=400, detail=f"CSV is missing columns: {', '.join(sorted(missing))}")
+
+    def rows():
+        try:
+            for data in reader:
+                # Blank cells mean "not given", so optional columns fall back to their defaults
+                yield reader.line_num, {key: value for key, value in data.items() if key and value not in (None, "")}
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # Rows before this point are kept; report where reading stopped
+            yield reader.line_num + 1, ValueError(f"Could not read CSV from here on: {exc}")
+
+    results = donation_service.bulk_create_donations(db, current_user.id, rows())
+    return _bulk_response(results)
+
+@router.get("/donor/food/history", response_model=List[schemas.FoodItem])
+async def get_donor_submission_history(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: models.User = Depends(auth.get_current_donor)
+):
+    # Polled by the dashboard: answer 304 while nothing in the donor's history changed
+    not_modified = await change_versions.check(request, response, db, [change_versions.donor_scope(current_user.id)])
+    if not_modified is not None:
+        return not_modified
+    history = await db.scalars(
+        select(models.FoodItem).options(selectinload(models.FoodItem.donor))
+        .where(models.FoodItem.donor_id == current_user.id)
+        .order_by(models.FoodItem.created_at.desc())
+    )
+    return history.all()
\ No newline at end of file
@@ -0,0 +1,75 @@
+# backend/app/routers/metrics_routes.py
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.pool import QueuePool
+from typing import Optional
+
+from .. import auth, database
+from ..metrics import METRICS_TOKEN, registry
+from ..rate_limit import rate_limiter
+from ..services.ai_service import ai_cache
+from ..services.email_outbox import outbox_worker
+from ..services.maintenance import sweeper
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --- Collectors ---
+# Read at scrape time from the stats each component already keeps
+def _pool_stat(read):
+    def collect():
+        for name, engine in (("sync", database.engine), ("async", database.async_engine.sync_engine)):
+            if isinstance(engine.pool, QueuePool): # In-memory SQLite uses a pool without these counters
+                yield {"engine": name}, read(engine.pool)
+    return collect
+
+
+registry.collected("db_pool_size", "Connections the pool keeps open", "gauge", _pool_stat(lambda pool: pool.size()))
+registry.collected("db_pool_checked_out", "Connections currently checked out", "gauge", _pool_stat(lambda pool: pool.checkedout()))
+registry.collected("db_pool_checked_in", "Idle connections in the pool", "gauge", _pool_stat(lambda pool: pool.checkedin()))
+registry.collected(
+    "db_pool_overflow", "Connections open beyond pool_size (negative while the pool is not yet full)", "gauge",
+    _pool_stat(lambda pool: pool.overflow()),
+)
+
+registry.collected("email_sent_total", "Emails delivered by this process's outbox worker", "counter", lambda: [({}, outbox_worker.sent)])
+
+for _key, _kind, _help in (
+    ("hits", "counter", "AI cache lookups answered from the cache"),
+    ("misses", "counter", "AI cache lookups that missed"),
+    ("coalesced", "counter", "AI cache misses that joined a call already in flight"),
+    ("size", "gauge", "Entries in the AI cache"),
+):
+    _name = f"ai_cache_{_key}" + ("_total" if _kind == "counter" else "")
+    registry.collected(_name, _help, _kind, lambda key=_key: [({}, ai_cache.stats()[key])])
+
+for _key, _kind, _help in (
+    ("in_flight", "gauge", "Password hashes running"),
+    ("queued", "gauge", "Password hashes waiting for a worker"),
+    ("completed", "counter", "Password hashes finished"),
+    ("rejected", "counter", "Password hashes rejected because the queue was full"),
+):
+    _name = f"password_hash_{_key}" + ("_total" if _kind == "counter" else "")
+    registry.collected(_name, _help, _kind, lambda key=_key: [({}, auth.password_hasher.stats()[key])])
+
+registry.collected(
+    "rate_limit_rejections_total", "Requests rejected with 429, by budget", "counter",
+    lambda: [({"path": path, "scope": scope}, count) for (path, scope), count in list(rate_limiter.rejections.items())],
+)
+registry.collected("maintenance_sweeps_total", "Maintenance sweeps run by this process", "counter", lambda: [({}, sweeper.runs)])
+registry.collected(
+    "maintenance_swept_rows_total", "Rows expired or deleted by maintenance sweeps", "counter",
+    lambda: [({"kind": kind}, count) for kind, count in list(sweeper.totals.items())],
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    if METRICS_TOKEN and not secrets.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    # Rendered on the event loop, the thread that writes the HTTP and AI series
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
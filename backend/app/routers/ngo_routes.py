@@ -1,21 +1,106 @@
 # backend/app/routers/ngo_routes.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+import json
+from collections import Counter
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, noload, selectinload
+from typing import List, Optional
 
 from .. import schemas, models, auth, database
+from ..services import analytics_service, change_versions
+from ..services.events import CLAIMED, CREATED, event_hub
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_filter, next_cursor
 
 router = APIRouter()
 
+STREAM_HEARTBEAT_SECONDS = 15 # Keeps proxies from closing idle streams
+
+# Full claim graph for schemas.Claim, in one SELECT: every relation is many-to-one
+CLAIM_GRAPH = (
+    joinedload(models.Claim.food_item).joinedload(models.FoodItem.donor),
+    joinedload(models.Claim.ngo),
+)
+CLAIM_EXPANSIONS = ("food_item", "food_item.donor", "ngo")
+
+def _claim_loaders(expand: Optional[str]):
+    # Loader options for ?expand=food_item,food_item.donor,ngo; anything not expanded is
+    # left out of the response rather than lazy-loaded, so each page costs a fixed
+    # number of queries: one, plus one per expanded user relation.
+    requested = {part.strip() for part in (expand or "").split(",") if part.strip()}
+    unknown = requested - set(CLAIM_EXPANSIONS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown expand value(s): {', '.join(sorted(unknown))}")
+    if "food_item.donor" in requested:
+        food_loader = joinedload(models.Claim.food_item).selectinload(models.FoodItem.donor)
+    elif "food_item" in requested:
+        food_loader = joinedload(models.Claim.food_item).noload(models.FoodItem.donor)
+    else:
+        food_loader = noload(models.Claim.food_item)
+    # Every claim on a page shares the same NGO, so selectin fetches it once
+    ngo_loader = selectinload(models.Claim.ngo) if "ngo" in requested else noload(models.Claim.ngo)
+    return food_loader, ngo_loader
+
+def _within_capacity(stmt, max_servings: Optional[float]):
+    # Lets an NGO hide donations bigger than it can take. Items whose quantity could
+    # not be parsed have no estimate and are always shown.
+    if max_servings is None:
+        return stmt
+    servings = models.FoodItem.estimated_servings
+    return stmt.where(or_(servings.is_(None), servings <= max_servings))
+
 @router.get("/ngo/food/available", response_model=List[schemas.FoodItem])
-def get_available_food_donations(
-    db: Session = Depends(database.get_db),
+async def get_available_food_donations(
+    request: Request,
+    response: Response,
+    max_servings: Optional[float] = Query(None, gt=0),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: models.User = Depends(auth.get_current_ngo)
+):
+    # Polled by every NGO dashboard: answer 304 while the pending set is unchanged
+    not_modified = await change_versions.check(request, response, db, [change_versions.FOOD_FEED])
+    if not_modified is not None:
+        return not_modified
+    stmt = select(models.FoodItem).options(selectinload(models.FoodItem.donor)).where(
+        models.FoodItem.status == models.FoodStatus.pending
+    )
+    available_food = await db.scalars(
+        _within_capacity(stmt, max_servings).order_by(models.FoodItem.pickup_time.asc(), models.FoodItem.id.asc())
+    )
+    return available_food.all()
+
+@router.get("/ngo/food/available/page", response_model=schemas.FoodItemPage)
+async def get_available_food_page(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    include_donor: bool = False,
+    max_servings: Optional[float] = Query(None, gt=0),
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(auth.get_current_ngo)
 ):
-    available_food = db.query(models.FoodItem).filter(
+    # Keyset pagination on (pickup_time, id): one query for the page plus at most
+    # one batched SELECT for the donors, however large the pending backlog is.
+    not_modified = await change_versions.check(request, response, db, [change_versions.FOOD_FEED])
+    if not_modified is not None:
+        return not_modified
+    donor_loader = selectinload(models.FoodItem.donor) if include_donor else noload(models.FoodItem.donor)
+    stmt = select(models.FoodItem).options(donor_loader).where(
         models.FoodItem.status == models.FoodStatus.pending
-    ).order_by(models.FoodItem.pickup_time.asc()).all()
-    return available_food
+    )
+    stmt = _within_capacity(stmt, max_servings)
+    after = keyset_filter(models.FoodItem.pickup_time, models.FoodItem.id, cursor)
+    if after is not None:
+        stmt = stmt.where(after)
+    rows = (await db.scalars(
+        stmt.order_by(models.FoodItem.pickup_time.asc(), models.FoodItem.id.asc()).limit(limit + 1)
+    )).all()
+
+    return {"items": rows[:limit], "next_cursor": next_cursor(rows, limit, "pickup_time")}
 
 @router.post("/ngo/food/claim/{food_item_id}", response_model=schemas.Claim)
 def claim_food_item(
@@ -23,32 +108,58 @@ def claim_food_item(
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_ngo)
 ):
-    # 1. Find the food item
-    db_food_item = db.query(models.FoodItem).filter(models.FoodItem.id == food_item_id).first()
-    
-    if not db_food_item:
-        raise HTTPException(status_code=404, detail="Food item not found")
-        
-    # 2. Check if it's still pending
-    if db_food_item.status != models.FoodStatus.pending:
-        raise HTTPException(status_code=400, detail="Food item is no longer available")
-        
-    # 3. Create the claim
-    new_claim = models.Claim(
-        food_item_id=food_item_id,
-        ngo_id=current_user.id,
-        status=models.FoodStatus.claimed
-    )
-    
-    # 4. Update the food item status
-    db_food_item.status = models.FoodStatus.claimed
-    
-    db.add(new_claim)
-    db.add(db_food_item)
+    # 1. Flip the item to claimed only if it is still pending. The conditional UPDATE
+    #    is atomic, so exactly one of several concurrent claimers can win it.
+    won = db.execute(
+        update(models.FoodItem)
+        .where(models.FoodItem.id == food_item_id, models.FoodItem.status == models.FoodStatus.pending)
+        .values(status=models.FoodStatus.claimed)
+        .returning(models.FoodItem.location, models.FoodItem.created_at, models.FoodItem.donor_id)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if won is None:
+        db.rollback()
+        exists = db.query(models.FoodItem.id).filter(models.FoodItem.id == food_item_id).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Food item not found")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Food item is no longer available")
+
+    # 2. Take over the claim left behind when an NGO put this item back to pending
+    #    (claims.food_item_id is unique) rather than deleting it, so the row and its id
+    #    survive for history and exports. Winning the UPDATE above holds the item's row,
+    #    so no other claimer can touch this claim before we commit.
+    claim = db.scalars(
+        select(models.Claim).options(joinedload(models.Claim.ngo)).where(models.Claim.food_item_id == food_item_id)
+    ).first()
+    deltas = Counter()
+    analytics_service.add_transition(deltas, won.location, won.created_at, models.FoodStatus.pending, models.FoodStatus.claimed)
+    previous_ngo = None
+    if claim is None:
+        claim = models.Claim(food_item_id=food_item_id)
+        db.add(claim)
+    else:
+        # The claim moves off the previous NGO's counters as well as onto ours
+        previous_ngo = claim.ngo_id
+        if claim.ngo is not None:
+            analytics_service.add_claim_transition(deltas, claim.ngo.location or "Unknown", claim.status, None)
+    analytics_service.add_claim_transition(deltas, current_user.location or "Unknown", None, models.FoodStatus.claimed)
+    analytics_service.apply_deltas(db, deltas)
+    claim.ngo_id = current_user.id
+    claim.status = models.FoodStatus.claimed
+    claim.claimed_at = datetime.utcnow()
+    change_versions.bump(db, [
+        change_versions.FOOD_FEED, change_versions.donor_scope(won.donor_id), change_versions.ngo_scope(current_user.id),
+        *([change_versions.ngo_scope(previous_ngo)] if previous_ngo is not None else []),
+    ])
     db.commit()
-    db.refresh(new_claim)
-    
-    return new_claim
+
+    event_hub.publish(CLAIMED, food_item_id, {"status": models.FoodStatus.claimed.value, "ngo_id": current_user.id})
+    # Re-read with the nested food item, donor and NGO the response needs, instead of
+    # three lazy loads during serialization
+    return db.scalars(
+        select(models.Claim).options(*CLAIM_GRAPH).where(models.Claim.id == claim.id).execution_options(populate_existing=True)
+    ).one()
 
 @router.put("/ngo/food/claim/{claim_id}", response_model=schemas.Claim)
 def update_claim_status(
@@ -57,7 +168,8 @@ def update_claim_status(
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_ngo)
 ):
-    db_claim = db.query(models.Claim).filter(models.Claim.id == claim_id).first()
+    # Loads the claim with everything the response serializes in one query
+    db_claim = db.scalars(select(models.Claim).options(*CLAIM_GRAPH).where(models.Claim.id == claim_id)).first()
     
     if not db_claim:
         raise HTTPException(status_code=404, detail="Claim not found")
@@ -66,17 +178,99 @@ def update_claim_status(
         raise HTTPException(status_code=403, detail="Not authorized to update this claim")
         
     # Update status for both claim and food item
+    food_item = db_claim.food_item
+    analytics_service.record_transition(
+        db, food_item.location, food_item.created_at, food_item.status, claim_update.status,
+        ngo_location=current_user.location or "Unknown"
+    )
     db_claim.status = claim_update.status
-    db_claim.food_item.status = claim_update.status
+    food_item.status = claim_update.status
+    change_versions.bump(db, [change_versions.FOOD_FEED, change_versions.donor_scope(food_item.donor_id), change_versions.ngo_scope(current_user.id)])
     
     db.commit()
-    db.refresh(db_claim)
+    # An item put back to pending is available again, which clients handle like a new donation
+    event_type = CREATED if claim_update.status == models.FoodStatus.pending else claim_update.status.value
+    event_hub.publish(event_type, food_item.id, {"status": claim_update.status.value, "ngo_id": current_user.id})
     return db_claim
 
 @router.get("/ngo/food/history", response_model=List[schemas.Claim])
-def get_ngo_claim_history(
+async def get_ngo_claim_history(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: models.User = Depends(auth.get_current_ngo)
+):
+    not_modified = await change_versions.check(request, response, db, [change_versions.ngo_scope(current_user.id)])
+    if not_modified is not None:
+        return not_modified
+    history = await db.scalars(
+        select(models.Claim).options(
+            joinedload(models.Claim.food_item).selectinload(models.FoodItem.donor),
+            selectinload(models.Claim.ngo),
+        )
+        .where(models.Claim.ngo_id == current_user.id)
+        .order_by(models.Claim.claimed_at.desc(), models.Claim.id.desc())
+    )
+    return history.all()
+
+@router.get("/ngo/food/history/page", response_model=schemas.ClaimPage)
+async def get_ngo_claim_history_page(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expand: Optional[str] = Query(None, description="Comma-separated: food_item, food_item.donor, ngo"),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: models.User = Depends(auth.get_current_ngo)
+):
+    # Newest first, keyset on (claimed_at, id) over ix_claims_ngo_id_claimed_at. Claims
+    # are flat unless expanded.
+    loaders = _claim_loaders(expand)
+    not_modified = await change_versions.check(request, response, db, [change_versions.ngo_scope(current_user.id)])
+    if not_modified is not None:
+        return not_modified
+    stmt = select(models.Claim).options(*loaders).where(models.Claim.ngo_id == current_user.id)
+    after = keyset_filter(models.Claim.claimed_at, models.Claim.id, cursor, descending=True)
+    if after is not None:
+        stmt = stmt.where(after)
+    rows = (await db.scalars(
+        stmt.order_by(models.Claim.claimed_at.desc(), models.Claim.id.desc()).limit(limit + 1)
+    )).all()
+
+    return {"items": rows[:limit], "next_cursor": next_cursor(rows, limit, "claimed_at")}
+
+async def event_stream(request: Request, since: Optional[int]):
+    # The SSE body: events as they happen, with a comment line on idle streams
+    async with event_hub.subscription(since, heartbeat=STREAM_HEARTBEAT_SECONDS) as events:
+        yield "retry: 3000\n\n"
+        async for event in events:
+            if event is None:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+@router.get("/ngo/stream")
+async def stream_food_events(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    last_event_id: Optional[str] = Header(None),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_ngo)
 ):
-    history = db.query(models.Claim).filter(models.Claim.ngo_id == current_user.id).order_by(models.Claim.claimed_at.desc()).all()
-    return history
\ No newline at end of file
+    """Server-Sent Events feed of changes to donations (created, claimed, delivered,
+    cancelled, and bulk_created listing the ids from one bulk upload). Each event's
+    `id` is its sequence number; reconnecting with the
+    Last-Event-ID header (or `?since=`) replays what was missed. A "reset" event means
+    the gap could not be replayed and the client should reload the available list."""
+    # Release the auth lookup's connection; the stream itself never touches the database
+    db.close()
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    return StreamingResponse(
+        event_stream(request, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,5 +1,5 @@
 # backend/app/schemas.py
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from datetime import datetime
 from .models import UserRole, FoodStatus
@@ -22,6 +22,13 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+class BulkVerifyRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+class BulkVerifyResponse(BaseModel):
+    verified: List[User]
+    not_found: List[int]
+
 # --- Auth Schemas ---
 class Token(BaseModel):
     access_token: str
@@ -57,17 +64,39 @@ class FoodItemBase(BaseModel):
 class FoodItemCreate(FoodItemBase):
     pass
 
-class FoodItem(FoodItemBase):
+class FoodItemSummary(FoodItemBase):
     id: int
     created_at: datetime
     status: FoodStatus
     donor_id: int
-    donor: User
     image_url: Optional[str] = None
+    quantity_amount: Optional[float] = None # Parsed from quantity
+    quantity_unit: Optional[str] = None
+    estimated_servings: Optional[float] = None
 
     class Config:
         from_attributes = True
 
+class FoodItem(FoodItemSummary):
+    donor: User
+
+class FoodFeedItem(FoodItemSummary):
+    donor: Optional[User] = None # Only populated when the client asks for it
+
+class BulkDonationRowResult(BaseModel):
+    row: int # Index in the JSON array, or line number in the CSV file
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkDonationResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkDonationRowResult]
+
+class FoodItemPage(BaseModel):
+    items: List[FoodFeedItem]
+    next_cursor: Optional[str] = None # Pass back as ?cursor= to fetch the next page
+
 # --- Claim Schemas ---
 class ClaimBase(BaseModel):
     food_item_id: int
@@ -83,6 +112,21 @@ class Claim(ClaimBase):
     class Config:
         from_attributes = True
 
+class ClaimFeedItem(ClaimBase):
+    id: int
+    ngo_id: int
+    claimed_at: datetime
+    status: FoodStatus
+    food_item: Optional[FoodFeedItem] = None # Only populated when the client expands it
+    ngo: Optional[User] = None
+
+    class Config:
+        from_attributes = True
+
+class ClaimPage(BaseModel):
+    items: List[ClaimFeedItem]
+    next_cursor: Optional[str] = None # Pass back as ?cursor= to fetch the next page
+
 class ClaimUpdate(BaseModel):
     status: FoodStatus # Only status can be updated (delivered/cancelled)
 
@@ -118,8 +162,34 @@ class AIDraftMessageRequest(BaseModel):
 class AIDraftMessageResponse(BaseModel):
     draft_message: str
 
+# Batches: results come back in request order, each with either a result or an error
+AI_BATCH_MAX_ITEMS = 50
+
+class AIShelfLifeBatchRequest(BaseModel):
+    items: List[AIShelfLifeRequest] = Field(..., min_length=1, max_length=AI_BATCH_MAX_ITEMS)
+
+class AIShelfLifeBatchItem(BaseModel):
+    index: int
+    result: Optional[AIShelfLifeResponse] = None
+    error: Optional[str] = None
+
+class AIShelfLifeBatchResponse(BaseModel):
+    results: List[AIShelfLifeBatchItem]
+
+class AIDraftMessageBatchRequest(BaseModel):
+    items: List[AIDraftMessageRequest] = Field(..., min_length=1, max_length=AI_BATCH_MAX_ITEMS)
+
+class AIDraftMessageBatchItem(BaseModel):
+    index: int
+    result: Optional[AIDraftMessageResponse] = None
+    error: Optional[str] = None
+
+class AIDraftMessageBatchResponse(BaseModel):
+    results: List[AIDraftMessageBatchItem]
+
 class AIAnalyticsResponse(BaseModel):
     total_food_redistributed: int
+    total_servings_redistributed: Optional[float] = None # Estimated from the parsed quantities
     top_donor_locations: List[dict]
     top_ngo_locations: List[dict]
     insight: str
\ No newline at end of file
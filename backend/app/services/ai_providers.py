@@ -0,0 +1,190 @@
+# backend/app/services/ai_providers.py
+import asyncio
+import json
+import os
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import List, Optional, Tuple
+
+from .. import schemas
+from .geo_service import IndexedNgo
+
+AI_PROVIDER = os.getenv("AI_PROVIDER", "mock") # mock (offline) or gemini
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+DISTANCE_SCALE_KM = 5.0 # An NGO this far away scores 0.5
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "8")) # Provider calls in flight per batch
+
+# (distance in km, NGO); distance is None for text-matched candidates
+Candidates = List[Tuple[Optional[float], IndexedNgo]]
+
+
+class AIProvider(ABC):
+    """Backend behind ai_service. Inputs arrive already normalized, since ai_service
+    caches on them."""
+
+    name = "base"
+
+    @abstractmethod
+    async def shelf_life(self, description: str) -> schemas.AIShelfLifeResponse:
+        ...
+
+    @abstractmethod
+    async def rank_ngos(self, req: schemas.AIMatchRequest, candidates: Candidates) -> schemas.AIMatchResponse:
+        ...
+
+    @abstractmethod
+    async def draft_message(self, req: schemas.AIDraftMessageRequest) -> schemas.AIDraftMessageResponse:
+        ...
+
+    @abstractmethod
+    async def analytics_insight(self, summary: dict) -> str:
+        ...
+
+    # Batches return one result or Exception per input, in order. By default the items
+    # are fanned out to the single-item methods; a model backend can override these
+    # to send the whole batch as one prompt.
+    async def shelf_life_batch(self, descriptions: List[str]) -> list:
+        return await gather_bounded([partial(self.shelf_life, description) for description in descriptions])
+
+    async def draft_message_batch(self, reqs: List[schemas.AIDraftMessageRequest]) -> list:
+        return await gather_bounded([partial(self.draft_message, req) for req in reqs])
+
+
+async def gather_bounded(calls, limit: int = AI_BATCH_CONCURRENCY) -> list:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(call):
+        async with semaphore:
+            try:
+                return await call()
+            except Exception as exc:
+                return exc
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
+
+class MockProvider(AIProvider):
+    """Offline rules; the default, and what local checks run against."""
+
+    name = "mock"
+
+    async def shelf_life(self, description):
+        if "cooked rice" in description:
+            return schemas.AIShelfLifeResponse(
+                shelf_life_estimation="6-12 hours at room temp, 2-3 days refrigerated.",
+                warnings=["High risk of bacterial growth. Refrigerate immediately.", "Reheat thoroughly."]
+            )
+        elif "bread" in description or "bakery" in description:
+            return schemas.AIShelfLifeResponse(
+                shelf_life_estimation="1-2 days.",
+                warnings=["Best consumed fresh.", "Check for mold."]
+            )
+        else:
+            return schemas.AIShelfLifeResponse(
+                shelf_life_estimation="24-48 hours.",
+                warnings=["General warning: assess visual and olfactory signs before consumption."]
+            )
+
+    async def rank_ngos(self, req, candidates):
+        suggestions = []
+        for distance_km, ngo in candidates:
+            if distance_km is None:
+                score, reason = 1.0, f"High match: NGO is in the same location ({ngo.location})."
+            else:
+                score = round(max(0.1, 1.0 / (1.0 + distance_km / DISTANCE_SCALE_KM)), 3) # Ensure score is not 0
+                reason = f"NGO is {distance_km:.1f} km away ({ngo.location})."
+            suggestions.append(schemas.AINgoSuggestion(
+                ngo_id=ngo.id, name=ngo.name, location=ngo.location, match_score=score, reason=reason
+            ))
+        return schemas.AIMatchResponse(suggestions=suggestions)
+
+    async def draft_message(self, req):
+        msg = f"New food available! {req.quantity} of {req.food_name} at {req.location}. Please pickup around {req.pickup_time.strftime('%I:%M %p, %b %d')}. Can you collect?"
+        return schemas.AIDraftMessageResponse(draft_message=msg)
+
+    async def analytics_insight(self, summary):
+        return "Mock AI Insight: Most food waste occurs in Whitefield. Recommend increasing NGO coverage in this area."
+
+
+class GeminiProvider(MockProvider):
+    """Google Gemini for the text tasks. NGO ranking stays distance-based, since the
+    candidates are already the nearest ones."""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model_name: str = GEMINI_MODEL):
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            raise RuntimeError("AI_PROVIDER=gemini needs the 'google-generativeai' package")
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    async def _generate_json(self, prompt: str):
+        response = await self.model.generate_content_async(
+            prompt, generation_config={"response_mime_type": "application/json"}
+        )
+        return json.loads(response.text)
+
+    async def shelf_life(self, description):
+        data = await self._generate_json(
+            "Estimate the shelf life of this donated food and list food-safety warnings. Reply as JSON "
+            '{"shelf_life_estimation": string, "warnings": [string]}.\n'
+            f"Food: {description}"
+        )
+        return schemas.AIShelfLifeResponse(**data)
+
+    async def draft_message(self, req):
+        data = await self._generate_json(
+            "Write a short, friendly message asking a local NGO to collect a food donation. Reply as JSON "
+            '{"draft_message": string}.\n'
+            f"Food: {req.food_name}\nQuantity: {req.quantity}\nLocation: {req.location}\nPickup: {req.pickup_time.isoformat()}"
+        )
+        return schemas.AIDraftMessageResponse(**data)
+
+    async def shelf_life_batch(self, descriptions):
+        data = await self._generate_json(
+            "For each donated food below, estimate its shelf life and list food-safety warnings. Reply as a JSON "
+            'array with one {"shelf_life_estimation": string, "warnings": [string]} per food, in the same order.\n'
+            + json.dumps(descriptions)
+        )
+        return _batch_results(data, len(descriptions), schemas.AIShelfLifeResponse)
+
+    async def draft_message_batch(self, reqs):
+        items = [
+            {"food": req.food_name, "quantity": req.quantity, "location": req.location, "pickup": req.pickup_time.isoformat()}
+            for req in reqs
+        ]
+        data = await self._generate_json(
+            "For each food donation below, write a short, friendly message asking a local NGO to collect it. "
+            'Reply as a JSON array with one {"draft_message": string} per donation, in the same order.\n'
+            + json.dumps(items)
+        )
+        return _batch_results(data, len(reqs), schemas.AIDraftMessageResponse)
+
+    async def analytics_insight(self, summary):
+        data = await self._generate_json(
+            "Give one actionable insight for a food rescue platform from these statistics. Reply as JSON "
+            '{"insight": string}.\n' + json.dumps(summary)
+        )
+        return data["insight"]
+
+
+def _batch_results(data, expected: int, model) -> list:
+    if not isinstance(data, list) or len(data) != expected:
+        raise ValueError(f"Model returned {len(data) if isinstance(data, list) else 'no'} results for {expected} items")
+    results = []
+    for item in data:
+        try:
+            results.append(model(**item))
+        except (TypeError, ValueError) as exc:
+            results.append(exc)
+    return results
+
+
+def create_provider(name: str = AI_PROVIDER) -> AIProvider:
+    if name == "mock":
+        return MockProvider()
+    if name == "gemini":
+        return GeminiProvider(os.getenv("GEMINI_API_KEY", ""))
+    raise RuntimeError(f"Unsupported AI_PROVIDER: {name}")
@@ -1,97 +1,113 @@
 # backend/app/services/ai_service.py
-from typing import List
-from .. import schemas, models
-from sqlalchemy.orm import Session
-from sqlalchemy import func
 """
-THIS IS A MOCK AI SERVICE.
-Replace the logic in these functions with actual calls to the 
-Google Gemini API (google-generativeai) using your API key.
-
-Example (pseudocode):
-import google.generativeai as genai
-genai.configure(api_key="YOUR_API_KEY")
-model = genai.GenerativeModel('gemini-pro')
+AI features for the routers. The actual answers come from the provider selected by
+AI_PROVIDER (see ai_providers.py): the offline mock by default, or Google Gemini.
+
+Provider calls are slow and, for a hosted model, paid, while donors keep sending
+near-identical requests ("cooked rice", "bread"). Results are therefore cached on
+the normalized request, and concurrent identical requests share one provider call.
 """
+import os
+from typing import List
+from .. import schemas, models
+from ..cache import CoalescingCache, TTLCache
+from ..metrics import ai_provider_latency
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import analytics_service
+from .ai_providers import create_provider
+from .geo_service import geocode, ngo_index
+
+NGO_MATCH_LIMIT = 10
+AI_CACHE_TTL_SECONDS = float(os.getenv("AI_CACHE_TTL_SECONDS", "3600"))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "2048"))
+
+provider = create_provider()
+ai_cache = CoalescingCache(TTLCache(maxsize=AI_CACHE_MAX_ENTRIES, ttl=AI_CACHE_TTL_SECONDS))
+
+
+async def _timed(operation: str, call):
+    # Only calls that reach the provider are timed; cache hits never get here
+    with ai_provider_latency.time((operation,)):
+        return await call
+
+
+def normalize(text: str) -> str:
+    # Case and spacing never change the answer
+    return " ".join(text.lower().split())
+
+
+async def get_shelf_life(description: str) -> schemas.AIShelfLifeResponse:
+    description = normalize(description)
+    return await ai_cache.get_or_compute(("shelf_life", description), lambda: _timed("shelf_life", provider.shelf_life(description)))
+
+
+async def get_shelf_life_batch(descriptions: List[str]) -> list:
+    # One result or Exception per description, in order; repeats and cached items skip the provider
+    keys = [("shelf_life", normalize(description)) for description in descriptions]
+    return await ai_cache.get_or_compute_many(keys, lambda missing: _timed("shelf_life_batch", provider.shelf_life_batch([key[1] for key in missing])))
+
+
+async def get_ngo_match(req: schemas.AIMatchRequest, db: AsyncSession) -> schemas.AIMatchResponse:
+    # Candidates come from the in-memory spatial index and are ranked by real distance;
+    # the provider only sees these nearest NGOs.
+    await db.run_sync(ngo_index.ensure_loaded)
+    req = schemas.AIMatchRequest(location=normalize(req.location), food_type=normalize(req.food_type), quantity=normalize(req.quantity))
+    # Keyed on the index version, so verifying or deactivating an NGO invalidates old matches
+    key = ("ngo_match", ngo_index.version, req.location, req.food_type, req.quantity)
+
+    async def compute():
+        origin = geocode(req.location)
+        if origin:
+            candidates = ngo_index.nearest(origin[0], origin[1], k=NGO_MATCH_LIMIT)
+        else:
+            # Location not in the gazetteer: fall back to a text match on NGO locations
+            candidates = [(None, ngo) for ngo in ngo_index.search_text(req.location, k=NGO_MATCH_LIMIT)]
+        return await _timed("rank_ngos", provider.rank_ngos(req, candidates))
+
+    return await ai_cache.get_or_compute(key, compute)
+
+
+def _draft_request(req: schemas.AIDraftMessageRequest):
+    # The draft quotes the donor's wording back, so only spacing is normalized here
+    req = schemas.AIDraftMessageRequest(
+        food_name=" ".join(req.food_name.split()), quantity=" ".join(req.quantity.split()),
+        location=" ".join(req.location.split()), pickup_time=req.pickup_time,
+    )
+    return ("draft_message", req.food_name, req.quantity, req.location, req.pickup_time.isoformat()), req
+
+
+async def get_draft_message(req: schemas.AIDraftMessageRequest) -> schemas.AIDraftMessageResponse:
+    key, req = _draft_request(req)
+    return await ai_cache.get_or_compute(key, lambda: _timed("draft_message", provider.draft_message(req)))
+
+
+async def get_draft_message_batch(reqs: List[schemas.AIDraftMessageRequest]) -> list:
+    pairs = [_draft_request(req) for req in reqs]
+    requests = dict(pairs)
+    return await ai_cache.get_or_compute_many(
+        [key for key, _ in pairs], lambda missing: _timed("draft_message_batch", provider.draft_message_batch([requests[key] for key in missing]))
+    )
+
+
+async def get_analytics_insight(db: AsyncSession) -> schemas.AIAnalyticsResponse:
+    # Not cached: the underlying counters change with every donation
+    # The rollup readers are sync helpers shared with admin_routes; run_sync drives them on this async connection
+    total_food = await db.run_sync(analytics_service.status_total, models.FoodStatus.delivered)
+    total_servings = await db.run_sync(analytics_service.servings_total, models.FoodStatus.delivered)
+    top_donor_locations = await db.run_sync(analytics_service.top_keys, analytics_service.DONOR_LOCATION)
+    top_ngo_locations = await db.run_sync(analytics_service.top_keys, analytics_service.NGO_LOCATION)
+
+    insight = await _timed("analytics_insight", provider.analytics_insight({
+        "total_food_redistributed": total_food,
+        "total_servings_redistributed": total_servings,
+        "top_donor_locations": top_donor_locations,
+        "top_ngo_locations": top_ngo_locations,
+    }))
 
-async def get_mock_shelf_life(description: str) -> schemas.AIShelfLifeResponse:
-    # MOCK LOGIC: Replace with Gemini call
-    description = description.lower()
-    if "cooked rice" in description:
-        return schemas.AIShelfLifeResponse(
-            shelf_life_estimation="6-12 hours at room temp, 2-3 days refrigerated.",
-            warnings=["High risk of bacterial growth. Refrigerate immediately.", "Reheat thoroughly."]
-        )
-    elif "bread" in description or "bakery" in description:
-        return schemas.AIShelfLifeResponse(
-            shelf_life_estimation="1-2 days.",
-            warnings=["Best consumed fresh.", "Check for mold."]
-        )
-    else:
-        return schemas.AIShelfLifeResponse(
-            shelf_life_estimation="24-48 hours.",
-            warnings=["General warning: assess visual and olfactory signs before consumption."]
-        )
-
-
-async def get_mock_ngo_match(req: schemas.AIMatchRequest, db: Session) -> schemas.AIMatchResponse:
-    # MOCK LOGIC: Replace with Gemini call
-    # This mock just finds all NGOs and gives them a dummy score.
-    # A real implementation would query Gemini with NGO profiles and the food details.
-    
-    ngos = db.query(models.User).filter(models.User.role == models.UserRole.ngo, models.User.is_verified == True).all()
-    
-    suggestions = []
-    for i, ngo in enumerate(ngos):
-        score = 1.0 - (i * 0.1) # Dummy score
-        reason = f"NGO is active. Location: {ngo.location}."
-        if req.location.lower() in ngo.location.lower():
-             score = 1.0
-             reason = f"High match: NGO is in the same location ({ngo.location})."
-             
-        suggestions.append(schemas.AINgoSuggestion(
-            ngo_id=ngo.id,
-            name=ngo.name,
-            location=ngo.location,
-            match_score=max(0.1, score), # Ensure score is not 0
-            reason=reason
-        ))
-        
-    return schemas.AIMatchResponse(suggestions=sorted(suggestions, key=lambda x: x.match_score, reverse=True))
-
-
-async def get_mock_draft_message(req: schemas.AIDraftMessageRequest) -> schemas.AIDraftMessageResponse:
-    # MOCK LOGIC: Replace with Gemini call
-    # A real Gemini call would make this more conversational.
-    
-    msg = f"New food available! {req.quantity} of {req.food_name} at {req.location}. Please pickup around {req.pickup_time.strftime('%I:%M %p, %b %d')}. Can you collect?"
-    
-    return schemas.AIDraftMessageResponse(draft_message=msg)
-
-
-async def get_mock_analytics_insight(db: Session) -> schemas.AIAnalyticsResponse:
-    # MOCK LOGIC: Replace with Gemini call
-    # A real Gemini call would analyze the full dataset.
-    
-    total_food = db.query(models.FoodItem).filter(models.FoodItem.status == models.FoodStatus.delivered).count()
-    top_donor_locs_db = db.query(
-        models.FoodItem.location, func.count(models.FoodItem.id).label('count')
-    ).group_by(models.FoodItem.location).order_by(func.count(models.FoodItem.id).desc()).limit(3).all()
-    
-    top_donor_locations = [{"location": loc, "count": count} for loc, count in top_donor_locs_db]
-
-    insight = "Mock AI Insight: Most food waste occurs in Whitefield. Recommend increasing NGO coverage in this area."
-    
-    # Example of data to send to Gemini:
-    # all_items = db.query(models.FoodItem).all()
-    # data_summary = [{"location": item.location, "status": item.status, "type": item.name} for item in all_items]
-    # prompt = f"Analyze this food donation data and provide an insight: {data_summary}"
-    # response = model.generate_content(prompt)
-    # insight = response.text
-    
     return schemas.AIAnalyticsResponse(
         total_food_redistributed=total_food,
+        total_servings_redistributed=total_servings,
         top_donor_locations=top_donor_locations,
-        top_ngo_locations=[], # Add logic for this
+        top_ngo_locations=top_ngo_locations,
         insight=insight
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,138 @@
+# backend/app/services/analytics_service.py
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .. import models
+
+# --- Rollup Dimensions ---
+DONOR_LOCATION = "donor_location" # FoodItem.location
+NGO_LOCATION = "ngo_location" # Location of the NGO holding the claim
+DAY = "day" # FoodItem.created_at date
+STATUS = "status" # Platform-wide totals, key "all"
+
+
+def add_transition(
+    deltas: Counter,
+    location: str,
+    created_at: Optional[datetime],
+    old_status: Optional[models.FoodStatus],
+    new_status: Optional[models.FoodStatus],
+    ngo_location: Optional[str] = None,
+    n: int = 1,
+):
+    """Accumulate the counter changes for `n` food items moving from old_status to
+    new_status (either may be None for creation/removal). Pass ngo_location when the
+    item's claim moves between the same statuses."""
+    day = (created_at or datetime.utcnow()).date().isoformat()
+    for dimension, key in ((DONOR_LOCATION, location), (DAY, day), (STATUS, "all")):
+        if old_status is not None:
+            deltas[(dimension, key, old_status)] -= n
+        if new_status is not None:
+            deltas[(dimension, key, new_status)] += n
+    if ngo_location is not None:
+        add_claim_transition(deltas, ngo_location, old_status, new_status, n)
+
+
+def add_claim_transition(
+    deltas: Counter,
+    ngo_location: str,
+    old_status: Optional[models.FoodStatus],
+    new_status: Optional[models.FoodStatus],
+    n: int = 1,
+):
+    """Accumulate the NGO_LOCATION changes for `n` claim rows moving from old_status to
+    new_status. Like rebuild_rollups, this counts claims by their own status, pending
+    included: a claim put back to pending stays with its NGO until it is reclaimed."""
+    if old_status is not None:
+        deltas[(NGO_LOCATION, ngo_location, old_status)] -= n
+    if new_status is not None:
+        deltas[(NGO_LOCATION, ngo_location, new_status)] += n
+
+
+def apply_deltas(db: Session, deltas: Counter):
+    # Upserts into the caller's transaction, so rollups commit or roll back with the change itself
+    rows = [
+        {"dimension": dimension, "key": key, "status": status, "count": delta}
+        for (dimension, key, status), delta in deltas.items() if delta
+    ]
+    if not rows:
+        return
+    table = models.AnalyticsCounter.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["dimension", "key", "status"],
+            set_={"count": table.c.count + stmt.excluded.count},
+        ))
+        return
+    for row in rows:
+        updated = db.query(models.AnalyticsCounter).filter(
+            models.AnalyticsCounter.dimension == row["dimension"],
+            models.AnalyticsCounter.key == row["key"],
+            models.AnalyticsCounter.status == row["status"],
+        ).update({models.AnalyticsCounter.count: models.AnalyticsCounter.count + row["count"]}, synchronize_session=False)
+        if not updated:
+            db.add(models.AnalyticsCounter(**row))
+
+
+def record_transition(db: Session, location, created_at, old_status, new_status, ngo_location=None):
+    deltas = Counter()
+    add_transition(deltas, location, created_at, old_status, new_status, ngo_location)
+    apply_deltas(db, deltas)
+
+
+# --- Reads ---
+def status_total(db: Session, status: models.FoodStatus) -> int:
+    total = db.query(models.AnalyticsCounter.count).filter(
+        models.AnalyticsCounter.dimension == STATUS,
+        models.AnalyticsCounter.key == "all",
+        models.AnalyticsCounter.status == status,
+    ).scalar()
+    return total or 0
+
+
+def servings_total(db: Session, status: models.FoodStatus) -> float:
+    # Summed in the database over the (status, estimated_servings) index; not a rollup,
+    # since servings are estimates that a backfill or parser change can revise
+    total = db.query(func.sum(models.FoodItem.estimated_servings)).filter(models.FoodItem.status == status).scalar()
+    return total or 0.0
+
+
+def top_keys(db: Session, dimension: str, limit: int = 3) -> List[dict]:
+    total = func.sum(models.AnalyticsCounter.count)
+    rows = db.query(models.AnalyticsCounter.key, total.label("count")).filter(
+        models.AnalyticsCounter.dimension == dimension
+    ).group_by(models.AnalyticsCounter.key).having(total > 0).order_by(total.desc()).limit(limit).all()
+    return [{"location": key, "count": count} for key, count in rows]
+
+
+# --- Backfill ---
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every counter from food_items and claims. Returns the number of counter rows."""
+    deltas = Counter()
+    food_rows = db.query(
+        models.FoodItem.location, func.date(models.FoodItem.created_at), models.FoodItem.status, func.count(models.FoodItem.id)
+    ).group_by(models.FoodItem.location, func.date(models.FoodItem.created_at), models.FoodItem.status)
+    for location, day, status, n in food_rows:
+        day = str(day) if day else datetime.utcnow().date().isoformat()
+        deltas[(DONOR_LOCATION, location, status)] += n
+        deltas[(DAY, day, status)] += n
+        deltas[(STATUS, "all", status)] += n
+
+    claim_rows = db.query(models.User.location, models.Claim.status, func.count(models.Claim.id)).join(
+        models.User, models.Claim.ngo_id == models.User.id
+    ).group_by(models.User.location, models.Claim.status)
+    for location, status, n in claim_rows:
+        deltas[(NGO_LOCATION, location or "Unknown", status)] += n
+
+    db.query(models.AnalyticsCounter).delete(synchronize_session=False)
+    apply_deltas(db, deltas)
+    db.commit()
+    return sum(1 for delta in deltas.values() if delta)
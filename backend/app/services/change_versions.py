@@ -0,0 +1,117 @@
+# backend/app/services/change_versions.py
+"""
+Change versions behind the ETags of the polled list routes. Every write that can
+change one of those lists bumps the matching scope in its own transaction; a list
+route reads its scopes' versions (one primary-key lookup) before running its query,
+and answers 304 when the client's If-None-Match still matches. Reading the versions
+first means a write racing the request can only make the ETag older than the body,
+which costs the client one extra full fetch, never a stale 304.
+"""
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .. import models
+
+FOOD_FEED = "food_feed" # Pending items, as listed to every NGO
+ETAG_GENERATION = "1" # Bump when a list response's shape changes, so old ETags stop matching
+ENCODING_SUFFIXES = ("-gzip", "-br") # Added by CompressionMiddleware to the ETags of compressed bodies
+
+
+def donor_scope(donor_id: int) -> str:
+    return f"donor:{donor_id}" # The donor's submission history
+
+
+def ngo_scope(ngo_id: int) -> str:
+    return f"ngo:{ngo_id}" # The NGO's claim history
+
+
+def user_scopes(user: models.User) -> list:
+    # Lists embedding this user's own record. Other NGOs' histories also nest a donor,
+    # but are not bumped for account changes: only the nested flags would be stale.
+    if user.role == models.UserRole.donor:
+        return [FOOD_FEED, donor_scope(user.id)]
+    if user.role == models.UserRole.ngo:
+        return [ngo_scope(user.id)]
+    return []
+
+
+# --- Writes ---
+def bump(db: Session, scopes: Iterable[str]):
+    # Joins the caller's transaction, like analytics_service.apply_deltas. Sorted so
+    # concurrent writers lock the rows in the same order.
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    table = models.ChangeVersion.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table).values([{"scope": scope, "version": 1} for scope in scopes])
+        db.execute(stmt.on_conflict_do_update(index_elements=["scope"], set_={"version": table.c.version + 1}))
+        return
+    for scope in scopes:
+        updated = db.query(models.ChangeVersion).filter(models.ChangeVersion.scope == scope).update(
+            {models.ChangeVersion.version: models.ChangeVersion.version + 1}, synchronize_session=False
+        )
+        if not updated:
+            db.add(models.ChangeVersion(scope=scope, version=1))
+
+
+def bump_all(db: Session):
+    # For bulk rewrites (e.g. a backfill) touching rows of many lists at once
+    db.query(models.ChangeVersion).update(
+        {models.ChangeVersion.version: models.ChangeVersion.version + 1}, synchronize_session=False
+    )
+
+
+# --- Reads ---
+def current(db: Session, scopes: Iterable[str]) -> Tuple[int, ...]:
+    scopes = list(scopes)
+    versions = dict(db.query(models.ChangeVersion.scope, models.ChangeVersion.version).filter(
+        models.ChangeVersion.scope.in_(scopes)
+    ).all())
+    return tuple(versions.get(scope, 0) for scope in scopes)
+
+
+def etag_for(request: Request, scopes: Iterable[str], versions: Tuple[int, ...]) -> str:
+    # Strong ETag over the exact URL (so each page, filter and expansion differs) and versions
+    key = f"{ETAG_GENERATION}|{request.url.path}?{request.url.query}|{','.join(scopes)}|{versions}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def matches(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    # If-None-Match uses the weak comparison, and the compressed variants of a body
+    # carry an encoding suffix, so both are stripped before comparing. Returns the
+    # client's tag as sent, for the 304 to echo, or None.
+    if not if_none_match:
+        return None
+    for sent in if_none_match.split(","):
+        sent = sent.strip()
+        if sent == "*":
+            return etag
+        tag = sent[2:] if sent.startswith("W/") else sent
+        for suffix in ENCODING_SUFFIXES:
+            if tag.endswith(suffix + '"'):
+                tag = tag[:-len(suffix) - 1] + '"'
+        if tag == etag:
+            return sent
+    return None
+
+
+async def check(request: Request, response: Response, db: AsyncSession, scopes: Iterable[str]) -> Optional[Response]:
+    """Set ETag/Cache-Control on `response`, and return a 304 response for the route
+    to return as is when the client's copy is current. Call before the list query."""
+    scopes = list(scopes)
+    versions = await db.run_sync(current, scopes)
+    etag = etag_for(request, scopes, versions)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"} # Clients may keep it, but must revalidate
+    matched = matches(request.headers.get("if-none-match"), etag)
+    if matched:
+        return Response(status_code=304, headers={**headers, "ETag": matched}) # The tag of the variant the client holds
+    response.headers.update(headers)
+    return None
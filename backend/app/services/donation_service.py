@@ -0,0 +1,109 @@
+# backend/app/services/donation_service.py
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from . import analytics_service, change_versions
+from .events import BULK_CREATED, event_hub
+from .geo_service import geocode
+from .quantity_service import quantity_columns
+
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500")) # Rows per INSERT/transaction
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "5000"))
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors())
+
+
+def bulk_create_donations(db: Session, donor_id: int, rows: Iterable[Tuple[int, dict]]) -> List[dict]:
+    """Validate and insert (row_number, data) pairs for one donor. `data` may be an
+    Exception from the reader, which is reported as that row's error.
+
+    Rows are inserted with one multi-row INSERT per chunk, each chunk in its own
+    transaction together with its rollup counters. Returns one result per row, in
+    order: {"row", "id"} on success or {"row", "error"}. A single aggregated event is
+    published for everything created.
+    """
+    results = []
+    created_ids = []
+    rows = iter(rows)
+    limited = islice(rows, BULK_MAX_ROWS)
+    while True:
+        chunk = list(islice(limited, BULK_CHUNK_SIZE))
+        if not chunk:
+            break
+
+        now = datetime.utcnow()
+        valid = [] # (row_number, values)
+        chunk_results = {}
+        for row_number, data in chunk:
+            if isinstance(data, Exception):
+                chunk_results[row_number] = {"row": row_number, "error": str(data)}
+                continue
+            try:
+                food = schemas.FoodItemCreate.model_validate(data)
+            except ValidationError as exc:
+                chunk_results[row_number] = {"row": row_number, "error": _validation_message(exc)}
+                continue
+            coords = geocode(food.location) or (None, None)
+            valid.append((row_number, {
+                **food.model_dump(),
+                "latitude": coords[0],
+                "longitude": coords[1],
+                **quantity_columns(food.quantity),
+                "donor_id": donor_id,
+                "status": models.FoodStatus.pending,
+                "created_at": now,
+            }))
+
+        if valid:
+            try:
+                # RETURNING order is not the VALUES order in general, so other databases are
+                # asked to match it up. SQLite assigns one statement's ids in VALUES order
+                # under its write lock, and sorting restores the order there without
+                # sort_by_parameter_order, which would fall back to row-at-a-time INSERTs.
+                on_sqlite = db.get_bind().dialect.name == "sqlite"
+                ids = db.scalars(
+                    insert(models.FoodItem).returning(models.FoodItem.id, sort_by_parameter_order=not on_sqlite),
+                    [values for _, values in valid],
+                ).all()
+                if on_sqlite:
+                    ids = sorted(ids)
+                deltas = Counter()
+                for location, n in Counter(values["location"] for _, values in valid).items():
+                    analytics_service.add_transition(deltas, location, now, None, models.FoodStatus.pending, n=n)
+                analytics_service.apply_deltas(db, deltas)
+                change_versions.bump(db, [change_versions.FOOD_FEED, change_versions.donor_scope(donor_id)])
+                db.commit()
+            except SQLAlchemyError:
+                db.rollback()
+                logger.exception("Bulk donation insert failed for donor %s", donor_id)
+                for row_number, _ in valid:
+                    chunk_results[row_number] = {"row": row_number, "error": "Could not be saved, please retry"}
+            else:
+                for (row_number, _), food_id in zip(valid, ids):
+                    chunk_results[row_number] = {"row": row_number, "id": food_id}
+                created_ids.extend(ids)
+
+        results.extend(chunk_results[row_number] for row_number, _ in chunk)
+
+    extra = next(rows, None)
+    if extra is not None:
+        results.append({"row": extra[0], "error": f"Row limit of {BULK_MAX_ROWS} reached; this and later rows were not processed"})
+
+    if created_ids:
+        event_hub.publish(BULK_CREATED, None, {"donor_id": donor_id, "count": len(created_ids), "food_item_ids": created_ids})
+    return results
@@ -0,0 +1,200 @@
+# backend/app/services/email_outbox.py
+import logging
+import os
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+
+from .. import models
+from ..database import SessionLocal
+from ..metrics import email_send_latency
+from .email_service import email_client
+
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "10")) # Doubled after every failed attempt
+# A crashed worker's messages become eligible again after this. The lease is renewed
+# before each message, so it only has to outlast one delivery (two connects with their
+# SSL/TLS fallback, at 10 s per attempt, plus the send), not a whole batch.
+OUTBOX_LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+SMTP_KEEPALIVE_SECONDS = float(os.getenv("SMTP_KEEPALIVE_SECONDS", "60")) # Idle connections are closed after this
+
+
+def enqueue_email(to_email: str, subject: str, body: str):
+    db = SessionLocal()
+    try:
+        db.add(models.EmailOutbox(to_email=to_email, subject=subject, body=body))
+        db.commit()
+    finally:
+        db.close()
+    outbox_worker.wake()
+
+
+class EmailOutboxWorker:
+    """Background thread that drains the email_outbox table in batches over a single,
+    reused SMTP connection, retrying failed messages with exponential backoff."""
+
+    def __init__(self, client=email_client):
+        self.client = client
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+        self._last_used = 0.0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._close()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                processed = self.drain_once()
+            except Exception:
+                logger.exception("Email outbox drain failed")
+                processed = 0
+            if processed < OUTBOX_BATCH_SIZE:
+                self._wake.wait(OUTBOX_POLL_SECONDS)
+                self._wake.clear()
+            if self._server is not None and time.monotonic() - self._last_used > SMTP_KEEPALIVE_SECONDS:
+                self._close()
+
+    # --- SMTP connection reuse ---
+    def _connection(self):
+        if self.client.mode == "console":
+            return None
+        if self._server is not None and time.monotonic() - self._last_used > SMTP_KEEPALIVE_SECONDS / 2:
+            # Probe connections that sat idle; the server may have dropped them
+            try:
+                self._server.noop()
+            except (smtplib.SMTPException, OSError):
+                self._close()
+        if self._server is None:
+            self._server = self.client.connect()
+        return self._server
+
+    def _close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+    def _deliver(self, message: models.EmailOutbox):
+        reused = self._server is not None
+        try:
+            self.client.deliver(self._connection(), message.to_email, message.subject, message.body)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            if not reused:
+                raise
+            # Stale keep-alive connection: reconnect once and retry
+            self._close()
+            self.client.deliver(self._connection(), message.to_email, message.subject, message.body)
+        self._last_used = time.monotonic()
+
+    # --- Draining ---
+    def drain_once(self) -> int:
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            due = (
+                models.EmailOutbox.status.in_([models.EmailStatus.pending, models.EmailStatus.sending]),
+                models.EmailOutbox.next_attempt_at <= now,
+            )
+            ids = [
+                row.id for row in db.query(models.EmailOutbox.id).filter(*due)
+                .order_by(models.EmailOutbox.id).limit(OUTBOX_BATCH_SIZE)
+            ]
+            if not ids:
+                return 0
+
+            # Lease the batch so that other workers skip it while we send
+            lease_until = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+            db.query(models.EmailOutbox).filter(models.EmailOutbox.id.in_(ids), *due).update(
+                {models.EmailOutbox.status: models.EmailStatus.sending, models.EmailOutbox.next_attempt_at: lease_until},
+                synchronize_session=False,
+            )
+            db.commit()
+            batch = db.query(models.EmailOutbox).filter(
+                models.EmailOutbox.id.in_(ids),
+                models.EmailOutbox.status == models.EmailStatus.sending,
+                models.EmailOutbox.next_attempt_at == lease_until,
+            ).order_by(models.EmailOutbox.id).all()
+
+            for message in batch:
+                if not self._renew_lease(db, message):
+                    continue # Our lease ran out and another worker has taken it over
+                started = time.perf_counter()
+                try:
+                    self._deliver(message)
+                except Exception as exc:
+                    email_send_latency.observe(time.perf_counter() - started, ("failed",))
+                    self._record_failure(message, exc)
+                else:
+                    email_send_latency.observe(time.perf_counter() - started, ("sent",))
+                    message.status = models.EmailStatus.sent
+                    message.sent_at = datetime.utcnow()
+                    message.attempts = (message.attempts or 0) + 1
+                    self.sent += 1
+                # Per message, so a crash mid-batch never re-sends what was already delivered
+                db.commit()
+            return len(batch)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _renew_lease(db, message: models.EmailOutbox) -> bool:
+        # Conditional on the lease still being ours, so at most one worker sends each message
+        lease_until = datetime.utcnow() + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+        renewed = db.query(models.EmailOutbox).filter(
+            models.EmailOutbox.id == message.id,
+            models.EmailOutbox.status == models.EmailStatus.sending,
+            models.EmailOutbox.next_attempt_at == message.next_attempt_at,
+        ).update({models.EmailOutbox.next_attempt_at: lease_until}, synchronize_session=False)
+        db.commit()
+        if renewed:
+            message.next_attempt_at = lease_until
+        return bool(renewed)
+
+    def _record_failure(self, message: models.EmailOutbox, exc: Exception):
+        message.attempts = (message.attempts or 0) + 1
+        message.last_error = str(exc)[:500]
+        if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+            message.status = models.EmailStatus.failed
+            self.failed += 1
+            logger.error("Giving up on email %s to %s after %s attempts: %s", message.id, message.to_email, message.attempts, exc)
+            if not self.client.strict:
+                # Non-strict: fall back to console log so flows continue in dev
+                logger.warning("[SMTP fallback console] To=%s Subject=%s\n%s", message.to_email, message.subject, message.body)
+            return
+        delay = min(OUTBOX_BACKOFF_SECONDS * 2 ** (message.attempts - 1), 3600)
+        message.status = models.EmailStatus.pending
+        message.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        self.retried += 1
+        logger.warning("Email %s to %s failed (attempt %s), retrying in %ss: %s", message.id, message.to_email, message.attempts, delay, exc)
+
+
+outbox_worker = EmailOutboxWorker()
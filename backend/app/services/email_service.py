@@ -27,71 +27,92 @@ class SmtpEmailClient:
         # If true, raise errors when send fails (recommended in prod)
         self.strict = os.getenv("SMTP_STRICT", "false").lower() == "true"
 
-    def send(self, to_email: str, subject: str, body: str):
+    def build_message(self, to_email: str, subject: str, body: str) -> MIMEText:
         msg = MIMEText(body, "plain", "utf-8")
         msg["Subject"] = subject
         msg["From"] = formataddr((self.from_name, self.from_email))
         msg["To"] = to_email
+        return msg
 
-        if self.mode == "console":
-            logger.info("[SMTP console mode] To=%s Subject=%s\n%s", to_email, subject, body)
-            return
+    def _open(self, use_ssl: bool, port: int, starttls: bool):
+        if use_ssl:
+            server = smtplib.SMTP_SSL(self.host, port, timeout=10)
+        else:
+            server = smtplib.SMTP(self.host, port, timeout=10)
+            if starttls:
+                server.starttls()
+        try:
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
 
-        # Default: SMTP mode
+    def connect(self):
+        """Open an authenticated SMTP connection, falling back between SSL(465) and TLS(587)
+        when the configured transport fails. Callers own the connection and must quit() it."""
         try:
             # Primary attempt based on configured flags
-            if self.use_ssl:
-                with smtplib.SMTP_SSL(self.host, self.port, timeout=10) as server:
-                    if self.username:
-                        server.login(self.username, self.password)
-                    server.sendmail(self.from_email, [to_email], msg.as_string())
-                    logger.info(f"Email sent successfully to {to_email} via SSL:{self.host}:{self.port}")
-                    return
-
-            with smtplib.SMTP(self.host, self.port, timeout=10) as server:
-                if self.use_tls:
-                    server.starttls()
-                if self.username:
-                    server.login(self.username, self.password)
-                server.sendmail(self.from_email, [to_email], msg.as_string())
-                logger.info(f"Email sent successfully to {to_email} via TLS:{self.host}:{self.port}" if self.use_tls else f"Email sent successfully to {to_email} via plain SMTP:{self.host}:{self.port}")
-                return
+            return self._open(self.use_ssl, self.port, self.use_tls)
         except smtplib.SMTPAuthenticationError as exc:
             logger.error("SMTP Authentication failed. Check your SMTP_USERNAME and SMTP_PASSWORD. Error: %s", exc)
-            if self.strict:
-                raise
-            logger.warning("[SMTP fallback console] To=%s Subject=%s\n%s", to_email, subject, body)
+            raise
         except (smtplib.SMTPException, OSError, socket.timeout) as exc:
-            logger.error("Failed to send email via SMTP (%s:%s): %s", self.host, self.port, exc)
+            logger.error("Failed to connect to SMTP (%s:%s): %s", self.host, self.port, exc)
             # Attempt automatic fallback between SSL(465) and TLS(587) when using common providers
+            if self.use_ssl:
+                server = self._open(False, 587, True)
+                logger.info("Connected via TLS fallback:%s:587", self.host)
+            else:
+                server = self._open(True, 465, False)
+                logger.info("Connected via SSL fallback:%s:465", self.host)
+            return server
+
+    def deliver(self, server, to_email: str, subject: str, body: str):
+        # Send over an already open connection (console mode just logs)
+        if self.mode == "console":
+            logger.info("[SMTP console mode] To=%s Subject=%s\n%s", to_email, subject, body)
+            return
+        msg = self.build_message(to_email, subject, body)
+        server.sendmail(self.from_email, [to_email], msg.as_string())
+
+    def send(self, to_email: str, subject: str, body: str):
+        if self.mode == "console":
+            self.deliver(None, to_email, subject, body)
+            return
+
+        # Default: SMTP mode, one connection per message
+        try:
+            server = self.connect()
             try:
-                if self.use_ssl:
-                    # Fallback to TLS:587
-                    with smtplib.SMTP(self.host, 587, timeout=10) as server:
-                        server.starttls()
-                        if self.username:
-                            server.login(self.username, self.password)
-                        server.sendmail(self.from_email, [to_email], msg.as_string())
-                        logger.info(f"Email sent successfully to {to_email} via TLS fallback:{self.host}:587")
-                        return
-                else:
-                    # Fallback to SSL:465
-                    with smtplib.SMTP_SSL(self.host, 465, timeout=10) as server:
-                        if self.username:
-                            server.login(self.username, self.password)
-                        server.sendmail(self.from_email, [to_email], msg.as_string())
-                        logger.info(f"Email sent successfully to {to_email} via SSL fallback:{self.host}:465")
-                        return
-            except Exception as fallback_exc:
-                logger.error("Email send fallback also failed: %s", fallback_exc)
-                if self.strict:
-                    raise
-                # Non-strict: fall back to console log so flows continue in dev
-                logger.warning("[SMTP fallback console] To=%s Subject=%s\n%s", to_email, subject, body)
+                self.deliver(server, to_email, subject, body)
+            finally:
+                server.quit()
+            logger.info("Email sent successfully to %s via %s:%s", to_email, self.host, self.port)
+        except Exception as exc:
+            logger.error("Email send failed: %s", exc)
+            if self.strict:
+                raise
+            # Non-strict: fall back to console log so flows continue in dev
+            logger.warning("[SMTP fallback console] To=%s Subject=%s\n%s", to_email, subject, body)
 
 
 email_client = SmtpEmailClient()
 
+# When enabled (default), emails are written to the outbox table and delivered by the
+# background worker in email_outbox.py instead of blocking the request on SMTP.
+EMAIL_OUTBOX_ENABLED = os.getenv("EMAIL_OUTBOX_ENABLED", "true").lower() == "true"
+
+
+def send_email(to_email: str, subject: str, body: str):
+    if EMAIL_OUTBOX_ENABLED:
+        from .email_outbox import enqueue_email
+        enqueue_email(to_email, subject, body)
+    else:
+        email_client.send(to_email, subject, body)
+
+
 def send_otp_email(to_email: str, code: str, expires_minutes: int = 10):
     subject = "Your Food Rescue OTP Code"
     body = (
@@ -99,7 +120,7 @@ def send_otp_email(to_email: str, code: str, expires_minutes: int = 10):
         f"This code will expire in {expires_minutes} minutes.\n"
         f"If you did not request this, you can ignore this email."
     )
-    email_client.send(to_email, subject, body)
+    send_email(to_email, subject, body)
 
 
 def send_password_reset_email(to_email: str, reset_url: str, expires_minutes: int = 60):
@@ -110,4 +131,4 @@ def send_password_reset_email(to_email: str, reset_url: str, expires_minutes: in
         f"{reset_url}\n\n"
         f"If you did not request this, you can ignore this email."
     )
-    email_client.send(to_email, subject, body)
+    send_email(to_email, subject, body)
\ No newline at end of file
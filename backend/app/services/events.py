@@ -0,0 +1,245 @@
+# backend/app/services/events.py
+import asyncio
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Callable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+EVENT_BROKER_URL = os.getenv("EVENT_BROKER_URL", "") # Empty: in-process only; redis://... to share across workers
+EVENT_REPLAY_SIZE = int(os.getenv("EVENT_REPLAY_SIZE", "1000")) # Recent events kept for resume-from-sequence
+SUBSCRIBER_QUEUE_SIZE = 500
+
+# Change types pushed to NGO clients
+CREATED = "created"
+CLAIMED = "claimed"
+DELIVERED = "delivered"
+CANCELLED = "cancelled"
+BULK_CREATED = "bulk_created" # One event for a whole bulk upload; data lists the new ids
+
+
+# --- Brokers ---
+class Broker(ABC):
+    """Assigns sequence numbers to events and delivers them to every subscribed hub.
+
+    A broker shared by all workers (e.g. Redis) makes an event published by one
+    worker reach clients connected to any other.
+    """
+
+    @abstractmethod
+    def publish(self, event: dict) -> dict:
+        ...
+
+    @abstractmethod
+    def subscribe(self, callback: Callable[[dict], None]):
+        ...
+
+    @abstractmethod
+    def replay(self, since: int) -> Optional[List[dict]]:
+        """Events with seq > since, or None if some of them are no longer retained."""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class InProcessBroker(Broker):
+    """Single-process broker; also the stand-in for the shared broker in tests."""
+
+    def __init__(self, replay_size: int = EVENT_REPLAY_SIZE):
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._recent = deque(maxlen=replay_size)
+        self._callbacks: List[Callable[[dict], None]] = []
+
+    def publish(self, event: dict) -> dict:
+        with self._lock:
+            self._seq += 1
+            event = {**event, "seq": self._seq}
+            self._recent.append(event)
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(event)
+        return event
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def replay(self, since: int) -> Optional[List[dict]]:
+        with self._lock:
+            if since > self._seq:
+                return None # Sequence from before a restart
+            events = [event for event in self._recent if event["seq"] > since]
+            oldest = self._recent[0]["seq"] if self._recent else self._seq + 1
+        if since + 1 < oldest:
+            return None
+        return events
+
+
+class RedisBroker(Broker):
+    """Shares events between workers through a Redis stream. Sequence numbers come
+    from an INCR counter so they are global across workers."""
+
+    def __init__(self, url: str, replay_size: int = EVENT_REPLAY_SIZE, stream: str = "food-rescue:events"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("EVENT_BROKER_URL points at Redis but the 'redis' package is not installed")
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._stream = stream
+        self._seq_key = f"{stream}:seq"
+        self._replay_size = replay_size
+        self._callbacks: List[Callable[[dict], None]] = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def publish(self, event: dict) -> dict:
+        event = {**event, "seq": self._redis.incr(self._seq_key)}
+        self._redis.xadd(self._stream, {"event": json.dumps(event)}, maxlen=self._replay_size, approximate=True)
+        return event # Local hubs receive it back through the stream listener
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def replay(self, since: int) -> Optional[List[dict]]:
+        entries = self._redis.xrange(self._stream)
+        events = sorted((json.loads(fields["event"]) for _, fields in entries), key=lambda e: e["seq"])
+        latest = int(self._redis.get(self._seq_key) or 0)
+        if since > latest or (events and since + 1 < events[0]["seq"]) or (not events and since < latest):
+            return None
+        return [event for event in events if event["seq"] > since]
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._listen, name="event-broker", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=6)
+            self._thread = None
+
+    def _listen(self):
+        last_id = "$"
+        while not self._stop.is_set():
+            try:
+                result = self._redis.xread({self._stream: last_id}, block=5000)
+            except Exception:
+                logger.exception("Event broker read failed")
+                self._stop.wait(1)
+                continue
+            for _, entries in result or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    event = json.loads(fields["event"])
+                    for callback in self._callbacks:
+                        callback(event)
+
+
+def create_broker(url: str = EVENT_BROKER_URL) -> Broker:
+    if not url:
+        return InProcessBroker()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBroker(url)
+    raise RuntimeError(f"Unsupported EVENT_BROKER_URL: {url}")
+
+
+# --- Fan-out Hub ---
+class EventHub:
+    """Fans broker events out to the asyncio queues of connected stream clients.
+
+    Publishing is safe from sync routes running on the threadpool; delivery into each
+    subscriber's event loop goes through call_soon_threadsafe.
+    """
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        broker.subscribe(self._dispatch)
+
+    def publish(self, event_type: str, food_item_id: Optional[int], data: Optional[dict] = None) -> dict:
+        event = {
+            "type": event_type,
+            "food_item_id": food_item_id,
+            "data": data or {},
+            "at": datetime.utcnow().isoformat(),
+        }
+        try:
+            return self.broker.publish(event)
+        except Exception:
+            # Clients recover from a missed delta by reloading; never fail the write itself
+            logger.exception("Failed to publish %s event for food item %s", event_type, food_item_id)
+            return event
+
+    def _dispatch(self, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: dict):
+        if queue.full():
+            # Too slow to keep up: tell it to reload rather than buffering without limit
+            queue.get_nowait()
+            event = {"type": "reset", "seq": event["seq"]}
+        queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscription(self, since: Optional[int] = None, heartbeat: Optional[float] = None):
+        """Yields an async iterator of events. With `since`, missed events are replayed
+        first; if they are no longer retained a single "reset" event is sent instead.
+        With `heartbeat`, the iterator yields None after that many idle seconds."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.add(entry)
+        try:
+            backlog = []
+            if since is not None:
+                replayed = await asyncio.to_thread(self.broker.replay, since)
+                backlog = replayed if replayed is not None else [{"type": "reset", "seq": since}]
+            yield _iterate(queue, backlog, heartbeat)
+        finally:
+            with self._lock:
+                self._subscribers.discard(entry)
+
+    def start(self):
+        self.broker.start()
+
+    def stop(self):
+        self.broker.stop()
+
+
+async def _iterate(queue: asyncio.Queue, backlog: List[dict], heartbeat: Optional[float]):
+    last_seq = 0
+    for event in backlog:
+        last_seq = max(last_seq, event["seq"])
+        yield event
+    while True:
+        try:
+            # Times out on the queue itself: cancelling a pending get() loses nothing,
+            # whereas cancelling this generator's __anext__ would close it for good
+            event = await asyncio.wait_for(queue.get(), heartbeat)
+        except asyncio.TimeoutError:
+            yield None
+            continue
+        if event["type"] != "reset" and event["seq"] <= last_seq:
+            continue # Already sent as part of the replay
+        yield event
+
+
+event_hub = EventHub(create_broker())
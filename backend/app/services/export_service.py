@@ -0,0 +1,160 @@
+# backend/app/services/export_service.py
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from .. import models
+from ..database import SessionLocal
+
+EXPORT_BATCH_ROWS = 1000 # Rows fetched per round trip, and rows per written chunk
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r") # Spreadsheets evaluate cells starting with these
+
+
+class ExportSpec:
+    def __init__(self, columns, date_column=None, status_column=None, role_column=None, joins=()):
+        self.columns = columns # [(header, column expression)]
+        self.date_column = date_column
+        self.status_column = status_column
+        self.role_column = role_column
+        self.joins = joins # [(target, onclause)] outer joins
+
+
+_donor = aliased(models.User)
+_ngo = aliased(models.User)
+_food = aliased(models.FoodItem)
+
+EXPORTS = {
+    "food_items": ExportSpec(
+        columns=[
+            ("id", models.FoodItem.id),
+            ("name", models.FoodItem.name),
+            ("description", models.FoodItem.description),
+            ("quantity", models.FoodItem.quantity),
+            ("quantity_amount", models.FoodItem.quantity_amount),
+            ("quantity_unit", models.FoodItem.quantity_unit),
+            ("estimated_servings", models.FoodItem.estimated_servings),
+            ("location", models.FoodItem.location),
+            ("pickup_time", models.FoodItem.pickup_time),
+            ("created_at", models.FoodItem.created_at),
+            ("status", models.FoodItem.status),
+            ("donor_id", models.FoodItem.donor_id),
+            ("donor_name", _donor.name),
+        ],
+        date_column=models.FoodItem.created_at,
+        status_column=models.FoodItem.status,
+        joins=[(_donor, models.FoodItem.donor_id == _donor.id)],
+    ),
+    "claims": ExportSpec(
+        columns=[
+            ("id", models.Claim.id),
+            ("food_item_id", models.Claim.food_item_id),
+            ("food_name", _food.name),
+            ("food_location", _food.location),
+            ("ngo_id", models.Claim.ngo_id),
+            ("ngo_name", _ngo.name),
+            ("claimed_at", models.Claim.claimed_at),
+            ("status", models.Claim.status),
+        ],
+        date_column=models.Claim.claimed_at,
+        status_column=models.Claim.status,
+        joins=[(_food, models.Claim.food_item_id == _food.id), (_ngo, models.Claim.ngo_id == _ngo.id)],
+    ),
+    "users": ExportSpec(
+        columns=[
+            ("id", models.User.id),
+            ("email", models.User.email),
+            ("name", models.User.name),
+            ("role", models.User.role),
+            ("location", models.User.location),
+            ("is_active", models.User.is_active),
+            ("is_verified", models.User.is_verified),
+        ],
+        role_column=models.User.role,
+    ),
+}
+
+
+def build_query(spec: ExportSpec, start: Optional[datetime] = None, end: Optional[datetime] = None, status=None, role=None):
+    stmt = select(*(column for _, column in spec.columns))
+    for target, onclause in spec.joins:
+        stmt = stmt.outerjoin(target, onclause)
+    if start is not None:
+        stmt = stmt.where(spec.date_column >= start)
+    if end is not None:
+        stmt = stmt.where(spec.date_column < end)
+    if status is not None:
+        stmt = stmt.where(spec.status_column == status)
+    if role is not None:
+        stmt = stmt.where(spec.role_column == role)
+    return stmt.order_by(spec.columns[0][1])
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _rows(stmt) -> Iterator[list]:
+    # Own session: the generator outlives the request's dependencies. yield_per with
+    # stream_results uses a server-side cursor where the driver has one, so only one
+    # batch of rows is in memory at a time.
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_ROWS, stream_results=True))
+        for batch in result.partitions():
+            yield [[_plain(value) for value in row] for row in batch]
+    finally:
+        db.close()
+
+
+def _csv_cell(value):
+    # Names, descriptions and locations are typed in by donors and NGOs; a leading
+    # quote keeps "=HYPERLINK(...)" and the like as text when the file is opened
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_chunks(spec: ExportSpec, stmt) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in spec.columns])
+    for batch in _rows(stmt):
+        writer.writerows([_csv_cell(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8") # Header only: nothing matched
+
+
+def _ndjson_chunks(spec: ExportSpec, stmt) -> Iterator[bytes]:
+    headers = [header for header, _ in spec.columns]
+    for batch in _rows(stmt):
+        yield "".join(json.dumps(dict(zip(headers, row))) + "\n" for row in batch).encode("utf-8")
+
+
+def _gzipped(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) # wbits=31 writes a gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(entity: str, fmt: str, gzip: bool = False, **filters) -> Iterator[bytes]:
+    spec = EXPORTS[entity]
+    stmt = build_query(spec, **filters)
+    chunks = _csv_chunks(spec, stmt) if fmt == "csv" else _ndjson_chunks(spec, stmt)
+    return _gzipped(chunks) if gzip else chunks
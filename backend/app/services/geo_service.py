@@ -0,0 +1,224 @@
+# backend/app/services/geo_service.py
+import csv
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from .. import models
+
+GAZETTEER_PATH = os.getenv(
+    "GAZETTEER_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "gazetteer.csv")
+)
+GRID_CELL_DEGREES = 0.01 # ~1.1 km cells
+MATCH_RADIUS_KM = float(os.getenv("NGO_MATCH_RADIUS_KM", "50")) # NGOs farther than this are never suggested
+INDEX_REFRESH_SECONDS = float(os.getenv("NGO_INDEX_REFRESH_SECONDS", "300")) # Picks up changes made by other workers
+EARTH_RADIUS_KM = 6371.0
+
+
+# --- Geocoding ---
+@lru_cache(maxsize=1)
+def load_gazetteer() -> Dict[str, Tuple[float, float]]:
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+        return {row["name"]: (float(row["latitude"]), float(row["longitude"])) for row in csv.DictReader(f)}
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9 ]+", " ", text.lower()).strip()
+
+
+@lru_cache(maxsize=4096)
+def geocode(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    """Resolve a free-text location like "Whitefield, Bangalore" to (lat, lon) using
+    the offline gazetteer. The most specific (leftmost) recognised part wins."""
+    if not location:
+        return None
+    gazetteer = load_gazetteer()
+    parts = [" ".join(_normalize(part).split()) for part in location.split(",")]
+    for part in parts:
+        if part in gazetteer:
+            return gazetteer[part]
+    # Fall back to any gazetteer name appearing inside the text, longest names first
+    text = " " + " ".join(_normalize(location).split()) + " "
+    for name in sorted(gazetteer, key=len, reverse=True):
+        if f" {name} " in text:
+            return gazetteer[name]
+    return None
+
+
+def geocode_into(obj, location: Optional[str]):
+    # Sets latitude/longitude on a User or FoodItem; unknown places leave them empty
+    coords = geocode(location)
+    obj.latitude, obj.longitude = coords if coords else (None, None)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+# --- Spatial Index ---
+class IndexedNgo:
+    __slots__ = ("id", "name", "location", "latitude", "longitude")
+
+    def __init__(self, id: int, name: str, location: Optional[str], latitude: Optional[float], longitude: Optional[float]):
+        self.id = id
+        self.name = name
+        self.location = location
+        self.latitude = latitude
+        self.longitude = longitude
+
+
+class NgoSpatialIndex:
+    """In-memory grid of verified, active NGOs bucketed by lat/lon cell.
+
+    Nearest-neighbour queries scan outward ring by ring from the query's cell and stop
+    as soon as no unscanned cell can hold anything closer than the k-th best hit, so
+    the cost depends on local density rather than on the total number of NGOs.
+    """
+
+    def __init__(self, cell_degrees: float = GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._lock = threading.RLock()
+        self._entries: Dict[int, IndexedNgo] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._bounds: Optional[List[int]] = None # [min_x, min_y, max_x, max_y] of occupied cells
+        self._loaded_at: Optional[float] = None
+        self.version = 0 # Bumped on every change so callers can key caches on it
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    # --- Maintenance ---
+    def ensure_loaded(self, db: Session):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < INDEX_REFRESH_SECONDS:
+            return
+        self.rebuild(db)
+
+    def rebuild(self, db: Session):
+        rows = db.query(
+            models.User.id, models.User.name, models.User.location, models.User.latitude, models.User.longitude
+        ).filter(
+            models.User.role == models.UserRole.ngo,
+            models.User.is_verified == True,
+            models.User.is_active == True,
+        ).all()
+        self.load(rows)
+
+    def load(self, rows):
+        with self._lock:
+            self._entries.clear()
+            self._cells.clear()
+            self._bounds = None
+            for row in rows:
+                self._add(row.id, row.name, row.location, row.latitude, row.longitude)
+            self._loaded_at = time.monotonic()
+            self.version += 1
+
+    def upsert(self, ngo: models.User):
+        with self._lock:
+            self._remove(ngo.id)
+            if ngo.role == models.UserRole.ngo and ngo.is_verified and ngo.is_active:
+                self._add(ngo.id, ngo.name, ngo.location, ngo.latitude, ngo.longitude)
+            self.version += 1
+
+    def _add(self, id, name, location, latitude, longitude):
+        if latitude is None or longitude is None:
+            # Rows stored before geocoding existed; resolve them on the fly
+            coords = geocode(location)
+            if coords:
+                latitude, longitude = coords
+        entry = IndexedNgo(id, name, location, latitude, longitude)
+        self._entries[id] = entry
+        if latitude is None:
+            return
+        cx, cy = self._cell(latitude, longitude)
+        self._cells.setdefault((cx, cy), set()).add(id)
+        if self._bounds is None:
+            self._bounds = [cx, cy, cx, cy]
+        else:
+            b = self._bounds
+            b[0], b[1], b[2], b[3] = min(b[0], cx), min(b[1], cy), max(b[2], cx), max(b[3], cy)
+
+    def _remove(self, id: int):
+        entry = self._entries.pop(id, None)
+        if entry is None or entry.latitude is None:
+            return
+        cell = self._cell(entry.latitude, entry.longitude)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(id)
+            if not bucket:
+                del self._cells[cell]
+
+    # --- Queries ---
+    def nearest(self, lat: float, lon: float, k: int, radius_km: float = MATCH_RADIUS_KM) -> List[Tuple[float, IndexedNgo]]:
+        with self._lock:
+            if self._bounds is None or k <= 0:
+                return []
+            cx, cy = self._cell(lat, lon)
+            # Smallest cell side around the query; anything outside ring r is at least r sides away
+            cell_km = math.radians(self.cell_degrees) * EARTH_RADIUS_KM * min(1.0, max(math.cos(math.radians(abs(lat) + self.cell_degrees)), 0.01))
+            min_x, min_y, max_x, max_y = self._bounds
+            # Rings closer than the occupied bounding box are empty, so start at its edge
+            start_ring = max(0, min_x - cx, cx - max_x, min_y - cy, cy - max_y)
+            max_ring = min(
+                max(abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y)),
+                int(math.ceil(radius_km / cell_km)),
+            )
+
+            best: List[Tuple[float, int]] = [] # max-heap of (-distance, id)
+
+            def visit(ids):
+                for ngo_id in ids:
+                    entry = self._entries[ngo_id]
+                    d = haversine_km(lat, lon, entry.latitude, entry.longitude)
+                    if d > radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, ngo_id))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, ngo_id))
+
+            for ring in range(start_ring, max_ring + 1):
+                if ring > 0 and 8 * ring > len(self._cells):
+                    # Outer rings are mostly empty; visit the remaining occupied cells directly
+                    for (x, y), ids in self._cells.items():
+                        if ring <= max(abs(x - cx), abs(y - cy)) <= max_ring:
+                            visit(ids)
+                    break
+                for cell in self._ring_cells(cx, cy, ring):
+                    visit(self._cells.get(cell, ()))
+                if len(best) == k and -best[0][0] <= ring * cell_km:
+                    break
+            return [(-neg_d, self._entries[ngo_id]) for neg_d, ngo_id in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
+
+    def search_text(self, text: str, k: int) -> List[IndexedNgo]:
+        # Fallback for request locations the gazetteer does not know
+        needle = text.lower()
+        with self._lock:
+            hits = [e for e in self._entries.values() if e.location and needle in e.location.lower()]
+        return hits[:k]
+
+
+ngo_index = NgoSpatialIndex()
@@ -0,0 +1,128 @@
+# backend/app/services/maintenance.py
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+
+from .. import models
+from ..database import SessionLocal
+from . import analytics_service, change_versions
+from .events import CANCELLED, event_hub
+
+
+logger = logging.getLogger(__name__)
+
+SWEEP_ENABLED = os.getenv("SWEEP_ENABLED", "true").lower() == "true"
+SWEEP_INTERVAL_SECONDS = float(os.getenv("SWEEP_INTERVAL_SECONDS", "300"))
+SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE", "500")) # Rows per transaction, so locks stay short
+PICKUP_GRACE_MINUTES = int(os.getenv("PICKUP_GRACE_MINUTES", "60")) # Pending items this far past pickup are cancelled
+TOKEN_RETENTION_HOURS = int(os.getenv("TOKEN_RETENTION_HOURS", "24")) # Expired OTP/reset rows kept this long
+
+
+class MaintenanceSweeper:
+    """Periodically cancels donations whose pickup time has passed and deletes expired
+    OTP and password reset rows, so the tables the hot routes scan stay small."""
+
+    def __init__(self, batch_size: int = SWEEP_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.runs = 0
+        self.totals = Counter()
+        self.last_run: Optional[dict] = None
+
+    async def run_forever(self, interval: float = SWEEP_INTERVAL_SECONDS):
+        # Started as a task from the app lifespan; the blocking work runs in a thread
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("Maintenance sweep failed")
+            await asyncio.sleep(interval)
+
+    # --- Sweep ---
+    def run_once(self, now: Optional[datetime] = None) -> dict:
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        token_cutoff = now - timedelta(hours=TOKEN_RETENTION_HOURS)
+        stats = {
+            "expired_donations": self.expire_overdue_donations(now - timedelta(minutes=PICKUP_GRACE_MINUTES)),
+            "deleted_otp_codes": self._delete_in_chunks(models.OtpCode, models.OtpCode.expires_at < token_cutoff),
+            "deleted_reset_tokens": self._delete_in_chunks(
+                models.PasswordResetToken, models.PasswordResetToken.expires_at < token_cutoff
+            ),
+        }
+        self.runs += 1
+        self.totals.update(stats)
+        self.last_run = {
+            **stats,
+            "started_at": now.isoformat(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        logger.info("Maintenance sweep: %s", self.last_run)
+        return self.last_run
+
+    def expire_overdue_donations(self, cutoff: datetime) -> int:
+        expired = 0
+        while True:
+            db = SessionLocal()
+            try:
+                ids = db.scalars(
+                    select(models.FoodItem.id).where(
+                        models.FoodItem.status == models.FoodStatus.pending,
+                        models.FoodItem.pickup_time < cutoff,
+                    ).order_by(models.FoodItem.pickup_time, models.FoodItem.id).limit(self.batch_size)
+                ).all()
+                if not ids:
+                    return expired
+                # Re-check the status in the UPDATE so an item claimed meanwhile is left alone
+                rows = db.execute(
+                    update(models.FoodItem)
+                    .where(models.FoodItem.id.in_(ids), models.FoodItem.status == models.FoodStatus.pending)
+                    .values(status=models.FoodStatus.cancelled)
+                    .returning(models.FoodItem.id, models.FoodItem.location, models.FoodItem.created_at, models.FoodItem.donor_id)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                deltas = Counter()
+                for row in rows:
+                    analytics_service.add_transition(
+                        deltas, row.location, row.created_at, models.FoodStatus.pending, models.FoodStatus.cancelled
+                    )
+                analytics_service.apply_deltas(db, deltas)
+                if rows:
+                    # An NGO that put an item back to pending still holds its claim row, so its history changes too
+                    ngo_ids = db.scalars(
+                        select(models.Claim.ngo_id).where(models.Claim.food_item_id.in_([row.id for row in rows])).distinct()
+                    ).all()
+                    change_versions.bump(db, [change_versions.FOOD_FEED]
+                                         + [change_versions.donor_scope(row.donor_id) for row in rows]
+                                         + [change_versions.ngo_scope(ngo_id) for ngo_id in ngo_ids])
+                db.commit()
+            finally:
+                db.close()
+            for row in rows:
+                event_hub.publish(CANCELLED, row.id, {"status": models.FoodStatus.cancelled.value, "reason": "pickup_time_passed"})
+            expired += len(rows)
+            if len(ids) < self.batch_size:
+                return expired
+
+    def _delete_in_chunks(self, model, condition) -> int:
+        deleted = 0
+        while True:
+            db = SessionLocal()
+            try:
+                ids = db.scalars(select(model.id).where(condition).limit(self.batch_size)).all()
+                if ids:
+                    db.execute(delete(model).where(model.id.in_(ids)))
+                    db.commit()
+            finally:
+                db.close()
+            deleted += len(ids)
+            if len(ids) < self.batch_size:
+                return deleted
+
+
+sweeper = MaintenanceSweeper()
@@ -0,0 +1,77 @@
+# backend/app/services/password_service.py
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+
+logger = logging.getLogger(__name__)
+
+
+class HashingOverloaded(Exception):
+    """Raised when the hashing queue is full and the caller should back off."""
+
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a dedicated, bounded thread pool so
+    that CPU-heavy password work never runs on the event loop.
+
+    At most `max_workers` hashes run at once; up to `max_queue` more may wait for a
+    worker, and anything beyond that is rejected with HashingOverloaded.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int = 4, max_queue: int = 64):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        # Counters are only touched from the event loop thread, so they need no lock
+        self._pending = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        return min(self._pending, self.max_workers)
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._pending - self.max_workers)
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            logger.warning("Password hashing queue full (%s waiting); rejecting request", self.queued)
+            raise HashingOverloaded()
+        self._pending += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            return await asyncio.wrap_future(self._executor.submit(fn, *args))
+        finally:
+            self._pending -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        # Returns (valid, new_hash); new_hash is set when the stored hash uses an
+        # outdated scheme or cost factor and should be replaced.
+        return await self._run(self.context.verify_and_update, password, hashed)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,128 @@
+# backend/app/services/quantity_service.py
+import logging
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .. import models
+from . import change_versions
+
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Spelling -> (canonical unit, factor into that unit). Anything else is counted as "item".
+UNITS = {
+    "kg": ("kg", 1.0), "kgs": ("kg", 1.0), "kilo": ("kg", 1.0), "kilos": ("kg", 1.0),
+    "kilogram": ("kg", 1.0), "kilograms": ("kg", 1.0),
+    "g": ("kg", 0.001), "gm": ("kg", 0.001), "gms": ("kg", 0.001), "gram": ("kg", 0.001), "grams": ("kg", 0.001),
+    "lb": ("kg", 0.4536), "lbs": ("kg", 0.4536), "pound": ("kg", 0.4536), "pounds": ("kg", 0.4536),
+    "l": ("l", 1.0), "ltr": ("l", 1.0), "ltrs": ("l", 1.0), "litre": ("l", 1.0), "litres": ("l", 1.0),
+    "liter": ("l", 1.0), "liters": ("l", 1.0),
+    "ml": ("l", 0.001),
+    "meal": ("serving", 1.0), "meals": ("serving", 1.0), "serving": ("serving", 1.0), "servings": ("serving", 1.0),
+    "plate": ("serving", 1.0), "plates": ("serving", 1.0), "portion": ("serving", 1.0), "portions": ("serving", 1.0),
+    "people": ("serving", 1.0), "persons": ("serving", 1.0),
+    "packet": ("packet", 1.0), "packets": ("packet", 1.0), "pack": ("packet", 1.0), "packs": ("packet", 1.0),
+    "box": ("box", 1.0), "boxes": ("box", 1.0),
+}
+# Rough servings per canonical unit: ~400 g of food or ~250 ml of liquid per meal, one
+# meal per packet (a typical food packet) and four per box. "item" has no estimate.
+SERVINGS_PER_UNIT = {"kg": 2.5, "l": 4.0, "serving": 1.0, "packet": 1.0, "box": 4.0}
+
+# A mixed number ("1 1/2"), fraction ("1/2"), decimal (".5", "2.5") or integer
+_NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d*\.\d+|\d+"
+_NUMBER_UNIT = re.compile(rf"({_NUMBER})\s*(?:(?:-|to)\s*(?:{_NUMBER})\s*)?(dozen\s+)?([a-z]+)?")
+_VULGAR_FRACTIONS = {"\u00bd": " 1/2", "\u00bc": " 1/4", "\u00be": " 3/4"}
+
+
+def _to_number(text: str) -> Optional[float]:
+    total = 0.0
+    for part in text.split():
+        numerator, slash, denominator = part.partition("/")
+        if slash and float(denominator) == 0:
+            return None # "1/0": no sensible reading
+        total += float(numerator) / float(denominator) if slash else float(part)
+    return total
+
+
+class ParsedQuantity(NamedTuple):
+    amount: float
+    unit: str
+    servings: Optional[float]
+
+
+@lru_cache(maxsize=4096)
+def parse_quantity(text: Optional[str]) -> Optional[ParsedQuantity]:
+    """Parse free text like "20 packets", "10kg", "1/2 kg" or "5-6 litres" into an
+    amount in a canonical unit (kg, l, serving, packet, box or item) plus estimated
+    servings. A range counts as its lower bound. Returns None if there is no usable
+    number at all."""
+    if not text:
+        return None
+    text = text.lower().replace(",", "")
+    for fraction, spelled in _VULGAR_FRACTIONS.items():
+        text = text.replace(fraction, spelled)
+    match = _NUMBER_UNIT.search(text)
+    if match is None:
+        return None
+    amount = _to_number(match.group(1))
+    if amount is None:
+        return None
+    if match.group(2):
+        amount *= 12
+    unit, factor = UNITS.get(match.group(3) or "", ("item", 1.0))
+    amount = round(amount * factor, 3)
+    servings = SERVINGS_PER_UNIT.get(unit)
+    return ParsedQuantity(amount, unit, round(amount * servings, 1) if servings is not None else None)
+
+
+def quantity_columns(text: Optional[str]) -> dict:
+    # Column values for a FoodItem; unparseable text leaves them empty
+    parsed = parse_quantity(text)
+    if parsed is None:
+        return {"quantity_amount": None, "quantity_unit": None, "estimated_servings": None}
+    return {"quantity_amount": parsed.amount, "quantity_unit": parsed.unit, "estimated_servings": parsed.servings}
+
+
+def parse_into(food_item: models.FoodItem, text: Optional[str]):
+    for column, value in quantity_columns(text).items():
+        setattr(food_item, column, value)
+
+
+# --- Backfill ---
+def backfill_quantities(db: Session, batch_size: int = BACKFILL_BATCH_SIZE, reparse: bool = False) -> int:
+    """Fill the parsed columns for rows written before they existed. Walks the table
+    by id in batches, one transaction per batch, and returns the number of rows
+    updated. Rows whose text has no number stay empty. With `reparse`, every row is
+    parsed again and rewritten if the result changed (after a parser fix)."""
+    columns = (models.FoodItem.quantity_amount, models.FoodItem.quantity_unit, models.FoodItem.estimated_servings)
+    updated = 0
+    last_id = 0
+    while True:
+        query = db.query(models.FoodItem.id, models.FoodItem.quantity, *columns).filter(models.FoodItem.id > last_id)
+        if not reparse:
+            query = query.filter(models.FoodItem.quantity_unit.is_(None))
+        rows = query.order_by(models.FoodItem.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        params = []
+        for food_id, text, *current in rows:
+            parsed = quantity_columns(text)
+            if list(parsed.values()) != current: # Unchanged and still-unparseable rows are skipped
+                params.append({"id": food_id, **parsed})
+        if params:
+            db.execute(update(models.FoodItem), params) # Bulk UPDATE by primary key, executemany
+            updated += len(params)
+        db.commit()
+        logger.info("Backfilled quantities up to food item %s (%s rows so far)", last_id, updated)
+    if updated:
+        # The parsed columns are part of every list response; make clients refetch once
+        change_versions.bump_all(db)
+        db.commit()
+    return updated
@@ -0,0 +1,213 @@
+# backend/app/services/token_store.py
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_STORE_URL = os.getenv("TOKEN_STORE_URL", "") # Empty: per-process memory; redis://... when running several workers
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1")) # Worker count; uvicorn and gunicorn read the same variable
+OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", "5")) # Wrong codes allowed per email before a new OTP is needed
+ATTEMPT_WINDOW_SECONDS = 600 # Attempt counters expire with the OTP they guard
+PURGE_INTERVAL_SECONDS = 60
+
+
+class TooManyAttempts(Exception):
+    pass
+
+
+# --- Backends ---
+class TokenStore(ABC):
+    """Small key/value interface with per-key TTLs. Every operation is a single
+    O(1) lookup, so verification never touches the database."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float):
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def pop(self, key: str) -> Optional[str]:
+        """Atomically read and delete; only one of several concurrent callers gets the value."""
+
+    @abstractmethod
+    def delete(self, *keys: str):
+        ...
+
+    @abstractmethod
+    def incr(self, key: str, ttl: float) -> int:
+        """Increment a counter; the TTL starts with the first increment."""
+
+
+class MemoryTokenStore(TokenStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {} # key -> (value, expires_at)
+        self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+
+    def _live(self, key: str, now: float):
+        item = self._data.get(key)
+        if item is not None and item[1] <= now:
+            del self._data[key]
+            return None
+        return item
+
+    def _purge(self, now: float):
+        # Entries nobody reads again would otherwise stay forever
+        if now >= self._next_purge:
+            self._data = {key: item for key, item in self._data.items() if item[1] > now}
+            self._next_purge = now + PURGE_INTERVAL_SECONDS
+
+    def set(self, key, value, ttl):
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            self._data[key] = (value, now + ttl)
+
+    def get(self, key):
+        with self._lock:
+            item = self._live(key, time.monotonic())
+        return item[0] if item else None
+
+    def pop(self, key):
+        with self._lock:
+            item = self._live(key, time.monotonic())
+            if item is not None:
+                del self._data[key]
+        return item[0] if item else None
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr(self, key, ttl):
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            item = self._live(key, now)
+            count, expires_at = (int(item[0]) + 1, item[1]) if item else (1, now + ttl)
+            self._data[key] = (str(count), expires_at)
+        return count
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisTokenStore(TokenStore):
+    """Shares tokens between workers. Works with any client exposing the redis-py API
+    (e.g. a fakeredis instance in local checks)."""
+
+    def __init__(self, client, prefix: str = "food-rescue:tokens:"):
+        self._redis = client
+        self._prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("TOKEN_STORE_URL points at Redis but the 'redis' package is not installed")
+        return cls(redis.Redis.from_url(url, decode_responses=True))
+
+    def set(self, key, value, ttl):
+        self._redis.set(self._prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    def get(self, key):
+        return self._redis.get(self._prefix + key)
+
+    def pop(self, key):
+        return self._redis.getdel(self._prefix + key)
+
+    def delete(self, *keys):
+        if keys:
+            self._redis.delete(*(self._prefix + key for key in keys))
+
+    def incr(self, key, ttl):
+        pipe = self._redis.pipeline()
+        pipe.incr(self._prefix + key)
+        pipe.pexpire(self._prefix + key, max(1, int(ttl * 1000)), nx=True)
+        return int(pipe.execute()[0])
+
+
+def create_token_store(url: str = TOKEN_STORE_URL, workers: int = WEB_CONCURRENCY) -> TokenStore:
+    if not url:
+        # Each worker would hold its own tokens, so a code issued by one fails on the others
+        if workers > 1:
+            raise RuntimeError(
+                f"WEB_CONCURRENCY={workers} needs a shared token store: set TOKEN_STORE_URL=redis://..."
+            )
+        if os.getenv("ENV", "development").lower() == "production":
+            logger.warning("TOKEN_STORE_URL is not set: OTPs and password reset links are kept in memory and lost on every restart")
+        return MemoryTokenStore()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisTokenStore.from_url(url)
+    raise RuntimeError(f"Unsupported TOKEN_STORE_URL: {url}")
+
+
+token_store = create_token_store()
+
+
+# --- OTP Codes ---
+def issue_otp(email: str, code: str, ttl_seconds: float, store: TokenStore = None):
+    # A new code replaces the previous one and resets the attempt counter
+    store = store if store is not None else token_store
+    store.set(f"otp:{email}", code, ttl_seconds)
+    store.delete(f"otp-attempts:{email}")
+
+
+def consume_otp(email: str, code: str, store: TokenStore = None) -> bool:
+    """True if `code` is the current OTP for `email`; the code can be used once.
+    Raises TooManyAttempts once OTP_MAX_ATTEMPTS wrong codes have been tried."""
+    store = store if store is not None else token_store
+    expected = store.get(f"otp:{email}")
+    if expected is None:
+        return False
+    attempts = store.incr(f"otp-attempts:{email}", ATTEMPT_WINDOW_SECONDS)
+    if attempts > OTP_MAX_ATTEMPTS:
+        store.delete(f"otp:{email}") # Force the user to request a fresh code
+        raise TooManyAttempts()
+    if not hmac.compare_digest(expected.encode(), code.encode()):
+        return False
+    if store.pop(f"otp:{email}") != expected:
+        return False # Consumed by a concurrent request
+    store.delete(f"otp-attempts:{email}")
+    return True
+
+
+# --- Password Reset Tokens ---
+def _digest(token: str) -> str:
+    # Only a hash of the token is stored, and lookups by hash reveal nothing through timing
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_reset_token(email: str, token: str, ttl_seconds: float, store: TokenStore = None):
+    store = store if store is not None else token_store
+    previous = store.pop(f"reset-email:{email}")
+    if previous:
+        store.delete(f"reset:{previous}") # Only the newest link works
+    digest = _digest(token)
+    store.set(f"reset:{digest}", email, ttl_seconds)
+    store.set(f"reset-email:{email}", digest, ttl_seconds)
+
+
+def reset_token_email(token: str, store: TokenStore = None) -> Optional[str]:
+    return (store if store is not None else token_store).get(f"reset:{_digest(token)}")
+
+
+def consume_reset_token(token: str, store: TokenStore = None) -> Optional[str]:
+    """Email the token was issued for, or None if it is unknown, expired or already used."""
+    store = store if store is not None else token_store
+    email = store.pop(f"reset:{_digest(token)}")
+    if email is not None:
+        store.delete(f"reset-email:{email}")
+    return email
@@ -0,0 +1,237 @@
+# backend/benchmarks/run.py
+"""Drive the /api/v1 routes at a fixed concurrency and report throughput and latency
+percentiles. Run from the backend directory against a database filled by
+`python -m benchmarks.seed`:
+
+    python -m benchmarks.run                                 # in-process, through the ASGI app
+    python -m benchmarks.run --base-url http://localhost:8000 # over HTTP, against a running server
+    python -m benchmarks.run --output after.json --compare before.json
+
+In-process runs start the app's lifespan in this process with rate limiting and the
+sweeper off, so they measure the application rather than the network. Against a
+server, start it with RATE_LIMIT_ENABLED=false or the AI and auth routes will mostly
+report 429s.
+"""
+import argparse
+import asyncio
+import fnmatch
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import httpx
+
+
+class Scenario:
+    def __init__(self, name: str, role: str, method: str, path: str, body=None):
+        self.name = name
+        self.role = role # Whose token is sent: "donor", "ngo" or "admin"
+        self.method = method
+        self.path = path
+        self.body = body # JSON body, or a callable(i) for per-request bodies
+
+
+def _donation(i: int) -> dict:
+    return {"name": f"Benchmark item {i}", "quantity": "10 meals", "location": "Whitefield, Bangalore",
+            "pickup_time": "2030-01-01T10:00:00"}
+
+
+SCENARIOS = [
+    Scenario("ngo.available_page", "ngo", "GET", "/ngo/food/available/page?limit=50"),
+    Scenario("ngo.available_page_donors", "ngo", "GET", "/ngo/food/available/page?limit=50&include_donor=true"),
+    Scenario("ngo.available_all", "ngo", "GET", "/ngo/food/available"),
+    Scenario("ngo.history", "ngo", "GET", "/ngo/food/history"),
+    Scenario("ngo.history_page", "ngo", "GET", "/ngo/food/history/page?limit=50"),
+    Scenario("ngo.history_page_expanded", "ngo", "GET", "/ngo/food/history/page?limit=50&expand=food_item,food_item.donor,ngo"),
+    Scenario("donor.history", "donor", "GET", "/donor/food/history"),
+    Scenario("donor.submit", "donor", "POST", "/donor/food", _donation),
+    Scenario("admin.users", "admin", "GET", "/admin/users"),
+    Scenario("admin.user_search", "admin", "GET", "/admin/users?q=ngo1"),
+    Scenario("admin.analytics", "admin", "GET", "/admin/analytics"),
+    Scenario("ai.shelf_life", "donor", "POST", "/ai/shelf-life", {"description": "Cooked rice and dal"}),
+    Scenario("ai.match_ngo", "donor", "POST", "/ai/match-ngo",
+             {"location": "Whitefield, Bangalore", "food_type": "cooked", "quantity": "20 meals"}),
+    Scenario("ai.draft_message", "donor", "POST", "/ai/draft-message",
+             {"food_name": "Bread", "quantity": "30 packets", "location": "Koramangala", "pickup_time": "2030-01-01T10:00:00"}),
+    Scenario("ai.analytics_insight", "admin", "GET", "/ai/analytics-insight"),
+]
+
+
+def percentile(sorted_values, p: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/api/v1/auth/token", data={"username": email, "password": password})
+    if response.status_code != 200:
+        raise SystemExit(f"Login as {email} failed ({response.status_code}): {response.text}")
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_scenario(client, scenario: Scenario, headers: dict, requests: int, concurrency: int, warmup: int) -> dict:
+    async def call(i):
+        body = scenario.body(i) if callable(scenario.body) else scenario.body
+        return await client.request(scenario.method, "/api/v1" + scenario.path, json=body, headers=headers)
+
+    for i in range(warmup):
+        await call(i)
+
+    latencies, statuses = [], Counter()
+    pending = iter(range(requests)) # Shared by the workers, so each request is sent once
+
+    async def worker():
+        for i in pending:
+            started = time.perf_counter()
+            try:
+                response = await call(i)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda seconds: round(seconds * 1000, 2)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(n for status, n in statuses.items() if not status.startswith("2")),
+        "statuses": dict(statuses),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+    }
+
+
+@asynccontextmanager
+async def open_client(base_url, concurrency: int):
+    if base_url:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            yield client
+        return
+    # Settings are read at import time, so they have to be in place before the app loads
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("SWEEP_ENABLED", "false")
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            yield client
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> dict:
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if any(fnmatch.fnmatch(scenario.name, pattern) for pattern in args.only)
+        and not any(fnmatch.fnmatch(scenario.name, pattern) for pattern in args.skip)
+    ]
+    if not scenarios:
+        raise SystemExit("No scenarios selected")
+    results = {}
+    async with open_client(args.base_url, args.concurrency) as client:
+        tokens = {}
+        for role in sorted({scenario.role for scenario in scenarios}):
+            tokens[role] = await login(client, f"{role}0@{args.domain}", args.password)
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(
+                client, scenario, tokens[scenario.role], args.requests, args.concurrency, args.warmup
+            )
+            print_row(scenario.name, results[scenario.name])
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "mode": "http" if args.base_url else "in-process",
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "python": platform.python_version(),
+        },
+        "scenarios": results,
+    }
+
+
+# --- Reporting ---
+def print_header():
+    print(f"{'scenario':<28}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+
+def print_row(name: str, result: dict):
+    print(f"{name:<28}{result['throughput_rps']:>9}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}{result['errors']:>8}")
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Print the change against a baseline run; returns scenarios whose p95 regressed
+    by more than `threshold` percent."""
+    print(f"\nAgainst {baseline['meta'].get('commit', '?')} ({baseline['meta'].get('mode', '?')}):")
+    print(f"{'scenario':<28}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        change = lambda key: (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        print(f"{name:<28}{change('throughput_rps'):>+9.1f}%{change('p50_ms'):>+9.1f}%{change('p95_ms'):>+9.1f}%{change('p99_ms'):>+9.1f}%")
+        if change("p95_ms") > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark the Food Rescue API")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario")
+    parser.add_argument("--only", nargs="+", default=["*"], metavar="PATTERN", help="Scenario names or globs, e.g. 'ngo.*'")
+    parser.add_argument("--skip", nargs="+", default=[], metavar="PATTERN")
+    parser.add_argument("--domain", default="bench.example.com", help="Email domain used by benchmarks.seed")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--compare", help="A previous --output file to compare against")
+    parser.add_argument("--max-regression", type=float, default=None, metavar="PERCENT",
+                        help="With --compare, exit non-zero if any p95 grew by more than this")
+    args = parser.parse_args(argv)
+
+    if args.base_url is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+
+    print_header()
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.max_regression if args.max_regression is not None else math.inf)
+        if regressions:
+            print(f"p95 regressed by more than {args.max_regression}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
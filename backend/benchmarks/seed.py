@@ -0,0 +1,177 @@
+# backend/benchmarks/seed.py
+"""Fill the database with a synthetic, city-scale dataset, run from the backend directory:
+
+    python -m benchmarks.seed --donors 2000 --ngos 300 --food-items 100000
+
+Locations follow a Zipf-like skew over the gazetteer, so a few neighbourhoods carry
+most of the traffic, as in production. The same --seed always produces the same data.
+Every account gets the password from --password; the admin is admin0@<domain>, and
+donor0 and ngo0 (always verified) are the accounts `benchmarks.run` logs in as.
+"""
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import auth, models  # noqa: E402  (needs the environment loaded first)
+from app.database import SessionLocal  # noqa: E402
+from app.migrate import run_migrations  # noqa: E402
+from app.services import analytics_service  # noqa: E402
+from app.services.geo_service import load_gazetteer  # noqa: E402
+from app.services.quantity_service import quantity_columns  # noqa: E402
+
+
+logger = logging.getLogger("benchmarks.seed")
+
+INSERT_CHUNK_SIZE = 2000
+# Share of food items per status; claimed and delivered items get a claim row
+STATUS_MIX = {
+    models.FoodStatus.pending: 0.30,
+    models.FoodStatus.claimed: 0.15,
+    models.FoodStatus.delivered: 0.45,
+    models.FoodStatus.cancelled: 0.10,
+}
+FOODS = [
+    ("Cooked rice", ["20 meals", "5 kg", "40 plates"]),
+    ("Bread loaves", ["30 packets", "12 loaves", "2 boxes"]),
+    ("Vegetable curry", ["10 litres", "25 servings", "8 kg"]),
+    ("Fruit", ["15 kg", "3 boxes", "2 dozen bananas"]),
+    ("Bakery items", ["50 packets", "4 boxes", "plenty"]),
+    ("Dal", ["6 litres", "30 meals", "4 kg"]),
+]
+
+
+def skewed_locations(rng: random.Random, skew: float):
+    # Gazetteer places in random order, weighted 1/rank^skew
+    places = sorted(load_gazetteer())
+    rng.shuffle(places)
+    weights = [1 / (rank ** skew) for rank in range(1, len(places) + 1)]
+    return [f"{place.title()}, Bangalore" for place in places], weights
+
+
+def insert_chunks(db, model, rows) -> int:
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(model), rows[start:start + INSERT_CHUNK_SIZE])
+    return len(rows)
+
+
+def seed(args):
+    rng = random.Random(args.seed)
+    locations, weights = skewed_locations(rng, args.skew)
+    gazetteer = load_gazetteer()
+    now = datetime.utcnow()
+    hashed_password = auth.get_password_hash(args.password) # Hashed once and shared: bcrypt per user would dominate
+
+    db = SessionLocal()
+    try:
+        if db.query(models.User.id).filter(models.User.email.like(f"%@{args.domain}")).first() is not None:
+            raise SystemExit(f"Accounts @{args.domain} already exist; seed an empty database or pass --domain")
+
+        def user_rows(role, count):
+            rows = []
+            for i in range(count):
+                location = rng.choices(locations, weights)[0]
+                latitude, longitude = gazetteer[location.split(",")[0].lower()]
+                rows.append({
+                    "email": f"{role.value}{i}@{args.domain}", "hashed_password": hashed_password,
+                    "name": f"{role.value.title()} {i}", "role": role, "location": location,
+                    "latitude": latitude, "longitude": longitude, "is_active": True,
+                    # ngo0 is always verified, so the benchmark runner can log in as it
+                    "is_verified": role != models.UserRole.ngo or i == 0 or rng.random() < args.verified_ratio,
+                })
+            return rows
+
+        insert_chunks(db, models.User, user_rows(models.UserRole.admin, 1))
+        insert_chunks(db, models.User, user_rows(models.UserRole.donor, args.donors))
+        insert_chunks(db, models.User, user_rows(models.UserRole.ngo, args.ngos))
+        db.commit()
+        users = db.query(models.User.id, models.User.role, models.User.is_verified).filter(
+            models.User.email.like(f"%@{args.domain}")
+        ).all()
+        donor_ids = [user_id for user_id, role, _ in users if role == models.UserRole.donor]
+        ngo_ids = [user_id for user_id, role, verified in users if role == models.UserRole.ngo and verified]
+        if not donor_ids or not ngo_ids:
+            raise SystemExit("Need at least one donor and one verified NGO")
+
+        statuses, status_weights = list(STATUS_MIX), list(STATUS_MIX.values())
+        food_rows, claim_statuses = [], []
+        for _ in range(args.food_items):
+            name, quantities = rng.choice(FOODS)
+            quantity = rng.choice(quantities)
+            location = rng.choices(locations, weights)[0]
+            latitude, longitude = gazetteer[location.split(",")[0].lower()]
+            created_at = now - timedelta(days=rng.random() * args.days)
+            status = rng.choices(statuses, status_weights)[0]
+            food_rows.append({
+                "name": name, "description": f"{name}, surplus", "quantity": quantity, **quantity_columns(quantity),
+                "location": location, "latitude": latitude, "longitude": longitude,
+                "pickup_time": created_at + timedelta(hours=rng.randint(1, 48)), "created_at": created_at,
+                "status": status, "donor_id": rng.choice(donor_ids),
+            })
+            claim_statuses.append(status)
+
+        food_ids = []
+        for start in range(0, len(food_rows), INSERT_CHUNK_SIZE):
+            # Ids are assigned in VALUES order, as in donation_service.bulk_create_donations
+            food_ids.extend(sorted(db.scalars(
+                insert(models.FoodItem).returning(models.FoodItem.id), food_rows[start:start + INSERT_CHUNK_SIZE]
+            ).all()))
+        db.commit()
+        claim_rows = [
+            {"food_item_id": food_ids[i], "ngo_id": rng.choice(ngo_ids),
+             "claimed_at": food_rows[i]["created_at"] + timedelta(minutes=rng.randint(5, 600)), "status": status}
+            for i, status in enumerate(claim_statuses)
+            if status in (models.FoodStatus.claimed, models.FoodStatus.delivered)
+        ]
+        insert_chunks(db, models.Claim, claim_rows)
+
+        otp_rows = [
+            {"email": f"{models.UserRole.donor.value}{rng.randrange(max(args.donors, 1))}@{args.domain}",
+             "code": f"{rng.randrange(10 ** 6):06d}", "expires_at": now + timedelta(minutes=rng.randint(-600, 10)),
+             "consumed": rng.random() < 0.5}
+            for _ in range(args.otps)
+        ]
+        insert_chunks(db, models.OtpCode, otp_rows)
+        db.commit()
+
+        counters = analytics_service.rebuild_rollups(db)
+    finally:
+        db.close()
+    logger.info(
+        "Seeded %s donors, %s NGOs (%s verified), %s food items, %s claims, %s OTP rows; %s rollup rows",
+        args.donors, args.ngos, len(ngo_ids), len(food_rows), len(claim_rows), len(otp_rows), counters,
+    )
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed", description="Seed a synthetic Food Rescue dataset")
+    parser.add_argument("--donors", type=int, default=500)
+    parser.add_argument("--ngos", type=int, default=100)
+    parser.add_argument("--food-items", type=int, default=20000)
+    parser.add_argument("--otps", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=90, help="Spread created_at over this many past days")
+    parser.add_argument("--verified-ratio", type=float, default=0.8, help="Share of NGOs already verified")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for location popularity")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--domain", default="bench.example.com")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--no-migrate", action="store_true", help="Skip applying migrations first")
+    args = parser.parse_args(argv)
+
+    if not args.no_migrate:
+        run_migrations()
+    started = time.perf_counter()
+    seed(args)
+    logger.info("Done in %.1fs", time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
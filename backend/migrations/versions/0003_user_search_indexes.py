@@ -0,0 +1,26 @@
+"""expression indexes for admin user search
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:10:12.402117
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_lower_name', [sa.text('lower(name)')], unique=False)
+        batch_op.create_index('ix_users_lower_email', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_lower_email')
+        batch_op.drop_index('ix_users_lower_name')
@@ -0,0 +1,32 @@
+"""parsed quantity columns on food_items
+
+Existing rows are filled by `python -m app.cli backfill-quantities`.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:41:27.518330
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('food_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quantity_amount', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('quantity_unit', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('estimated_servings', sa.Float(), nullable=True))
+        batch_op.create_index('ix_food_items_status_estimated_servings', ['status', 'estimated_servings'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('food_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_food_items_status_estimated_servings')
+        batch_op.drop_column('estimated_servings')
+        batch_op.drop_column('quantity_unit')
+        batch_op.drop_column('quantity_amount')
@@ -0,0 +1,26 @@
+"""change version counters for conditional GETs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 10:12:03.664721
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('change_versions',
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade():
+    op.drop_table('change_versions')
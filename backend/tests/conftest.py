@@ -0,0 +1,77 @@
+# backend/tests/conftest.py
+import os
+import shutil
+import tempfile
+import uuid
+
+# Settings are read at import time, so the environment is set before anything imports the app
+_workdir = tempfile.mkdtemp(prefix="food-rescue-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["SWEEP_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4" # Fast hashes; the cost factor is not under test
+os.environ["SMTP_MODE"] = "console"
+
+import pytest
+from fastapi.testclient import TestClient
+
+PASSWORD = "test-password"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_workdir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as client: # Runs the lifespan: migrations, outbox worker, event hub
+        yield client
+
+
+def register(client, role: str, location: str = "Whitefield, Bangalore") -> dict:
+    email = f"{role}-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/api/v1/auth/register", json={
+        "email": email, "password": PASSWORD, "name": email, "role": role, "location": location,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def login(client, email: str) -> dict:
+    response = client.post("/api/v1/auth/token", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin(client) -> dict:
+    # The first admin registered is verified automatically
+    return login(client, register(client, "admin")["email"])
+
+
+@pytest.fixture
+def donor(client) -> dict:
+    return login(client, register(client, "donor")["email"])
+
+
+@pytest.fixture
+def make_ngo(client, admin):
+    """Registers, verifies and logs in a new NGO; returns its auth headers."""
+    def make_ngo(location: str = "Whitefield, Bangalore") -> dict:
+        user = register(client, "ngo", location)
+        response = client.put(f"/api/v1/admin/users/{user['id']}/verify", headers=admin)
+        assert response.status_code == 200, response.text
+        return login(client, user["email"])
+    return make_ngo
+
+
+@pytest.fixture
+def donate(client):
+    """Submits a donation as the given donor; returns the food item."""
+    def donate(headers: dict, **fields) -> dict:
+        body = {"name": "Rice", "quantity": "10 kg", "location": "Whitefield, Bangalore", "pickup_time": "2030-01-01T10:00:00"}
+        response = client.post("/api/v1/donor/food", json={**body, **fields}, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return donate
@@ -0,0 +1,46 @@
+# backend/tests/test_admin_users.py
+import uuid
+
+from app.routers import admin_routes
+from conftest import PASSWORD
+
+
+def register_named(client, name: str, role: str = "ngo") -> dict:
+    email = f"{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/api/v1/auth/register", json={
+        "email": email, "password": PASSWORD, "name": name, "role": role, "location": "Indiranagar",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_users_are_paged_with_a_total(client, admin):
+    tag = uuid.uuid4().hex[:8]
+    ids = {register_named(client, f"Paged {tag} {i}")["id"] for i in range(5)}
+    admin_routes.user_count_cache.clear()
+
+    seen, offset = set(), 0
+    while True:
+        response = client.get("/api/v1/admin/users", params={"q": f"paged {tag}", "offset": offset, "limit": 2}, headers=admin)
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "5"
+        page = response.json()
+        if not page:
+            break
+        seen |= {user["id"] for user in page}
+        offset += 2
+    assert seen == ids
+
+
+def test_prefix_search_is_case_insensitive(client, admin):
+    tag = uuid.uuid4().hex[:8]
+    user = register_named(client, f"Zed{tag}")
+    response = client.get("/api/v1/admin/users", params={"q": f"  zED{tag.upper()} "}, headers=admin)
+    assert [row["id"] for row in response.json()] == [user["id"]]
+
+
+def test_non_ascii_prefix_matches_as_stored(client, admin):
+    tag = uuid.uuid4().hex[:8]
+    user = register_named(client, f"Émile {tag}")
+    response = client.get("/api/v1/admin/users", params={"q": f"Émile {tag}"}, headers=admin)
+    assert [row["id"] for row in response.json()] == [user["id"]]
@@ -0,0 +1,181 @@
+# backend/tests/test_ai_cache.py
+import asyncio
+import time
+from collections import namedtuple
+
+import pytest
+
+from app import schemas
+from app.cache import CoalescingCache, TTLCache
+from app.services import ai_service
+from app.services.ai_providers import MockProvider
+from app.services.geo_service import NgoSpatialIndex
+
+CONCURRENT_CALLS = 10
+
+NgoRow = namedtuple("NgoRow", "id name location latitude longitude")
+
+
+class CountingProvider(MockProvider):
+    """MockProvider that counts what reaches it, holds each call until `release` is set
+    so concurrent callers really overlap, and fails for descriptions containing "bad"."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def shelf_life(self, description):
+        self.calls.append(("shelf_life", description))
+        await self.release.wait()
+        if "bad" in description:
+            raise ValueError(f"cannot judge {description}")
+        return await super().shelf_life(description)
+
+    async def shelf_life_batch(self, descriptions):
+        self.calls.append(("shelf_life_batch", tuple(descriptions)))
+        return await super().shelf_life_batch(descriptions)
+
+    async def rank_ngos(self, req, candidates):
+        self.calls.append(("rank_ngos", req.location))
+        return await super().rank_ngos(req, candidates)
+
+
+class NoDb:
+    async def run_sync(self, fn, *args):
+        pass # The index under test is loaded by hand
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = CountingProvider()
+    monkeypatch.setattr(ai_service, "provider", provider)
+    monkeypatch.setattr(ai_service, "ai_cache", CoalescingCache(TTLCache(maxsize=64, ttl=60)))
+    return provider
+
+
+async def released(provider, calls):
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    await asyncio.sleep(0.01) # Every caller is now waiting on the provider
+    provider.release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# --- CoalescingCache ---
+def test_concurrent_identical_calls_reach_the_provider_once(provider):
+    async def run():
+        results = await released(provider, [ai_service.get_shelf_life(" Cooked  RICE ") for _ in range(CONCURRENT_CALLS)])
+        again = await ai_service.get_shelf_life("cooked rice")
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert provider.calls == [("shelf_life", "cooked rice")]
+    assert all(result == again for result in results)
+    stats = ai_service.ai_cache.stats()
+    assert (stats["computed"], stats["coalesced"], stats["hits"]) == (1, CONCURRENT_CALLS - 1, 1)
+
+
+def test_failures_are_shared_but_not_cached(provider):
+    results = asyncio.run(released(provider, [ai_service.get_shelf_life("bad fish") for _ in range(3)]))
+    assert all(isinstance(result, ValueError) for result in results)
+    assert provider.calls == [("shelf_life", "bad fish")]
+    assert len(ai_service.ai_cache.cache) == 0
+
+    with pytest.raises(ValueError):
+        asyncio.run(ai_service.get_shelf_life("bad fish"))
+    assert len(provider.calls) == 2 # Tried again, not served from the cache
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    cache = CoalescingCache(TTLCache(ttl=60))
+    computed = []
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        computed.append(1)
+        return "value"
+
+    async def run():
+        first = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        second = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0.01)
+        first.cancel() # e.g. the client went away
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "value"
+    assert computed == [1]
+    assert cache.cache.get("key") == "value"
+
+
+def test_entries_expire():
+    cache = CoalescingCache(TTLCache(ttl=0.05))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        first = await cache.get_or_compute("key", compute)
+        cached = await cache.get_or_compute("key", compute)
+        time.sleep(0.1)
+        return first, cached, await cache.get_or_compute("key", compute)
+
+    assert asyncio.run(run()) == (1, 1, 2)
+
+
+def test_batch_dedupes_keys_and_keeps_failures_per_item():
+    cache = CoalescingCache(TTLCache(ttl=60))
+    batches = []
+
+    async def compute_many(keys):
+        batches.append(keys)
+        return [ValueError(key) if key.startswith("bad") else key.upper() for key in keys]
+
+    async def run():
+        first = await cache.get_or_compute_many(["a", "bad", "a", "c", "bad"], compute_many)
+        second = await cache.get_or_compute_many(["c", "bad", "d"], compute_many)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert batches == [["a", "bad", "c"], ["bad", "d"]] # Repeats collapse; only the failure and new keys go again
+    assert [result if not isinstance(result, Exception) else "error" for result in first] == ["A", "error", "A", "C", "error"]
+    assert second[0] == "C" and isinstance(second[1], ValueError) and second[2] == "D"
+    assert cache.cache.get("bad") is None
+
+
+def test_batch_joins_calls_already_in_flight(provider):
+    async def run():
+        single = asyncio.ensure_future(ai_service.get_shelf_life("bread"))
+        await asyncio.sleep(0.01)
+        batch = asyncio.ensure_future(ai_service.get_shelf_life_batch(["Bread", "dal"]))
+        await asyncio.sleep(0.01)
+        provider.release.set()
+        return await single, await batch
+
+    single, batch = asyncio.run(run())
+    assert batch[0] == single
+    # The batch only sent the description that was not already being computed
+    assert ("shelf_life_batch", ("dal",)) in provider.calls
+    assert provider.calls.count(("shelf_life", "bread")) == 1
+
+
+# --- NGO Matching ---
+def test_ngo_matches_are_invalidated_by_index_changes(provider, monkeypatch):
+    index = NgoSpatialIndex()
+    index.load([NgoRow(1, "Food Bank", "Whitefield, Bangalore", None, None)])
+    monkeypatch.setattr(ai_service, "ngo_index", index)
+    request = schemas.AIMatchRequest(location="Whitefield, Bangalore", food_type="cooked", quantity="20 meals")
+
+    async def match():
+        return await ai_service.get_ngo_match(request, NoDb())
+
+    first = asyncio.run(match())
+    assert asyncio.run(match()) == first
+    assert len(provider.calls) == 1
+
+    index.load([NgoRow(1, "Food Bank", "Whitefield, Bangalore", None, None), NgoRow(2, "Meal Share", "Whitefield, Bangalore", None, None)])
+    refreshed = asyncio.run(match())
+    assert len(provider.calls) == 2
+    assert {suggestion.ngo_id for suggestion in refreshed.suggestions} == {1, 2}
@@ -0,0 +1,94 @@
+# backend/tests/test_ai_routes.py
+import pytest
+
+from app import schemas
+from app.cache import CoalescingCache, TTLCache
+from app.services import ai_service
+from app.services.ai_providers import GeminiProvider, MockProvider, _batch_results
+
+SHELF_LIFE_BATCH = "/api/v1/ai/shelf-life/batch"
+DRAFT_BATCH = "/api/v1/ai/draft-message/batch"
+
+
+class FlakyProvider(MockProvider):
+    """MockProvider that fails for any item mentioning "bad"."""
+
+    async def shelf_life(self, description):
+        if "bad" in description:
+            raise ValueError("provider error")
+        return await super().shelf_life(description)
+
+    async def draft_message(self, req):
+        if "bad" in req.food_name:
+            raise ValueError("provider error")
+        return await super().draft_message(req)
+
+
+class ScriptedGemini(GeminiProvider):
+    """GeminiProvider whose model always answers with `reply`."""
+
+    def __init__(self, reply):
+        self.reply = reply
+
+    async def _generate_json(self, prompt):
+        return self.reply
+
+
+@pytest.fixture
+def use_provider(monkeypatch):
+    monkeypatch.setattr(ai_service, "ai_cache", CoalescingCache(TTLCache(maxsize=64, ttl=60)))
+
+    def use_provider(provider):
+        monkeypatch.setattr(ai_service, "provider", provider)
+    use_provider(FlakyProvider())
+    return use_provider
+
+
+def draft(food_name: str) -> dict:
+    return {"food_name": food_name, "quantity": "5 kg", "location": "Whitefield", "pickup_time": "2030-01-01T10:00:00"}
+
+
+def test_shelf_life_batch_keeps_order_and_reports_failures(client, donor, use_provider):
+    items = [{"description": "cooked rice"}, {"description": "bad fish"}, {"description": "bread"}, {"description": "Cooked Rice"}]
+    response = client.post(SHELF_LIFE_BATCH, json={"items": items}, headers=donor)
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[1] == {"index": 1, "result": None, "error": "Could not process this item"}
+    single = client.post("/api/v1/ai/shelf-life", json={"description": "bread"}, headers=donor).json()
+    assert results[2]["result"] == single
+    assert results[0]["result"] == results[3]["result"] and results[0]["result"] != single
+
+
+def test_draft_batch_keeps_order_and_reports_failures(client, donor, use_provider):
+    response = client.post(DRAFT_BATCH, json={"items": [draft("rice"), draft("bad soup"), draft("bread")]}, headers=donor)
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert results[1]["error"] and results[1]["result"] is None
+    assert "of rice at" in results[0]["result"]["draft_message"]
+    assert "of bread at" in results[2]["result"]["draft_message"]
+
+
+def test_batch_size_is_bounded(client, donor, use_provider):
+    too_many = [{"description": f"food {i}"} for i in range(schemas.AI_BATCH_MAX_ITEMS + 1)]
+    assert client.post(SHELF_LIFE_BATCH, json={"items": too_many}, headers=donor).status_code == 422
+    assert client.post(SHELF_LIFE_BATCH, json={"items": []}, headers=donor).status_code == 422
+    assert client.post(DRAFT_BATCH, json={"items": [draft("rice")] * (schemas.AI_BATCH_MAX_ITEMS + 1)}, headers=donor).status_code == 422
+    assert client.post(SHELF_LIFE_BATCH, json={"items": too_many[:-1]}, headers=donor).status_code == 200
+
+
+def test_model_reply_of_the_wrong_length_fails_every_item(client, donor, use_provider):
+    use_provider(ScriptedGemini([{"shelf_life_estimation": "1 day", "warnings": []}]))
+    response = client.post(SHELF_LIFE_BATCH, json={"items": [{"description": "rice"}, {"description": "dal"}]}, headers=donor)
+    assert response.status_code == 200
+    assert [result["error"] is not None for result in response.json()["results"]] == [True, True]
+
+
+def test_batch_results():
+    reply = [{"shelf_life_estimation": "1 day", "warnings": []}, {"warnings": "not a list"}]
+    results = _batch_results(reply, 2, schemas.AIShelfLifeResponse)
+    assert results[0] == schemas.AIShelfLifeResponse(shelf_life_estimation="1 day", warnings=[])
+    assert isinstance(results[1], ValueError) # One malformed item does not sink the batch
+    for wrong in (reply[:1], reply * 2, {"items": reply}):
+        with pytest.raises(ValueError):
+            _batch_results(wrong, 2, schemas.AIShelfLifeResponse)
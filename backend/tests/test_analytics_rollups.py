@@ -0,0 +1,37 @@
+# backend/tests/test_analytics_rollups.py
+from app import models
+from app.database import SessionLocal
+from app.services import analytics_service
+
+
+def counters() -> dict:
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            models.AnalyticsCounter.dimension, models.AnalyticsCounter.key, models.AnalyticsCounter.status, models.AnalyticsCounter.count
+        ).all()
+        return {(dimension, key, status): count for dimension, key, status, count in rows if count}
+    finally:
+        db.close()
+
+
+def rebuilt() -> dict:
+    db = SessionLocal()
+    try:
+        analytics_service.rebuild_rollups(db)
+    finally:
+        db.close()
+    return counters()
+
+
+def test_claim_revert_reclaim_matches_rebuild(client, donor, make_ngo, donate):
+    first, second = make_ngo("Koramangala, Bangalore"), make_ngo("Jayanagar, Bangalore")
+    item = donate(donor)
+    claim = client.post(f"/api/v1/ngo/food/claim/{item['id']}", headers=first).json()
+    assert client.put(f"/api/v1/ngo/food/claim/{claim['id']}", json={"status": "pending"}, headers=first).status_code == 200
+    assert client.post(f"/api/v1/ngo/food/claim/{item['id']}", headers=second).status_code == 200
+    assert client.put(f"/api/v1/ngo/food/claim/{claim['id']}", json={"status": "delivered"}, headers=second).status_code == 200
+
+    incremental = counters()
+    assert incremental == rebuilt()
+    assert (analytics_service.NGO_LOCATION, "Koramangala, Bangalore", models.FoodStatus.pending) not in incremental
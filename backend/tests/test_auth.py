@@ -0,0 +1,67 @@
+# backend/tests/test_auth.py
+from app.services.token_store import OTP_MAX_ATTEMPTS
+from conftest import PASSWORD, login, register
+
+
+def test_register_and_login(client):
+    user = register(client, "donor")
+    assert user["is_active"] and user["is_verified"]
+    response = client.post("/api/v1/auth/token", data={"username": user["email"], "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    assert response.json()["user"]["id"] == user["id"]
+
+    assert client.post("/api/v1/auth/register", json={
+        "email": user["email"], "password": PASSWORD, "name": "Again", "role": "donor", "location": "Indiranagar",
+    }).status_code == 400
+    assert client.post("/api/v1/auth/token", data={"username": user["email"], "password": "wrong"}).status_code == 401
+
+
+def test_unverified_ngo_cannot_log_in(client):
+    user = register(client, "ngo")
+    response = client.post("/api/v1/auth/token", data={"username": user["email"], "password": PASSWORD})
+    assert response.status_code == 403
+
+
+def test_password_reset(client):
+    user = register(client, "donor")
+    token = client.post("/api/v1/auth/password/reset/request", json={"email": user["email"]}).json()["dev_token"]
+    response = client.post("/api/v1/auth/password/reset/confirm", json={"token": token, "new_password": "new-password"})
+    assert response.status_code == 200, response.text
+    assert client.post("/api/v1/auth/token", data={"username": user["email"], "password": "new-password"}).status_code == 200
+    # Tokens are single-use
+    assert client.post("/api/v1/auth/password/reset/confirm", json={"token": token, "new_password": "x"}).status_code == 400
+
+
+def test_otp_login(client):
+    user = register(client, "donor")
+    assert client.post("/api/v1/auth/otp/request", params={"email": "nobody@example.com"}).status_code == 404
+    code = client.post("/api/v1/auth/otp/request", params={"email": user["email"]}).json()["dev_code"]
+
+    assert client.post("/api/v1/auth/otp/verify", json={"email": user["email"], "code": "not-it"}).status_code == 400
+    response = client.post("/api/v1/auth/otp/verify", json={"email": user["email"], "code": code})
+    assert response.status_code == 200, response.text
+    assert response.json()["user"]["id"] == user["id"]
+    # Codes are single-use
+    assert client.post("/api/v1/auth/otp/verify", json={"email": user["email"], "code": code}).status_code == 400
+
+
+def test_otp_locks_after_too_many_attempts(client):
+    user = register(client, "donor")
+    code = client.post("/api/v1/auth/otp/request", params={"email": user["email"]}).json()["dev_code"]
+    wrong = {"email": user["email"], "code": "not-it"}
+    assert [client.post("/api/v1/auth/otp/verify", json=wrong).status_code for _ in range(OTP_MAX_ATTEMPTS)] == [400] * OTP_MAX_ATTEMPTS
+    assert client.post("/api/v1/auth/otp/verify", json={"email": user["email"], "code": code}).status_code == 429
+
+    # A fresh code starts over
+    code = client.post("/api/v1/auth/otp/request", params={"email": user["email"]}).json()["dev_code"]
+    assert client.post("/api/v1/auth/otp/verify", json={"email": user["email"], "code": code}).status_code == 200
+
+
+def test_deactivation_applies_to_the_next_request(client, admin):
+    user = register(client, "donor")
+    headers = login(client, user["email"])
+    assert client.get("/api/v1/donor/food/history", headers=headers).status_code == 200 # Now cached
+
+    assert client.put(f"/api/v1/admin/users/{user['id']}/deactivate", headers=admin).status_code == 200
+    response = client.get("/api/v1/donor/food/history", headers=headers)
+    assert response.status_code == 400 and response.json()["detail"] == "Inactive user"
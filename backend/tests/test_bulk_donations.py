@@ -0,0 +1,101 @@
+# backend/tests/test_bulk_donations.py
+import uuid
+
+from app import models
+from app.database import SessionLocal
+from app.services import analytics_service, donation_service
+
+PICKUP = "2030-01-01T10:00:00"
+
+
+def row(name: str, location: str = "Whitefield, Bangalore", **fields) -> dict:
+    return {"name": name, "quantity": "10 kg", "location": location, "pickup_time": PICKUP, **fields}
+
+
+def stored(ids: list) -> dict:
+    db = SessionLocal()
+    try:
+        return {item.id: item for item in db.query(models.FoodItem).filter(models.FoodItem.id.in_(ids))}
+    finally:
+        db.close()
+
+
+def counter(dimension: str, key: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(models.AnalyticsCounter.count).filter(
+            models.AnalyticsCounter.dimension == dimension,
+            models.AnalyticsCounter.key == key,
+            models.AnalyticsCounter.status == models.FoodStatus.pending,
+        ).scalar() or 0
+    finally:
+        db.close()
+
+
+def test_mixed_rows_are_reported_per_row(client, donor, monkeypatch):
+    monkeypatch.setattr(donation_service, "BULK_CHUNK_SIZE", 2) # Several chunks, so ids cross INSERTs
+    tag = uuid.uuid4().hex[:8]
+    rows = [row(f"{tag}-0"), {"name": "No quantity"}, row(f"{tag}-2"), "not an object", row(f"{tag}-4"), row(f"{tag}-5", description="Fresh")]
+    response = client.post("/api/v1/donor/food/bulk", json=rows, headers=donor)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created"], body["failed"]) == (4, 2)
+    assert [result["row"] for result in body["results"]] == list(range(len(rows)))
+    assert [result["error"] is not None for result in body["results"]] == [False, True, False, True, False, False]
+    assert "quantity" in body["results"][1]["error"]
+
+    # Each id points at the row it was reported for
+    created = {result["row"]: result["id"] for result in body["results"] if result.get("id")}
+    items = stored(list(created.values()))
+    assert {row_number: items[food_id].name for row_number, food_id in created.items()} == {
+        0: f"{tag}-0", 2: f"{tag}-2", 4: f"{tag}-4", 5: f"{tag}-5",
+    }
+    assert items[created[5]].description == "Fresh" and items[created[0]].quantity_amount == 10.0
+
+
+def test_too_many_rows(client, donor, monkeypatch):
+    monkeypatch.setattr(donation_service, "BULK_MAX_ROWS", 3)
+    response = client.post("/api/v1/donor/food/bulk", json=[row("Rice")] * 4, headers=donor)
+    assert response.status_code == 413
+
+    # A CSV is streamed, so the rows past the limit are reported instead
+    lines = ["name,quantity,location,pickup_time"] + [f"Rice,10 kg,Whitefield,{PICKUP}"] * 4
+    response = client.post("/api/v1/donor/food/bulk/csv", files={"file": ("rows.csv", "\n".join(lines))}, headers=donor)
+    body = response.json()
+    assert (body["created"], body["failed"]) == (3, 1)
+    assert "Row limit" in body["results"][-1]["error"]
+
+
+def test_csv_upload(client, donor):
+    tag = uuid.uuid4().hex[:8]
+    csv = "\n".join([
+        "name,description,quantity,location,pickup_time",
+        f"{tag}-a,,5 packets,Whitefield,{PICKUP}",
+        f"{tag}-b,Fresh,2 kg,Whitefield,not-a-date",
+        f"{tag}-c,Cooked,20 meals,Indiranagar,{PICKUP}",
+    ])
+    response = client.post("/api/v1/donor/food/bulk/csv", files={"file": ("rows.csv", csv.encode("utf-8-sig"))}, headers=donor)
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [result["row"] for result in results] == [2, 3, 4] # Line numbers, after the header
+    assert "pickup_time" in results[1]["error"]
+    items = stored([results[0]["id"], results[2]["id"]])
+    assert [items[results[i]["id"]].name for i in (0, 2)] == [f"{tag}-a", f"{tag}-c"]
+    assert items[results[0]["id"]].description is None # Blank cells fall back to the default
+
+    missing = client.post("/api/v1/donor/food/bulk/csv", files={"file": ("rows.csv", "name,quantity\nRice,1 kg")}, headers=donor)
+    assert missing.status_code == 400 and "location" in missing.json()["detail"]
+
+
+def test_bulk_updates_rollups_and_list_versions(client, donor, make_ngo):
+    ngo = make_ngo()
+    location = f"Bulkpur {uuid.uuid4().hex[:8]}"
+    history = client.get("/api/v1/donor/food/history", headers=donor)
+    feed = client.get("/api/v1/ngo/food/available", headers=ngo)
+
+    response = client.post("/api/v1/donor/food/bulk", json=[row("Rice", location), row("Dal", location), {}], headers=donor)
+    assert response.json()["created"] == 2
+
+    assert counter(analytics_service.DONOR_LOCATION, location) == 2
+    assert client.get("/api/v1/donor/food/history", headers={**donor, "If-None-Match": history.headers["ETag"]}).status_code == 200
+    assert client.get("/api/v1/ngo/food/available", headers={**ngo, "If-None-Match": feed.headers["ETag"]}).status_code == 200
@@ -0,0 +1,40 @@
+# backend/tests/test_claims.py
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+CONCURRENT_NGOS = 8
+
+
+def claim_concurrently(client, food_item_id: int, ngos: list) -> list:
+    # Sync routes run on the threadpool, so these really do race for the item
+    with ThreadPoolExecutor(len(ngos)) as pool:
+        return list(pool.map(lambda headers: client.post(f"/api/v1/ngo/food/claim/{food_item_id}", headers=headers), ngos))
+
+
+def statuses(responses: list) -> Counter:
+    return Counter(response.status_code for response in responses)
+
+
+def test_concurrent_claims_have_exactly_one_winner(client, donor, make_ngo, donate):
+    ngos = [make_ngo() for _ in range(CONCURRENT_NGOS)]
+    for _ in range(3):
+        item = donate(donor)
+        assert statuses(claim_concurrently(client, item["id"], ngos)) == {200: 1, 409: CONCURRENT_NGOS - 1}
+
+
+def test_item_put_back_to_pending_can_be_claimed_again(client, donor, make_ngo, donate):
+    first, *others = [make_ngo() for _ in range(CONCURRENT_NGOS)]
+    item = donate(donor)
+    claim = client.post(f"/api/v1/ngo/food/claim/{item['id']}", headers=first).json()
+    response = client.put(f"/api/v1/ngo/food/claim/{claim['id']}", json={"status": "pending"}, headers=first)
+    assert response.status_code == 200, response.text
+
+    responses = claim_concurrently(client, item["id"], others)
+    assert statuses(responses) == {200: 1, 409: CONCURRENT_NGOS - 2}
+    # The winner took over the stale claim row instead of replacing it
+    won = next(response.json() for response in responses if response.status_code == 200)
+    assert won["id"] == claim["id"] and won["status"] == "claimed" and won["ngo_id"] != claim["ngo_id"]
+
+
+def test_claim_unknown_item(client, make_ngo):
+    assert client.post("/api/v1/ngo/food/claim/999999", headers=make_ngo()).status_code == 404
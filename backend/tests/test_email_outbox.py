@@ -0,0 +1,127 @@
+# backend/tests/test_email_outbox.py
+import smtplib
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.services.email_outbox import EmailOutboxWorker, outbox_worker
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-batch: not caught as a delivery failure."""
+
+
+class FakeSMTP:
+    def noop(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+class FakeClient:
+    mode = "smtp"
+    strict = True
+
+    def __init__(self, on_deliver=None):
+        self.delivered = []
+        self.on_deliver = on_deliver # Called with the recipient before each delivery
+
+    def connect(self):
+        return FakeSMTP()
+
+    def deliver(self, server, to_email, subject, body):
+        if self.on_deliver is not None:
+            self.on_deliver(to_email)
+        self.delivered.append(to_email)
+
+
+@pytest.fixture
+def outbox(client):
+    # Pause the app's own worker so only the workers under test touch the table
+    outbox_worker.stop()
+    db = SessionLocal()
+    db.query(models.EmailOutbox).delete()
+    db.commit()
+    yield db
+    db.close()
+    outbox_worker.start()
+
+
+def enqueue(db, count: int) -> list:
+    emails = [f"user{i}@example.com" for i in range(count)]
+    db.add_all(models.EmailOutbox(to_email=email, subject="Hello", body="Body") for email in emails)
+    db.commit()
+    return emails
+
+
+def statuses(db) -> dict:
+    db.expire_all()
+    return {row.to_email: row.status for row in db.query(models.EmailOutbox)}
+
+
+def test_drain_sends_each_message_once(outbox):
+    emails = enqueue(outbox, 3)
+    client = FakeClient()
+    assert EmailOutboxWorker(client).drain_once() == 3
+    assert client.delivered == emails
+    assert set(statuses(outbox).values()) == {models.EmailStatus.sent}
+
+
+def test_crash_mid_batch_keeps_delivered_messages_sent(outbox):
+    emails = enqueue(outbox, 3)
+
+    def crash_on_third(to_email):
+        if to_email == emails[2]:
+            raise Crash()
+
+    with pytest.raises(Crash):
+        EmailOutboxWorker(FakeClient(crash_on_third)).drain_once()
+    result = statuses(outbox)
+    assert [result[email] for email in emails] == [models.EmailStatus.sent, models.EmailStatus.sent, models.EmailStatus.sending]
+
+    # Once the lease runs out, a new worker sends only the undelivered message
+    outbox.query(models.EmailOutbox).update({models.EmailOutbox.next_attempt_at: datetime.utcnow() - timedelta(seconds=1)})
+    outbox.commit()
+    client = FakeClient()
+    EmailOutboxWorker(client).drain_once()
+    assert client.delivered == [emails[2]]
+
+
+def test_messages_taken_over_after_lease_expiry_are_not_resent(outbox):
+    emails = enqueue(outbox, 3)
+    other = FakeClient()
+
+    def slow_first_delivery(to_email):
+        if to_email != emails[0]:
+            return
+        # The rest of the batch outlives its lease while this message is sent, and a
+        # second worker leases and delivers them
+        db = SessionLocal()
+        db.query(models.EmailOutbox).filter(models.EmailOutbox.to_email != emails[0]).update(
+            {models.EmailOutbox.next_attempt_at: datetime.utcnow() - timedelta(seconds=1)}, synchronize_session=False
+        )
+        db.commit()
+        db.close()
+        EmailOutboxWorker(other).drain_once()
+
+    first = FakeClient(slow_first_delivery)
+    EmailOutboxWorker(first).drain_once()
+    assert first.delivered == [emails[0]]
+    assert other.delivered == emails[1:]
+    assert set(statuses(outbox).values()) == {models.EmailStatus.sent}
+
+
+def test_failed_delivery_is_retried_later(outbox):
+    emails = enqueue(outbox, 1)
+
+    def refuse(to_email):
+        raise smtplib.SMTPRecipientsRefused({to_email: (550, b"No such user")})
+
+    EmailOutboxWorker(FakeClient(refuse)).drain_once()
+    outbox.expire_all()
+    row = outbox.query(models.EmailOutbox).filter(models.EmailOutbox.to_email == emails[0]).one()
+    assert row.status == models.EmailStatus.pending and row.attempts == 1
+    assert row.next_attempt_at > datetime.utcnow()
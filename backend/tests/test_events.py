@@ -0,0 +1,43 @@
+# backend/tests/test_events.py
+import asyncio
+import json
+
+from app.routers import ngo_routes
+from app.services.events import CREATED, event_hub
+
+
+class ConnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def test_stream_survives_heartbeats(client, monkeypatch):
+    monkeypatch.setattr(ngo_routes, "STREAM_HEARTBEAT_SECONDS", 0.05)
+
+    async def read_stream():
+        stream = ngo_routes.event_stream(ConnectedRequest(), None)
+        try:
+            chunks = [await stream.__anext__() for _ in range(4)] # retry line, then three idle heartbeats
+            event_hub.publish(CREATED, 42, {"status": "pending"})
+            chunks.append(await asyncio.wait_for(stream.__anext__(), 5))
+            chunks.append(await stream.__anext__()) # And idle again afterwards
+            return chunks
+        finally:
+            await stream.aclose()
+
+    chunks = asyncio.run(read_stream())
+    assert chunks[0].startswith("retry:")
+    assert chunks[1:4] == [": keep-alive\n\n"] * 3
+    fields = dict(line.split(": ", 1) for line in chunks[4].strip().split("\n"))
+    assert fields["event"] == CREATED and json.loads(fields["data"])["food_item_id"] == 42
+    assert chunks[5] == ": keep-alive\n\n"
+
+
+def test_subscription_replays_missed_events(client):
+    async def replay():
+        first = event_hub.publish(CREATED, 1)
+        event_hub.publish(CREATED, 2)
+        async with event_hub.subscription(since=first["seq"], heartbeat=0.05) as events:
+            return await events.__anext__()
+
+    assert asyncio.run(replay())["food_item_id"] == 2
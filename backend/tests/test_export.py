@@ -0,0 +1,73 @@
+# backend/tests/test_export.py
+import csv
+import gzip
+import io
+import json
+import uuid
+
+EXPORT = "/api/v1/admin/export"
+
+
+def csv_rows(response) -> list:
+    assert response.status_code == 200, response.text
+    return list(csv.DictReader(io.StringIO(response.text)))
+
+
+def ndjson_rows(content: bytes) -> list:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+def test_csv_neutralises_formulas(client, admin, donor, donate):
+    tag = uuid.uuid4().hex[:8]
+    item = donate(donor, name=f'=HYPERLINK("http://evil.example/{tag}")', description="-1+2", location=f"@{tag}")
+    plain = donate(donor, name=f"Rice {tag}", description="Cooked - fresh")
+
+    response = client.get(f"{EXPORT}/food_items", headers=admin)
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'attachment; filename="food_items-' in response.headers["content-disposition"]
+    rows = {row["id"]: row for row in csv_rows(response)}
+    row = rows[str(item["id"])]
+    assert (row["name"], row["description"], row["location"]) == (f"'{item['name']}", "'-1+2", f"'@{tag}")
+    assert rows[str(plain["id"])]["description"] == "Cooked - fresh"
+
+    # NDJSON is data, not a spreadsheet: values stay as entered
+    response = client.get(f"{EXPORT}/food_items", params={"format": "ndjson"}, headers=admin)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    exported = next(row for row in ndjson_rows(response.content) if row["id"] == item["id"])
+    assert exported["name"] == item["name"] and exported["status"] == "pending"
+
+
+def test_gzip_round_trip(client, admin):
+    for fmt in ("csv", "ndjson"):
+        plain = client.get(f"{EXPORT}/users", params={"format": fmt}, headers=admin)
+        packed = client.get(f"{EXPORT}/users", params={"format": fmt, "gzip": True}, headers=admin)
+        assert packed.headers["content-type"] == "application/gzip"
+        assert packed.headers["content-disposition"].endswith(f'.{fmt}.gz"')
+        assert gzip.decompress(packed.content) == plain.content
+
+
+def test_filters(client, admin, donor, make_ngo, donate):
+    ngo = make_ngo()
+    item = donate(donor)
+    assert client.post(f"/api/v1/ngo/food/claim/{item['id']}", headers=ngo).status_code == 200
+
+    claimed = csv_rows(client.get(f"{EXPORT}/food_items", params={"status": "claimed"}, headers=admin))
+    assert str(item["id"]) in {row["id"] for row in claimed}
+    assert {row["status"] for row in claimed} == {"claimed"}
+
+    claims = csv_rows(client.get(f"{EXPORT}/claims", params={"start": "2000-01-01T00:00:00"}, headers=admin))
+    assert str(item["id"]) in {row["food_item_id"] for row in claims}
+    assert csv_rows(client.get(f"{EXPORT}/claims", params={"start": "2999-01-01T00:00:00"}, headers=admin)) == []
+    assert csv_rows(client.get(f"{EXPORT}/food_items", params={"end": "2000-01-01T00:00:00"}, headers=admin)) == []
+
+    ngos = csv_rows(client.get(f"{EXPORT}/users", params={"role": "ngo"}, headers=admin))
+    assert ngos and {row["role"] for row in ngos} == {"ngo"}
+
+
+def test_invalid_requests(client, admin, donor):
+    assert client.get(f"{EXPORT}/passwords", headers=admin).status_code == 404
+    assert client.get(f"{EXPORT}/users", params={"start": "2024-01-01T00:00:00"}, headers=admin).status_code == 400
+    assert client.get(f"{EXPORT}/users", params={"status": "pending"}, headers=admin).status_code == 400
+    assert client.get(f"{EXPORT}/claims", params={"role": "ngo"}, headers=admin).status_code == 400
+    assert client.get(f"{EXPORT}/users", params={"format": "xlsx"}, headers=admin).status_code == 422
+    assert client.get(f"{EXPORT}/users", headers=donor).status_code == 403
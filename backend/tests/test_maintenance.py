@@ -0,0 +1,34 @@
+# backend/tests/test_maintenance.py
+from datetime import datetime, timedelta
+
+from app import models
+from app.database import SessionLocal
+from app.services.maintenance import MaintenanceSweeper
+
+
+def backdate(food_item_id: int):
+    db = SessionLocal()
+    try:
+        db.query(models.FoodItem).filter(models.FoodItem.id == food_item_id).update(
+            {models.FoodItem.pickup_time: datetime.utcnow() - timedelta(hours=1)}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_expiring_a_reverted_item_invalidates_the_ngo_history(client, donor, make_ngo, donate):
+    ngo = make_ngo()
+    item = donate(donor)
+    claim = client.post(f"/api/v1/ngo/food/claim/{item['id']}", headers=ngo).json()
+    assert client.put(f"/api/v1/ngo/food/claim/{claim['id']}", json={"status": "pending"}, headers=ngo).status_code == 200
+
+    history = client.get("/api/v1/ngo/food/history", headers=ngo)
+    assert client.get("/api/v1/ngo/food/history", headers={**ngo, "If-None-Match": history.headers["ETag"]}).status_code == 304
+
+    backdate(item["id"])
+    assert MaintenanceSweeper().expire_overdue_donations(datetime.utcnow()) == 1
+
+    response = client.get("/api/v1/ngo/food/history", headers={**ngo, "If-None-Match": history.headers["ETag"]})
+    assert response.status_code == 200
+    assert [row["food_item"]["status"] for row in response.json() if row["food_item_id"] == item["id"]] == ["cancelled"]
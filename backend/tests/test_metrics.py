@@ -0,0 +1,92 @@
+# backend/tests/test_metrics.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.metrics import MetricsMiddleware, Registry
+from app.routers import metrics_routes
+
+
+def test_text_format():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    registry.collected("pool_size", "Pool size", "gauge", lambda: [({"pool": "sync"}, 5)])
+    requests.inc(("/a",))
+    requests.inc(('/b"\\',), 2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 1',
+        'requests_total{route="/b\\"\\\\"} 2',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+        "# HELP pool_size Pool size",
+        "# TYPE pool_size gauge",
+        'pool_size{pool="sync"} 5',
+    ]
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Again")
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.include_router(metrics_routes.router)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def requests_seen(method: str, route: str, status: str) -> float:
+    samples = metrics.http_requests.samples()
+    return next((value for _, labels, value in samples if labels == {"method": method, "route": route, "status": status}), 0)
+
+
+def test_middleware_labels_by_route_template(app):
+    client = TestClient(app, raise_server_exceptions=False)
+    before = (requests_seen("GET", "/items/{item_id}", "200"), requests_seen("GET", "unmatched", "404"), requests_seen("GET", "/boom", "500"))
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/nowhere/3")
+    client.get("/boom")
+    after = (requests_seen("GET", "/items/{item_id}", "200"), requests_seen("GET", "unmatched", "404"), requests_seen("GET", "/boom", "500"))
+    assert [b - a for a, b in zip(before, after)] == [2, 1, 1]
+    # Paths with ids never become labels
+    assert not any("/items/1" in labels.get("route", "") for _, labels, _ in metrics.http_requests.samples())
+    assert metrics.http_in_flight.samples() == [("", {}, 0)]
+
+
+def test_metrics_route_requires_the_token(app, monkeypatch):
+    monkeypatch.setattr(metrics_routes, "METRICS_TOKEN", "secret")
+    client = TestClient(app)
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE http_requests_total counter" in response.text
+
+
+def test_metrics_are_off_by_default():
+    assert not metrics.METRICS_ENABLED
+    from app.main import app
+    assert "/metrics" not in {route.path for route in app.routes}
@@ -0,0 +1,55 @@
+# backend/tests/test_quantity_service.py
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.services.quantity_service import ParsedQuantity, backfill_quantities, parse_quantity
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("20 packets", ParsedQuantity(20.0, "packet", 20.0)),
+    ("10kg", ParsedQuantity(10.0, "kg", 25.0)),
+    ("500 g rice", ParsedQuantity(0.5, "kg", 1.2)),
+    ("5-6 litres", ParsedQuantity(5.0, "l", 20.0)),
+    ("10 to 12 meals", ParsedQuantity(10.0, "serving", 10.0)),
+    ("2 dozen packets", ParsedQuantity(24.0, "packet", 24.0)),
+    ("1,000 ml", ParsedQuantity(1.0, "l", 4.0)),
+    ("3 boxes", ParsedQuantity(3.0, "box", 12.0)),
+    ("2 lbs", ParsedQuantity(0.907, "kg", 2.3)),
+    ("15 bananas", ParsedQuantity(15.0, "item", None)),
+    ("About 40", ParsedQuantity(40.0, "item", None)),
+    # Leading decimal point, fractions and mixed numbers
+    (".5 kg", ParsedQuantity(0.5, "kg", 1.2)),
+    ("0.5 kg", ParsedQuantity(0.5, "kg", 1.2)),
+    ("1/2 kg rice", ParsedQuantity(0.5, "kg", 1.2)),
+    ("1 1/2 kg", ParsedQuantity(1.5, "kg", 3.8)),
+    ("½ kg", ParsedQuantity(0.5, "kg", 1.2)),
+    ("1½ litres", ParsedQuantity(1.5, "l", 6.0)),
+    ("1/2-1 kg", ParsedQuantity(0.5, "kg", 1.2)),
+])
+def test_parse_quantity(text, expected):
+    assert parse_quantity(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "some rice", "1/0 kg"])
+def test_unparseable_quantity(text):
+    assert parse_quantity(text) is None
+
+
+def test_backfill_reparses_rows_written_by_an_older_parser(client, donor, donate):
+    item = donate(donor, quantity=".5 kg")
+    db = SessionLocal()
+    try:
+        # As the old parser stored it: ten times too much
+        db.query(models.FoodItem).filter(models.FoodItem.id == item["id"]).update(
+            {models.FoodItem.quantity_amount: 5.0, models.FoodItem.estimated_servings: 12.5}
+        )
+        db.commit()
+        backfill_quantities(db)
+        assert db.get(models.FoodItem, item["id"]).quantity_amount == 5.0 # Only empty rows by default
+        assert backfill_quantities(db, reparse=True) >= 1
+        db.expire_all()
+        row = db.get(models.FoodItem, item["id"])
+        assert (row.quantity_amount, row.estimated_servings) == (0.5, 1.2)
+    finally:
+        db.close()
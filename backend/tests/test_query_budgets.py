@@ -0,0 +1,57 @@
+# backend/tests/test_query_budgets.py
+"""SQL statement budgets per route. A budget that is exceeded usually means an N+1:
+a relationship serialized by the response model that the route does not eager-load.
+Each route is called twice and the second call counted, since the first warms the
+auth and AI caches."""
+import pytest
+
+from app.query_trace import trace_queries
+from conftest import login, register
+
+PICKUP = "2030-01-01T10:00:00"
+
+# (name, role, method, path, JSON body, max statements). The polled lists and the
+# writes behind them include one statement for their change versions (ETags).
+BUDGETS = [
+    ("ngo.available", "ngo", "GET", "/ngo/food/available", None, 3),
+    ("ngo.available_page", "ngo", "GET", "/ngo/food/available/page?limit=50", None, 2),
+    ("ngo.available_page_donors", "ngo", "GET", "/ngo/food/available/page?limit=50&include_donor=true", None, 3),
+    ("ngo.history", "ngo", "GET", "/ngo/food/history", None, 4),
+    ("ngo.history_page", "ngo", "GET", "/ngo/food/history/page?limit=50", None, 2),
+    ("ngo.history_page_expanded", "ngo", "GET", "/ngo/food/history/page?limit=50&expand=food_item,food_item.donor,ngo", None, 4),
+    ("donor.history", "donor", "GET", "/donor/food/history", None, 3),
+    ("donor.submit", "donor", "POST", "/donor/food",
+     {"name": "Budget item", "quantity": "10 meals", "location": "Whitefield, Bangalore", "pickup_time": PICKUP}, 4),
+    ("admin.users", "admin", "GET", "/admin/users", None, 2),
+    ("admin.user_search", "admin", "GET", "/admin/users?q=ngo", None, 2),
+    ("admin.analytics", "admin", "GET", "/admin/analytics", None, 4),
+    ("ai.match_ngo", "donor", "POST", "/ai/match-ngo",
+     {"location": "Whitefield, Bangalore", "food_type": "cooked", "quantity": "20 meals"}, 0),
+    ("ai.analytics_insight", "admin", "GET", "/ai/analytics-insight", None, 4),
+]
+
+
+@pytest.fixture(scope="module")
+def accounts(client, admin):
+    # Several donors and a few claims, so a per-row lazy load would show in the counts
+    ngo_user = register(client, "ngo")
+    assert client.put(f"/api/v1/admin/users/{ngo_user['id']}/verify", headers=admin).status_code == 200
+    ngo = login(client, ngo_user["email"])
+    donors = [login(client, register(client, "donor")["email"]) for _ in range(3)]
+    for i in range(9):
+        response = client.post("/api/v1/donor/food", headers=donors[i % 3], json={
+            "name": f"Budget {i}", "quantity": f"{i + 1} meals", "location": "Whitefield, Bangalore", "pickup_time": PICKUP,
+        })
+        item = response.json()
+        if i % 2 == 0:
+            assert client.post(f"/api/v1/ngo/food/claim/{item['id']}", headers=ngo).status_code == 200
+    return {"admin": admin, "donor": donors[0], "ngo": ngo}
+
+
+@pytest.mark.parametrize("name, role, method, path, body, budget", BUDGETS, ids=[budget[0] for budget in BUDGETS])
+def test_route_stays_within_query_budget(client, accounts, name, role, method, path, body, budget):
+    for _ in range(2):
+        with trace_queries() as stats:
+            response = client.request(method, "/api/v1" + path, json=body, headers=accounts[role])
+        assert response.status_code < 400, response.text
+    assert stats.count <= budget, f"{name} ran {stats.count} statements, over its budget of {budget}"
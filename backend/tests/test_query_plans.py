@@ -0,0 +1,77 @@
+# backend/tests/test_query_plans.py
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import database
+from app.database import SessionLocal
+from app.query_plans import check_query_plans, explain_sql, is_table_scan
+
+# Routes polled by dashboards or hit on every page load; each must be served by indexes
+HOT_ROUTES = [
+    ("ngo", "/api/v1/ngo/food/available"),
+    ("ngo", "/api/v1/ngo/food/available?max_servings=10"),
+    ("ngo", "/api/v1/ngo/food/available/page?limit=5&include_donor=true"),
+    ("ngo", "/api/v1/ngo/food/history"),
+    ("ngo", "/api/v1/ngo/food/history/page?limit=5&expand=food_item,food_item.donor,ngo"),
+    ("donor", "/api/v1/donor/food/history"),
+    ("admin", "/api/v1/admin/users?q=ngo"),
+    ("admin", "/api/v1/admin/users?role=ngo&is_verified=false"),
+]
+
+
+@contextmanager
+def captured_sql():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engines = (database.engine, database.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", capture)
+
+
+@pytest.fixture
+def seeded(client, admin, donor, make_ngo, donate):
+    ngo = make_ngo()
+    items = [donate(donor, name=f"Item {i}", quantity=f"{i + 1} meals") for i in range(12)]
+    for item in items[:4]:
+        assert client.post(f"/api/v1/ngo/food/claim/{item['id']}", headers=ngo).status_code == 200
+    return {"admin": admin, "donor": donor, "ngo": ngo}
+
+
+@pytest.mark.parametrize("role, path", HOT_ROUTES)
+def test_route_queries_use_indexes(client, seeded, role, path):
+    with captured_sql() as statements:
+        response = client.get(path, headers=seeded[role])
+    assert response.status_code == 200, response.text
+    assert statements, "route ran no SELECT; is it still hitting the database?"
+
+    db = SessionLocal()
+    try:
+        dialect = db.get_bind().dialect.name
+        scans = [
+            (line, " ".join(statement.split()))
+            for statement, parameters in statements
+            for line in explain_sql(db, statement, parameters)
+            if is_table_scan(dialect, line)
+        ]
+    finally:
+        db.close()
+    assert not scans, f"{path} scans a whole table: {scans}"
+
+
+def test_mirrored_hot_queries_use_indexes(client):
+    db = SessionLocal()
+    try:
+        assert check_query_plans(db) == []
+    finally:
+        db.close()
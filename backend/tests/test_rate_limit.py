@@ -0,0 +1,75 @@
+# backend/tests/test_rate_limit.py
+import asyncio
+
+import pytest
+
+from app import rate_limit
+from app.rate_limit import MAX_BUFFERED_BODY, Limit, RateLimiter, RateLimitMiddleware, RouteLimit
+
+LOGIN = "/api/v1/auth/token"
+CHUNK = 16 * 1024
+
+
+class Echo:
+    """Inner app recording the body it received."""
+
+    def __init__(self):
+        self.bodies = []
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        self.bodies.append(body)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def call(middleware, body: bytes, chunk: int = CHUNK):
+    pieces = [body[i:i + chunk] for i in range(0, len(body), chunk)] or [b""]
+    received = []
+    sent = []
+
+    async def receive():
+        index = len(received)
+        received.append(index)
+        return {"type": "http.request", "body": pieces[index], "more_body": index < len(pieces) - 1}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": LOGIN, "headers": [], "query_string": b"", "client": ("10.0.0.1", 1234)}
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]["status"], len(received)
+
+
+@pytest.fixture
+def middleware(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    limiter = RateLimiter([RouteLimit(LOGIN, per_ip=Limit(100, 60), per_user=Limit(2, 60), user_key="form:username")])
+    app = Echo()
+    return RateLimitMiddleware(app, limiter), app
+
+
+def test_body_is_replayed_to_the_route(middleware):
+    mw, app = middleware
+    body = b"username=someone%40example.com&password=" + b"x" * (3 * CHUNK)
+    assert call(mw, body)[0] == 200
+    assert app.bodies == [body]
+
+
+def test_per_user_budget_uses_the_form_field(middleware):
+    mw, _ = middleware
+    body = b"username=someone%40example.com&password=x"
+    assert [call(mw, body)[0] for _ in range(3)] == [200, 200, 429]
+
+
+def test_oversized_body_is_rejected_without_reading_it_all(middleware):
+    mw, app = middleware
+    status, reads = call(mw, b"x" * (64 * MAX_BUFFERED_BODY))
+    assert status == 413
+    assert reads == MAX_BUFFERED_BODY // CHUNK + 1 # Stops at the first chunk past the limit
+    assert app.bodies == []
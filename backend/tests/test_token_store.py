@@ -0,0 +1,152 @@
+# backend/tests/test_token_store.py
+import time
+
+import pytest
+
+from app.services import token_store
+from app.services.token_store import (
+    OTP_MAX_ATTEMPTS, MemoryTokenStore, RedisTokenStore, TooManyAttempts,
+    consume_otp, consume_reset_token, create_token_store, issue_otp, issue_reset_token, reset_token_email,
+)
+
+TTL = 0.2 # Short enough to wait out in a test
+
+
+class StubRedis:
+    """The slice of the redis-py API RedisTokenStore uses, with millisecond expiry."""
+
+    def __init__(self):
+        self.data = {} # key -> (value, expires_at or None)
+
+    def _live(self, key):
+        item = self.data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return item
+
+    def set(self, key, value, px=None):
+        self.data[key] = (str(value), time.monotonic() + px / 1000 if px else None)
+
+    def get(self, key):
+        item = self._live(key)
+        return item[0] if item else None
+
+    def getdel(self, key):
+        value = self.get(key)
+        self.data.pop(key, None)
+        return value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        item = self._live(key)
+        count = int(item[0]) + 1 if item else 1
+        self.data[key] = (str(count), item[1] if item else None)
+        return count
+
+    def pexpire(self, key, ms, nx=False):
+        item = self._live(key)
+        if item is None or (nx and item[1] is not None):
+            return False
+        self.data[key] = (item[0], time.monotonic() + ms / 1000)
+        return True
+
+    def pipeline(self):
+        return StubPipeline(self)
+
+
+class StubPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    return MemoryTokenStore() if request.param == "memory" else RedisTokenStore(StubRedis())
+
+
+# --- OTP Codes ---
+def test_otp_is_single_use(store):
+    issue_otp("a@example.com", "123456", 60, store=store)
+    assert consume_otp("a@example.com", "123456", store=store)
+    assert not consume_otp("a@example.com", "123456", store=store)
+
+
+def test_wrong_codes_lock_the_otp(store):
+    issue_otp("a@example.com", "123456", 60, store=store)
+    assert [consume_otp("a@example.com", "000000", store=store) for _ in range(OTP_MAX_ATTEMPTS)] == [False] * OTP_MAX_ATTEMPTS
+    with pytest.raises(TooManyAttempts):
+        consume_otp("a@example.com", "123456", store=store)
+    # The locked code is gone, even the right one
+    assert not consume_otp("a@example.com", "123456", store=store)
+
+
+def test_new_otp_resets_the_attempts(store):
+    issue_otp("a@example.com", "123456", 60, store=store)
+    for _ in range(OTP_MAX_ATTEMPTS):
+        consume_otp("a@example.com", "000000", store=store)
+    issue_otp("a@example.com", "654321", 60, store=store)
+    assert consume_otp("a@example.com", "654321", store=store)
+
+
+def test_otp_expires(store):
+    issue_otp("a@example.com", "123456", TTL, store=store)
+    time.sleep(TTL * 1.5)
+    assert not consume_otp("a@example.com", "123456", store=store)
+
+
+# --- Password Reset Tokens ---
+def test_reset_token_is_single_use(store):
+    issue_reset_token("a@example.com", "token-1", 60, store=store)
+    assert reset_token_email("token-1", store=store) == "a@example.com"
+    assert consume_reset_token("token-1", store=store) == "a@example.com"
+    assert consume_reset_token("token-1", store=store) is None
+    assert reset_token_email("token-1", store=store) is None
+
+
+def test_only_the_newest_reset_link_works(store):
+    issue_reset_token("a@example.com", "token-1", 60, store=store)
+    issue_reset_token("a@example.com", "token-2", 60, store=store)
+    assert consume_reset_token("token-1", store=store) is None
+    assert consume_reset_token("token-2", store=store) == "a@example.com"
+
+
+def test_reset_token_expires(store):
+    issue_reset_token("a@example.com", "token-1", TTL, store=store)
+    time.sleep(TTL * 1.5)
+    assert consume_reset_token("token-1", store=store) is None
+
+
+def test_tokens_are_stored_hashed(store):
+    issue_reset_token("a@example.com", "token-1", 60, store=store)
+    keys = store._data if isinstance(store, MemoryTokenStore) else store._redis.data
+    assert not any("token-1" in key for key in keys)
+
+
+# --- Configuration ---
+def test_memory_store_refuses_several_workers():
+    assert isinstance(create_token_store("", workers=1), MemoryTokenStore)
+    with pytest.raises(RuntimeError, match="TOKEN_STORE_URL"):
+        create_token_store("", workers=4)
+
+
+def test_unsupported_url():
+    with pytest.raises(RuntimeError):
+        create_token_store("memcached://localhost")
+
+
+def test_memory_store_warns_in_production(monkeypatch, caplog):
+    monkeypatch.setenv("ENV", "production")
+    with caplog.at_level("WARNING", logger=token_store.__name__):
+        create_token_store("", workers=1)
+    assert "TOKEN_STORE_URL" in caplog.text
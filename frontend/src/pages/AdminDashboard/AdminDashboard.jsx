@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { adminApi } from '@/services/api';
+import { adminApi, USERS_PAGE_SIZE } from '@/services/api';
 import UserManagement from './UserManagement';
 import Analytics from './Analytics';
 import { useToast } from '@/hooks/use-toast';
@@ -7,6 +7,8 @@ import { motion } from 'framer-motion';
 
 export default function AdminDashboard() {
   const [users, setUsers] = useState([]);
+  const [totalUsers, setTotalUsers] = useState(0);
+  const [offset, setOffset] = useState(0);
   const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -16,11 +18,13 @@ export default function AdminDashboard() {
     try {
       setLoading(true);
       setError(null);
-      const [usersData, statsData] = await Promise.all([
-        adminApi.getUsers(),
+      const [usersPage, statsData] = await Promise.all([
+        adminApi.getUsers({ offset: 0 }),
         adminApi.getAnalytics()
       ]);
-      setUsers(usersData);
+      setUsers(usersPage.items);
+      setTotalUsers(usersPage.total);
+      setOffset(0);
       setStats(statsData);
     } catch (err) {
       setError(err.message);
@@ -32,13 +36,28 @@ export default function AdminDashboard() {
     fetchData();
   }, []);
 
+  // The list is paged; unverified users come first
+  const loadUsers = async (newOffset) => {
+    const usersPage = await adminApi.getUsers({ offset: newOffset });
+    setUsers(usersPage.items);
+    setTotalUsers(usersPage.total);
+    setOffset(newOffset);
+  };
+
+  const handlePageChange = async (newOffset) => {
+    try {
+      await loadUsers(newOffset);
+    } catch (err) {
+      toast({ title: "Error", description: err.message, variant: "destructive" });
+    }
+  };
+
   const handleVerify = async (userId) => {
     try {
       await adminApi.verifyUser(userId);
       toast({ title: "Success", description: "User verified!" });
-      // Refetch user data
-      const usersData = await adminApi.getUsers();
-      setUsers(usersData);
+      // Refetch the current page
+      await loadUsers(offset);
     } catch (err) {
       toast({ title: "Error", description: err.message, variant: "destructive" });
     }
@@ -55,7 +74,14 @@ export default function AdminDashboard() {
       className="space-y-6"
     >
       {stats && <Analytics initialStats={stats} />}
-      <UserManagement users={users} onVerify={handleVerify} />
+      <UserManagement
+        users={users}
+        total={totalUsers}
+        offset={offset}
+        pageSize={USERS_PAGE_SIZE}
+        onPageChange={handlePageChange}
+        onVerify={handleVerify}
+      />
     </motion.div>
   );
 }
\ No newline at end of file
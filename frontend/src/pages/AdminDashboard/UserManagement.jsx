@@ -10,7 +10,10 @@ import {
 } from "@/components/ui/table";
 import { Button } from '@/components/ui/button';
 
-export default function UserManagement({ users, onVerify }) {
+export default function UserManagement({ users, total, offset, pageSize, onPageChange, onVerify }) {
+  const firstShown = total === 0 ? 0 : offset + 1;
+  const lastShown = offset + users.length;
+
   return (
     <Card>
       <CardHeader>
@@ -54,6 +57,29 @@ export default function UserManagement({ users, onVerify }) {
             ))}
           </TableBody>
         </Table>
+        <div className="flex items-center justify-between pt-4">
+          <span className="text-sm text-gray-500">
+            Showing {firstShown}–{lastShown} of {total}
+          </span>
+          <div className="space-x-2">
+            <Button
+              variant="outline"
+              size="sm"
+              disabled={offset === 0}
+              onClick={() => onPageChange(Math.max(0, offset - pageSize))}
+            >
+              Previous
+            </Button>
+            <Button
+              variant="outline"
+              size="sm"
+              disabled={lastShown >= total}
+              onClick={() => onPageChange(offset + pageSize)}
+            >
+              Next
+            </Button>
+          </div>
+        </div>
       </CardContent>
     </Card>
   );
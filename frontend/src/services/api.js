@@ -54,6 +54,19 @@ const api = {
     });
     return handleResponse(response);
   },
+  // For paged lists: the page's items plus the total from the X-Total-Count header
+  getPage: async (endpoint) => {
+    const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+      method: "GET",
+      headers: {
+        "Content-Type": "application/json",
+        Authorization: `Bearer ${getAuthToken()}`,
+      },
+    });
+    const items = await handleResponse(response);
+    const total = Number(response.headers.get("X-Total-Count") ?? items.length);
+    return { items, total };
+  },
   put: async (endpoint, body) => {
     const response = await fetch(`${API_BASE_URL}${endpoint}`, {
       method: "PUT",
@@ -112,8 +125,11 @@ export const ngoApi = {
   updateClaimStatus: (claimId, status) => api.put(`/ngo/food/claim/${claimId}`, { status }),
 };
 
+export const USERS_PAGE_SIZE = 50;
+
 export const adminApi = {
-  getUsers: () => api.get("/admin/users"),
+  getUsers: ({ offset = 0, limit = USERS_PAGE_SIZE } = {}) =>
+    api.getPage(`/admin/users?offset=${offset}&limit=${limit}`),
   verifyUser: (userId) => api.put(`/admin/users/${userId}/verify`, {}),
   getAnalytics: () => api.get("/admin/analytics"),
   getAiAnalytics: () => api.get("/ai/analytics-insight"),